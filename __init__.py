@@ -1,6 +1,8 @@
+import functools
 import importlib.util
 import os
 import sys
+from .node_registry import is_current, load_registry, make_lazy_node
 
 NODE_CLASS_MAPPINGS = {}
 NODE_DISPLAY_NAME_MAPPINGS = {}
@@ -24,20 +26,37 @@ def serialize(obj):
     return str(obj)
 
 
+def load_node_module(name):
+    return importlib.import_module(".py.{}".format(name), __name__)
+
+
 py = get_ext_dir("py")
 files = os.listdir(py)
 
+# Nodes listed in node_registry.json are registered as proxies and their
+# module is imported on first execute; set WAVESPEED_EAGER_IMPORT=1 to
+# import everything at startup instead
+registry = {} if os.environ.get("WAVESPEED_EAGER_IMPORT") == "1" else load_registry(get_ext_dir())
+
 all_nodes = {}
 for file in files:
     if not file.endswith(".py"):
         continue
     name = os.path.splitext(file)[0]
-    imported_module = importlib.import_module(".py.{}".format(name), __name__)
+    entry = registry.get(file)
+    if entry is not None and is_current(entry, os.path.join(py, file)):
+        loader = functools.partial(load_node_module, name)
+        class_mappings = {k: make_lazy_node(loader, v["class_name"], v) for k, v in entry["nodes"].items()}
+        display_name_mappings = {k: v["display_name"] for k, v in entry["nodes"].items()}
+    else:
+        imported_module = load_node_module(name)
+        class_mappings = getattr(imported_module, "NODE_CLASS_MAPPINGS", {})
+        display_name_mappings = getattr(imported_module, "NODE_DISPLAY_NAME_MAPPINGS", {})
     try:
-        NODE_CLASS_MAPPINGS = {**NODE_CLASS_MAPPINGS, **imported_module.NODE_CLASS_MAPPINGS}
-        NODE_DISPLAY_NAME_MAPPINGS = {**NODE_DISPLAY_NAME_MAPPINGS, **imported_module.NODE_DISPLAY_NAME_MAPPINGS}
-        serialized_CLASS_MAPPINGS = {k: serialize(v) for k, v in imported_module.NODE_CLASS_MAPPINGS.items()}
-        serialized_DISPLAY_NAME_MAPPINGS = {k: serialize(v) for k, v in imported_module.NODE_DISPLAY_NAME_MAPPINGS.items()}
+        NODE_CLASS_MAPPINGS = {**NODE_CLASS_MAPPINGS, **class_mappings}
+        NODE_DISPLAY_NAME_MAPPINGS = {**NODE_DISPLAY_NAME_MAPPINGS, **display_name_mappings}
+        serialized_CLASS_MAPPINGS = {k: serialize(v) for k, v in class_mappings.items()}
+        serialized_DISPLAY_NAME_MAPPINGS = {k: serialize(v) for k, v in display_name_mappings.items()}
         all_nodes[file]={"NODE_CLASS_MAPPINGS": serialized_CLASS_MAPPINGS, "NODE_DISPLAY_NAME_MAPPINGS": serialized_DISPLAY_NAME_MAPPINGS}
     except:
         pass
@@ -0,0 +1,99 @@
+"""
+Encode a batch of long audio clips to MP3 files
+
+Runs the historical save_audio code, which encodes only the first clip,
+as one frame, into memory before writing it out, and the chunked
+save_audio in wavespeed_api.utils on a batch of long stereo clips, like
+the multi-minute tracks InfiniteTalk takes, once stored channel first and
+once transposed from (B, N, C). Each run happens in a fresh
+interpreter and reports the time, the memory encoding needed on top of
+the waveform (peak RSS minus RSS before it) and the clips written.
+
+    python benchmarks/audio_export.py --count 2 --minutes 10
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import torch
+from common import import_node_module
+from image_conversion import peak_rss_mb, rss_mb
+
+
+SAMPLE_RATE = 48000
+# "transposed" saves a waveform stored as (B, N, C) and transposed to (B, C, N), as interleaved audio often is
+VARIANTS = ["legacy", "chunked", "transposed"]
+
+
+def legacy_save_audio(audio, save_path):
+    import av
+    sample_rate = audio["sample_rate"]
+    for waveform in audio["waveform"].cpu():
+        output_buffer = io.BytesIO()
+        output_container = av.open(output_buffer, mode="w", format="mp3")
+        out_stream = output_container.add_stream("libmp3lame", rate=sample_rate)
+        out_stream.bit_rate = 128000
+        frame = av.AudioFrame.from_ndarray(waveform.movedim(0, 1).reshape(1, -1).float().numpy(), format="flt",
+                                           layout="mono" if waveform.shape[0] == 1 else "stereo")
+        frame.sample_rate = sample_rate
+        frame.pts = 0
+        output_container.mux(out_stream.encode(frame))
+        output_container.mux(out_stream.encode(None))
+        output_container.close()
+        output_buffer.seek(0)
+        with open(save_path, "wb") as f:
+            f.write(output_buffer.getbuffer())
+        break
+    return [save_path]
+
+
+def run_one(variant, count, minutes, directory):
+    utils = import_node_module("wavespeed_api.utils")
+    length = max(int(minutes * 60), 1)
+    # A 440 Hz tone, one second repeated in place so building it does not raise the peak above the waveform
+    tone = torch.sin(torch.arange(SAMPLE_RATE, dtype=torch.float32) * (440 * 2 * torch.pi / SAMPLE_RATE))
+    if variant == "transposed":
+        waveform = torch.empty((count, length * SAMPLE_RATE, 2))
+        waveform.view(count, length, SAMPLE_RATE, 2).copy_(tone[:, None])
+        waveform = waveform.transpose(1, 2)
+    else:
+        waveform = torch.empty((count, 2, length * SAMPLE_RATE))
+        waveform.view(count, 2, length, SAMPLE_RATE).copy_(tone)
+    audio = {"waveform": waveform, "sample_rate": SAMPLE_RATE}
+    save = legacy_save_audio if variant == "legacy" else utils.save_audio
+    before = rss_mb()
+    start = time.perf_counter()
+    paths = save(audio, os.path.join(directory, f"{variant}.mp3"))
+    seconds = time.perf_counter() - start
+    print(json.dumps({"seconds": seconds, "extra_mb": peak_rss_mb() - before, "clips": len(paths)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=2)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--run", metavar="VARIANT", choices=VARIANTS, help=argparse.SUPPRESS)
+    parser.add_argument("--directory", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run_one(args.run, args.count, args.minutes, args.directory)
+        return
+
+    waveform_mb = args.count * 2 * args.minutes * 60 * SAMPLE_RATE * 4 / 1e6
+    print(f"{args.count} stereo clips of {args.minutes:g} min at {SAMPLE_RATE} Hz, waveform {waveform_mb:.0f} MB")
+    print(f"{'variant':<10} {'seconds':>8} {'extra MB':>9} {'clips':>6}")
+    with tempfile.TemporaryDirectory() as directory:
+        for variant in VARIANTS:
+            completed = subprocess.run([sys.executable, __file__, "--count", str(args.count), "--minutes",
+                                        str(args.minutes), "--run", variant, "--directory", directory],
+                                       capture_output=True, text=True, check=True)
+            stats = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(f"{variant:<10} {stats['seconds']:>8.2f} {stats['extra_mb']:>9.0f} {stats['clips']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import types
+import importlib
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = "wavespeed_nodes"
+
+
+def import_node_module(name):
+    """
+    Import a module from py/ the way ComfyUI does, as part of a package
+
+    Args:
+        name (str): Module path relative to py/, e.g. "wavespeed_api.encoding"
+
+    Returns:
+        module: The imported module
+    """
+    if PACKAGE_NAME not in sys.modules:
+        package = types.ModuleType(PACKAGE_NAME)
+        package.__path__ = [os.path.join(ROOT_DIR, "py")]
+        sys.modules[PACKAGE_NAME] = package
+    return importlib.import_module(f"{PACKAGE_NAME}.{name}")
+
+
+def timed(func, *args, repeat=3, **kwargs):
+    """
+    Call a function several times and report the best wall time
+
+    Args:
+        func (callable): Function to time
+        repeat (int): Number of calls
+
+    Returns:
+        tuple: (best seconds, result of the last call)
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of a list of numbers
+
+    Args:
+        values (list): Samples
+        fraction (float): Percentile as a fraction, e.g. 0.99
+
+    Returns:
+        float: The percentile, or 0 for no samples
+    """
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
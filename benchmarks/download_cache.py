@@ -0,0 +1,50 @@
+"""
+Repeated decoding of the same output URLs, with and without the download cache
+
+Decodes the same output images into an IMAGE tensor several times, the way
+a re-run workflow or several branches fed by one output do, against the
+mock API with a realistic time to first byte. Reports downloads made and
+time per repetition with the disk download cache off and on.
+
+    python benchmarks/download_cache.py --images 8 --repeat 5 --download-latency 0.3
+"""
+import argparse
+import tempfile
+import time
+from common import import_node_module
+from mock_server import MockConfig, start_mock_server
+from run_benchmark import request_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--image-size", type=int, default=2048)
+    parser.add_argument("--download-latency", type=float, default=0.3, help="Time to first byte in seconds")
+    args = parser.parse_args()
+
+    server = start_mock_server(MockConfig(image_size=args.image_size, download_latency=args.download_latency))
+    utils = import_node_module("wavespeed_api.utils")
+    download_cache = import_node_module("wavespeed_api.download_cache")
+    urls = [f"{server.base_url}/outputs/task{index}/0.png" for index in range(args.images)]
+    # The mock server renders its image on the first request
+    utils.fetch_image(f"{server.base_url}/outputs/warmup/0.png")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, directory in (("cache off", None), ("cache on", cache_dir)):
+            download_cache.configure_download_cache(directory)
+            before = request_counts(server)["download"]
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                utils.imageurl2tensor(urls)
+                timings.append(time.perf_counter() - start)
+            downloads = request_counts(server)["download"] - before
+            repeats = timings[1:]
+            print(f"{name}: {downloads} downloads for {args.repeat} x {args.images} images, "
+                  f"first {timings[0]:.2f}s, repeats {sum(repeats) / len(repeats):.2f}s on average")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+How predictions fare against an API that answers some calls with 503
+
+Submits predictions to the mock API with an injected 503 rate and waits on
+each of them, then reports how many failed at submit, how many failed while
+waiting although the task was running on the server, and how many submits
+reached the server twice.
+
+    python benchmarks/flaky_api.py --predictions 40 --failure-rate 0.1
+"""
+import argparse
+import asyncio
+import os
+import time
+from common import import_node_module
+from mock_server import MockConfig, start_mock_server
+from run_benchmark import request_counts
+
+
+async def run_predictions(predictions, api_key):
+    async_client = import_node_module("wavespeed_api.async_client")
+    client = async_client.AsyncWaveSpeedClient(api_key, polling_policy="adaptive")
+    outcomes = {"completed": 0, "failed at submit": 0, "failed while waiting": 0}
+
+    async def _run(index):
+        try:
+            response = await client.post("/api/v3/wavespeed-ai/qwen-image/text-to-image",
+                                         {"prompt": f"a lighthouse, variation {index}", "enable_sync_mode": False})
+        except Exception:
+            outcomes["failed at submit"] += 1
+            return
+        try:
+            await client.wait_for_task(response["id"], polling_interval=1, expected_duration="image")
+            outcomes["completed"] += 1
+        except Exception:
+            outcomes["failed while waiting"] += 1
+
+    await asyncio.gather(*[_run(index) for index in range(predictions)])
+    return outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--predictions", type=int, default=40)
+    parser.add_argument("--failure-rate", type=float, default=0.1, help="Fraction of API calls answered with 503")
+    parser.add_argument("--job-latency", type=float, default=10.0)
+    args = parser.parse_args()
+
+    server = start_mock_server(MockConfig(job_latency=args.job_latency, image_size=256,
+                                          failure_rate=args.failure_rate))
+    os.environ["WAVESPEED_BASE_URL"] = server.base_url
+    runtime = import_node_module("wavespeed_api.runtime")
+
+    start = time.perf_counter()
+    outcomes = runtime.run_sync(run_predictions(args.predictions, "key-flaky"))
+    wall = time.perf_counter() - start
+    counts = request_counts(server)
+    print(f"{args.predictions} predictions, {args.failure_rate:.0%} of API calls answered 503, {wall:.1f}s")
+    for name, count in outcomes.items():
+        print(f"  {name}: {count}")
+    print(f"  status checks: {counts.get('status', 0)} ({counts.get('status_503', 0)} x 503), "
+          f"duplicate submits: {counts.get('duplicate_submit', 0)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark converting model outputs between images and IMAGE tensors
+
+Runs the historical images2tensor / tensor2images code and the chunked
+conversions in wavespeed_api.tensors on a batch of large outputs, each
+in a fresh interpreter, and reports the time and the memory the
+conversion needed on top of its inputs (peak RSS minus RSS before it).
+
+    python benchmarks/image_conversion.py --count 15 --size 4096
+
+The default batch needs about 8 GB of RAM for the historical code.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import numpy
+import PIL.Image
+import torch
+from common import import_node_module
+
+
+VARIANTS = ["legacy", "vectorized"]
+DIRECTIONS = ["to_tensor", "to_images"]
+
+
+def legacy_images2tensor(images):
+    return torch.stack([torch.from_numpy(numpy.array(image)).float() / 255.0 for image in images])
+
+
+def legacy_tensor2images(tensor):
+    np_imgs = numpy.clip(tensor.cpu().numpy() * 255.0, 0.0, 255.0).astype(numpy.uint8)
+    return [PIL.Image.fromarray(np_img) for np_img in np_imgs]
+
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * 4096 / 1024 / 1024
+
+
+def peak_rss_mb():
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_one(direction, variant, count, size):
+    import time
+    tensors = import_node_module("wavespeed_api.tensors")
+    rng = numpy.random.default_rng(0)
+    if direction == "to_tensor":
+        pixels = rng.integers(0, 256, size=(size, size, 3), dtype=numpy.uint8)
+        inputs = [PIL.Image.fromarray(pixels) for _ in range(count)]
+        del pixels
+        convert = legacy_images2tensor if variant == "legacy" else tensors.images_to_tensor
+    else:
+        inputs = torch.rand((count, size, size, 3))
+        convert = legacy_tensor2images if variant == "legacy" else tensors.tensor_to_images
+    before = rss_mb()
+    start = time.perf_counter()
+    result = convert(inputs)
+    seconds = time.perf_counter() - start
+    print(json.dumps({"seconds": seconds, "extra_mb": peak_rss_mb() - before, "items": len(result)}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=15)
+    parser.add_argument("--size", type=int, default=4096)
+    parser.add_argument("--run", nargs=2, metavar=("DIRECTION", "VARIANT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run_one(args.run[0], args.run[1], args.count, args.size)
+        return
+
+    output_mb = args.count * args.size * args.size * 3 * 4 / 1024 / 1024
+    print(f"{args.count} x {args.size}x{args.size} RGB, float32 batch {output_mb:.0f} MB")
+    print(f"{'direction':<10} {'variant':<11} {'seconds':>8} {'extra MB':>9}")
+    for direction in DIRECTIONS:
+        for variant in VARIANTS:
+            completed = subprocess.run([sys.executable, __file__, "--count", str(args.count), "--size",
+                                        str(args.size), "--run", direction, variant], capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(f"{direction:<10} {variant:<11} {'failed':>8} (exit code {completed.returncode}, "
+                      f"likely out of memory)")
+                continue
+            stats = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(f"{direction:<10} {variant:<11} {stats['seconds']:>8.2f} {stats['extra_mb']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measure how long ComfyUI takes to load this extension
+
+Loads the extension's __init__.py in a fresh interpreter the way ComfyUI
+does, once with the lazy node registry and once with
+WAVESPEED_EAGER_IMPORT=1, and reports the best time and peak RSS of each.
+
+    python benchmarks/import_time.py --repeat 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from common import ROOT_DIR
+
+
+LOAD_SCRIPT = """
+import importlib.util, json, resource, sys, time
+start = time.perf_counter()
+spec = importlib.util.spec_from_file_location("wavespeed_extension", sys.argv[1] + "/__init__.py",
+                                              submodule_search_locations=[sys.argv[1]])
+module = importlib.util.module_from_spec(spec)
+sys.modules["wavespeed_extension"] = module
+spec.loader.exec_module(module)
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "nodes": len(module.NODE_CLASS_MAPPINGS),
+    "torch_loaded": "torch" in sys.modules,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+"""
+
+
+def load_once(eager):
+    env = dict(os.environ)
+    env.pop("WAVESPEED_EAGER_IMPORT", None)
+    if eager:
+        env["WAVESPEED_EAGER_IMPORT"] = "1"
+    output = subprocess.run([sys.executable, "-c", LOAD_SCRIPT, ROOT_DIR], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for mode, eager in (("eager", True), ("lazy", False)):
+        runs = [load_once(eager) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run["seconds"])
+        print(f"{mode}: {best['seconds'] * 1000:.0f} ms best of {args.repeat}, {best['nodes']} nodes, "
+              f"peak RSS {best['peak_rss_mb']:.0f} MB, torch loaded: {best['torch_loaded']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Decode output images of different sizes into one IMAGE batch
+
+Serves a batch of outputs with the sizes a Seedream sequential prediction
+returns and decodes it with the historical decode-then-stack code, which
+fails on mixed sizes, and in every mixed size mode. Also times a batch of
+equal sizes to compare the two paths where the legacy code works.
+Reports time, batch shape and how often images were decoded.
+
+    python benchmarks/mixed_sizes.py --images 8 --download-latency 0.3
+"""
+import argparse
+import time
+import numpy
+import torch
+from common import import_node_module
+from mock_server import MockConfig, start_mock_server
+
+
+MIXED_SIZES = ["2048x2048", "2304x1728", "1728x2304", "2560x1440"]
+
+
+def legacy_imageurl2tensor(utils, download, urls):
+    images = download.fetch_all_sync(urls, decode=utils.decode_image)
+    return torch.stack([torch.from_numpy(numpy.array(image)).float() / 255.0 for image in images])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=8)
+    parser.add_argument("--download-latency", type=float, default=0.3, help="Time to first byte in seconds")
+    args = parser.parse_args()
+
+    server = start_mock_server(MockConfig(download_latency=args.download_latency))
+    utils = import_node_module("wavespeed_api.utils")
+    download = import_node_module("wavespeed_api.download")
+    tensors = import_node_module("wavespeed_api.tensors")
+    decode_image = utils.decode_image
+    decodes = [0]
+
+    def counting_decode(*decode_args, **kwargs):
+        decodes[0] += 1
+        return decode_image(*decode_args, **kwargs)
+
+    mixed = [f"{server.base_url}/outputs/task{index}/0.png?size={MIXED_SIZES[index % len(MIXED_SIZES)]}"
+             for index in range(args.images)]
+    equal = [f"{server.base_url}/outputs/task{index}/0.png?size={MIXED_SIZES[0]}" for index in range(args.images)]
+    # The mock server renders each image size on its first request
+    download.fetch_all_sync(mixed)
+
+    runs = [("legacy", "equal", equal, lambda urls: legacy_imageurl2tensor(utils, download, urls)),
+            ("batched", "equal", equal, utils.imageurl2tensor),
+            ("legacy", "mixed", mixed, lambda urls: legacy_imageurl2tensor(utils, download, urls))]
+    runs += [(mode, "mixed", mixed, lambda urls, mode=mode: utils.imageurl2tensor(urls, mixed_sizes=mode))
+             for mode in tensors.MIXED_SIZE_MODES]
+    runs.append(("list", "mixed", mixed, lambda urls: utils.imageurl2tensor(urls, as_list=True)))
+
+    utils.decode_image = counting_decode
+    print(f"{'path':<13} {'sizes':<6} {'seconds':>8} {'decodes':>8}  result")
+    for name, label, urls, convert in runs:
+        decodes[0] = 0
+        start = time.perf_counter()
+        try:
+            result = convert(urls)
+        except Exception as e:
+            outcome = f"failed: {str(e).splitlines()[0][:60]}"
+        else:
+            if isinstance(result, list):
+                outcome = f"{len(result)} tensors, first {tuple(result[0].shape)}"
+            else:
+                outcome = f"batch {tuple(result.shape)}"
+        seconds = time.perf_counter() - start
+        print(f"{name:<13} {label:<6} {seconds:>8.2f} {decodes[0]:>8}  {outcome}")
+
+
+if __name__ == "__main__":
+    main()
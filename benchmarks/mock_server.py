@@ -0,0 +1,337 @@
+"""
+Local stand-in for the WaveSpeed AI API
+
+Implements the endpoints the client uses, with configurable job latency,
+failure rate and output sizes, so nodes can be benchmarked without paying
+for real predictions:
+
+    POST /api/v3/<model>                    submit, sync or async mode
+    GET  /api/v2/predictions/{id}/result    task status
+    GET  /api/v3/tasks/{id}                 task status
+    POST /api/v2/media/upload/binary        media upload
+    GET  /outputs/{id}/{index}.{ext}        generated output files
+    GET  /__stats                           request counters
+
+Run standalone and point the nodes at it with WAVESPEED_BASE_URL:
+
+    python benchmarks/mock_server.py --port 8900 --job-latency 8
+    WAVESPEED_BASE_URL=http://127.0.0.1:8900 python main.py
+"""
+import argparse
+import asyncio
+import io
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from aiohttp import web
+import PIL.Image
+
+
+VIDEO_KEYWORDS = ("video", "animate", "infinitetalk", "upscale-v1")
+
+
+class MockConfig:
+    """Knobs for the mock server."""
+
+    def __init__(self, job_latency=5.0, job_latency_jitter=0.2, submit_latency=0.05, status_latency=0.02,
+                 failure_rate=0.0, task_failure_rate=0.0, image_size=1024, video_bytes=8 * 1024 * 1024,
+                 download_latency=0.05, rate_limit=0, max_concurrent_tasks=0, retry_after=1,
+                 outage_latency=2.0, video_path=None, partial_outputs=False):
+        """
+        Args:
+            job_latency (float): Mean server-side job time in seconds
+            job_latency_jitter (float): Relative spread of the job time
+            submit_latency (float): Time to answer a submit in seconds
+            status_latency (float): Time to answer a status check in seconds
+            failure_rate (float): Fraction of API calls answered with a 503
+            task_failure_rate (float): Fraction of tasks that end as failed
+            image_size (int): Side length of generated output images
+            video_bytes (int): Size of generated output videos
+            download_latency (float): Time to first byte for output files
+            rate_limit (float): API requests per second per key before answering 429, 0 for no limit
+            max_concurrent_tasks (int): Unfinished tasks per key before submits get 429, 0 for no limit
+            retry_after (float): Retry-After sent with 429 responses, in seconds
+            outage_latency (float): Time to answer with a 503 while the server is in an outage
+            video_path (str, optional): Video file served for output videos instead of video_bytes of zeros
+            partial_outputs (bool): Publish outputs one by one while a task runs, evenly spread over its job time
+        """
+        self.job_latency = job_latency
+        self.job_latency_jitter = job_latency_jitter
+        self.submit_latency = submit_latency
+        self.status_latency = status_latency
+        self.failure_rate = failure_rate
+        self.task_failure_rate = task_failure_rate
+        self.image_size = image_size
+        self.video_bytes = video_bytes
+        self.download_latency = download_latency
+        self.rate_limit = rate_limit
+        self.max_concurrent_tasks = max_concurrent_tasks
+        self.retry_after = retry_after
+        self.outage_latency = outage_latency
+        self.video_path = video_path
+        self.partial_outputs = partial_outputs
+
+
+class MockWaveSpeedServer:
+    """In-memory task store and request handlers."""
+
+    def __init__(self, config=None):
+        self.config = config or MockConfig()
+        self.tasks = {}
+        self.stats = Counter()
+        self.uploaded_bytes = 0
+        self.base_url = ""
+        self._image_cache = {}
+        self._request_times = {}
+        self._idempotency_keys = {}
+        # Set to True to answer every API call with a slow 503
+        self.outage = False
+
+    def build_app(self):
+        app = web.Application(client_max_size=0)
+        app.router.add_post("/api/v3/{model:.+}", self.submit)
+        app.router.add_get("/api/v2/predictions/{id}/result", self.result)
+        app.router.add_get("/api/v3/tasks/{id}", self.result)
+        app.router.add_post("/api/v2/media/upload/binary", self.upload)
+        app.router.add_get("/outputs/{id}/{name}", self.output)
+        app.router.add_get("/__stats", self.stats_handler)
+        return app
+
+    def _injected_failure(self):
+        return random.random() < self.config.failure_rate
+
+    async def _outage_response(self):
+        if not self.outage:
+            return None
+        # A degraded API: slow to answer, and then only with an error
+        self.stats["outage_503"] += 1
+        await asyncio.sleep(self.config.outage_latency)
+        return web.json_response({"code": 503, "message": "Service unavailable"}, status=503)
+
+    def _rate_limited(self, request):
+        if not self.config.rate_limit:
+            return None
+        key = request.headers.get("Authorization", "")
+        now = time.time()
+        # Sliding one-second window per key
+        window = [t for t in self._request_times.get(key, []) if t > now - 1]
+        if len(window) >= self.config.rate_limit:
+            self._request_times[key] = window
+            return self._too_many_requests()
+        window.append(now)
+        self._request_times[key] = window
+        return None
+
+    def _too_many_requests(self):
+        self.stats["429"] += 1
+        return web.json_response({"code": 429, "message": "Too many requests"}, status=429,
+                                 headers={"Retry-After": str(self.config.retry_after)})
+
+    def _task_data(self, task):
+        done = time.time() >= task["done_at"]
+        status = "processing"
+        outputs = []
+        error = ""
+        if done and task["failed"]:
+            status = "failed"
+            error = "Injected task failure"
+        elif done:
+            status = "completed"
+            outputs = task["outputs"]
+        elif self.config.partial_outputs and not task["failed"]:
+            # Output i is ready after (i + 1) / count of the job time, the last one when the task completes
+            count = len(task["outputs"])
+            progress = (time.time() - task["submitted"]) / (task["done_at"] - task["submitted"])
+            outputs = task["outputs"][:min(int(progress * count), count - 1)]
+        return {
+            "id": task["id"],
+            "model": task["model"],
+            "outputs": outputs,
+            "urls": {"get": f"{self.base_url}/api/v2/predictions/{task['id']}/result"},
+            "status": status,
+            "created_at": task["created_at"],
+            "error": error,
+            "timings": {"inference": int((task["done_at"] - task["submitted"]) * 1000)},
+        }
+
+    async def submit(self, request):
+        self.stats["submit"] += 1
+        outage = await self._outage_response()
+        if outage is not None:
+            return outage
+        await asyncio.sleep(self.config.submit_latency)
+        limited = self._rate_limited(request)
+        if limited is not None:
+            return limited
+        if self.config.max_concurrent_tasks:
+            running = sum(1 for task in self.tasks.values()
+                          if task["key"] == request.headers.get("Authorization") and time.time() < task["done_at"])
+            if running >= self.config.max_concurrent_tasks:
+                return self._too_many_requests()
+        if self._injected_failure():
+            self.stats["submit_503"] += 1
+            return web.json_response({"code": 503, "message": "Service unavailable"}, status=503)
+        if not request.headers.get("Authorization", "").startswith("Bearer "):
+            return web.json_response({"code": 401, "message": "Unauthorized"}, status=401)
+
+        idempotency_key = request.headers.get("Idempotency-Key")
+        if idempotency_key in self._idempotency_keys:
+            # A retried submit gets the task the first attempt created
+            self.stats["duplicate_submit"] += 1
+            task = self.tasks[self._idempotency_keys[idempotency_key]]
+            return web.json_response({"code": 200, "message": "success", "data": self._task_data(task)})
+
+        payload = await request.json()
+        model = request.match_info["model"]
+        count = int(payload.get("max_images") or payload.get("num_images") or 1)
+        is_video = any(keyword in model for keyword in VIDEO_KEYWORDS)
+        ext = "mp4" if is_video else payload.get("output_format", "png").replace("jpeg", "jpg")
+        task_id = uuid.uuid4().hex
+        jitter = random.uniform(1 - self.config.job_latency_jitter, 1 + self.config.job_latency_jitter)
+        now = time.time()
+        task = {
+            "id": task_id,
+            "key": request.headers.get("Authorization"),
+            "model": model,
+            "submitted": now,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
+            "done_at": now + self.config.job_latency * jitter,
+            "failed": random.random() < self.config.task_failure_rate,
+            "outputs": [f"{self.base_url}/outputs/{task_id}/{index}.{ext}" for index in range(count)],
+        }
+        self.tasks[task_id] = task
+        if idempotency_key:
+            self._idempotency_keys[idempotency_key] = task_id
+
+        if payload.get("enable_sync_mode"):
+            await asyncio.sleep(max(task["done_at"] - time.time(), 0))
+        return web.json_response({"code": 200, "message": "success", "data": self._task_data(task)})
+
+    async def result(self, request):
+        self.stats["status"] += 1
+        outage = await self._outage_response()
+        if outage is not None:
+            return outage
+        await asyncio.sleep(self.config.status_latency)
+        limited = self._rate_limited(request)
+        if limited is not None:
+            return limited
+        if self._injected_failure():
+            self.stats["status_503"] += 1
+            return web.json_response({"code": 503, "message": "Service unavailable"}, status=503)
+        task = self.tasks.get(request.match_info["id"])
+        if task is None:
+            return web.json_response({"code": 404, "message": "Task not found"}, status=404)
+        return web.json_response({"code": 200, "message": "success", "data": self._task_data(task)})
+
+    async def upload(self, request):
+        self.stats["upload"] += 1
+        outage = await self._outage_response()
+        if outage is not None:
+            return outage
+        limited = self._rate_limited(request)
+        if limited is not None:
+            return limited
+        if self._injected_failure():
+            self.stats["upload_503"] += 1
+            return web.json_response({"code": 503, "message": "Service unavailable"}, status=503)
+        size = 0
+        reader = await request.multipart()
+        async for part in reader:
+            while True:
+                chunk = await part.read_chunk()
+                if not chunk:
+                    break
+                size += len(chunk)
+        self.uploaded_bytes += size
+        file_id = uuid.uuid4().hex
+        return web.json_response({"code": 200, "message": "success",
+                                  "data": {"download_url": f"{self.base_url}/outputs/{file_id}/0.png"}})
+
+    def _image_bytes(self, ext, size=None):
+        size = size or (self.config.image_size, self.config.image_size)
+        if (ext, size) not in self._image_cache:
+            image = PIL.Image.effect_noise(size, 40).convert("RGB")
+            buffered = io.BytesIO()
+            image.save(buffered, format={"jpg": "JPEG", "webp": "WEBP"}.get(ext, "PNG"))
+            self._image_cache[(ext, size)] = buffered.getvalue()
+        return self._image_cache[(ext, size)]
+
+    async def output(self, request):
+        self.stats["download"] += 1
+        await asyncio.sleep(self.config.download_latency)
+        ext = request.match_info["name"].rsplit(".", 1)[-1]
+        if ext == "mp4" and self.config.video_path:
+            return web.FileResponse(self.config.video_path)
+        if ext == "mp4":
+            return web.Response(body=b"\0" * self.config.video_bytes, content_type="video/mp4")
+        # ?size=WxH asks for an image of another size than the configured one
+        size = tuple(int(side) for side in request.query["size"].split("x")) if "size" in request.query else None
+        return web.Response(body=self._image_bytes(ext, size), content_type=f"image/{ext.replace('jpg', 'jpeg')}")
+
+    async def stats_handler(self, request):
+        return web.json_response(dict(self.stats, uploaded_bytes=self.uploaded_bytes))
+
+
+def start_mock_server(config=None, host="127.0.0.1", port=0):
+    """
+    Start the mock server on a background thread
+
+    Args:
+        config (MockConfig, optional): Server configuration
+        host (str): Interface to bind
+        port (int): Port to bind, 0 picks a free one
+
+    Returns:
+        MockWaveSpeedServer: The running server, with base_url set
+    """
+    server = MockWaveSpeedServer(config)
+    loop = asyncio.new_event_loop()
+    runner = web.AppRunner(server.build_app(), access_log=None)
+    loop.run_until_complete(runner.setup())
+    loop.run_until_complete(web.TCPSite(runner, host, port).start())
+    bound_port = runner.addresses[0][1]
+    server.base_url = f"http://{host}:{bound_port}"
+    threading.Thread(target=loop.run_forever, name="wavespeed-mock-server", daemon=True).start()
+    return server
+
+
+def add_config_arguments(parser):
+    parser.add_argument("--job-latency", type=float, default=5.0, help="Mean server-side job time in seconds")
+    parser.add_argument("--job-latency-jitter", type=float, default=0.2, help="Relative spread of the job time")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of API calls answered with 503")
+    parser.add_argument("--task-failure-rate", type=float, default=0.0, help="Fraction of tasks that fail")
+    parser.add_argument("--image-size", type=int, default=1024, help="Side length of output images")
+    parser.add_argument("--video-mb", type=float, default=8, help="Size of output videos in MB")
+    parser.add_argument("--rate-limit", type=float, default=0, help="API requests per second per key, 0 for none")
+    parser.add_argument("--max-concurrent-tasks", type=int, default=0, help="Unfinished tasks per key, 0 for none")
+    parser.add_argument("--partial-outputs", action="store_true", help="Publish outputs one by one while tasks run")
+
+
+def config_from_args(args):
+    return MockConfig(job_latency=args.job_latency, job_latency_jitter=args.job_latency_jitter,
+                      failure_rate=args.failure_rate, task_failure_rate=args.task_failure_rate,
+                      image_size=args.image_size, video_bytes=int(args.video_mb * 1024 * 1024),
+                      rate_limit=args.rate_limit, max_concurrent_tasks=args.max_concurrent_tasks,
+                      partial_outputs=args.partial_outputs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    server = start_mock_server(config_from_args(args), host=args.host, port=args.port)
+    print(f"Mock WaveSpeed API listening on {server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+How a queue of nodes behaves while the API is down, and after it recovers
+
+Runs a queue of nodes one after another, the way ComfyUI executes a
+backlog, against the mock API while it answers every call with a slow 503,
+then ends the outage and keeps running nodes until one succeeds. Reports
+how long the backlog took to fail and how long recovery took, with the
+circuit breakers disabled and enabled.
+
+    python benchmarks/outage.py --jobs 40 --outage-latency 2
+"""
+import argparse
+import os
+import time
+from common import import_node_module
+from mock_server import MockConfig, start_mock_server
+
+
+def run_queue(config, jobs, breaker_enabled, recovery_timeout):
+    # Breakers are created per base URL, so a fresh server gets fresh breakers with this setting
+    os.environ["WAVESPEED_CIRCUIT_BREAKER"] = "1" if breaker_enabled else "0"
+    server = start_mock_server(config)
+    os.environ["WAVESPEED_BASE_URL"] = server.base_url
+    node = import_node_module("qwen_image_text_to_image").QwenImageTextToImageNode()
+    client = {"api_key": "key-outage", "polling_policy": "adaptive"}
+
+    def _execute():
+        try:
+            node.execute(client, prompt="a lighthouse at dusk", enable_sync_mode=False)
+            return True
+        except Exception:
+            return False
+
+    server.outage = True
+    start = time.perf_counter()
+    failed = sum(1 for _ in range(jobs) if not _execute())
+    backlog = time.perf_counter() - start
+    sent = server.stats["outage_503"]
+
+    server.outage = False
+    start = time.perf_counter()
+    recovered = False
+    while not recovered and time.perf_counter() - start < recovery_timeout:
+        recovered = _execute()
+        if not recovered:
+            time.sleep(1)
+    recovery = time.perf_counter() - start
+    return failed, backlog, sent, recovered, recovery
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--outage-latency", type=float, default=2.0, help="Seconds the API takes to answer 503")
+    parser.add_argument("--recovery-timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    config = MockConfig(job_latency=2.0, image_size=256, outage_latency=args.outage_latency)
+    for name, enabled in (("breaker disabled", False), ("breaker enabled", True)):
+        failed, backlog, sent, recovered, recovery = run_queue(config, args.jobs, enabled, args.recovery_timeout)
+        status = f"recovered {recovery:.1f}s after the outage" if recovered else "did not recover"
+        print(f"{name}: {failed}/{args.jobs} queued nodes failed in {backlog:.1f}s, "
+              f"{sent} requests reached the degraded API, {status}")
+
+
+if __name__ == "__main__":
+    main()
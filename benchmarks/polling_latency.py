@@ -0,0 +1,55 @@
+"""
+Regression check for async completion latency
+
+Runs async-mode scenarios against the mock API with a fixed server-side
+job time and compares the median node latency with that job time. The
+check fails if any scenario adds more than the allowed overhead, which
+catches fixed sleeps and polling policies that overshoot early jobs.
+
+    python benchmarks/polling_latency.py --job-latency 6 --max-overhead 0.25
+"""
+import argparse
+import os
+import sys
+from mock_server import MockConfig, start_mock_server
+from run_benchmark import run_scenario
+
+
+DEFAULT_SCENARIOS = ["qwen_edit_async", "nano_banana_edit_async", "flux_controlnet_async", "qwen_t2i_async",
+                     "veo31_fast_async"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", default=",".join(DEFAULT_SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument("--job-latency", type=float, default=6.0, help="Server-side job time in seconds")
+    parser.add_argument("--iterations", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--image-size", type=int, default=256,
+                        help="Side length of output images, small so decoding does not mask polling latency")
+    parser.add_argument("--max-overhead", type=float, default=0.25,
+                        help="Allowed median latency above the job time, as a fraction of the job time")
+    args = parser.parse_args()
+
+    # No jitter, so every job takes exactly the configured time on the server
+    server = start_mock_server(MockConfig(job_latency=args.job_latency, job_latency_jitter=0,
+                                          image_size=args.image_size))
+    os.environ["WAVESPEED_BASE_URL"] = server.base_url
+
+    failed = []
+    for name in args.scenario.split(","):
+        result = run_scenario(name, server, args.iterations, args.workers, trace_memory=False)
+        overhead = result["p50_s"] / args.job_latency - 1
+        ok = overhead <= args.max_overhead
+        print(f"{name}: job {args.job_latency:.1f}s, p50 {result['p50_s']:.2f}s (+{overhead:.0%}), "
+              f"{result['status_checks_per_job']:.1f} status checks/job {'ok' if ok else 'FAIL'}")
+        if not ok:
+            failed.append(name)
+
+    if failed:
+        print(f"Median latency overhead above {args.max_overhead:.0%}: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
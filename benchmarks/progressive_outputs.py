@@ -0,0 +1,47 @@
+"""
+Fetch the outputs of a multi-image prediction while it is still running
+
+Runs the Seedream V4 Sequential node against the mock API, which
+publishes the outputs one by one over the job time, once with the
+outputs fetched after the prediction completes and once with each output
+downloaded and decoded as soon as a status check reports it. Reports the
+node time and how much of it came after the prediction completed.
+
+    python benchmarks/progressive_outputs.py --images 15 --job-latency 15 --image-size 2048
+"""
+import argparse
+import os
+import time
+from common import import_node_module
+from mock_server import MockConfig, start_mock_server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=15)
+    parser.add_argument("--job-latency", type=float, default=15.0, help="Server-side job time in seconds")
+    parser.add_argument("--image-size", type=int, default=2048, help="Side length of output images")
+    parser.add_argument("--download-latency", type=float, default=0.3, help="Time to first byte in seconds")
+    args = parser.parse_args()
+
+    server = start_mock_server(MockConfig(job_latency=args.job_latency, job_latency_jitter=0,
+                                          image_size=args.image_size, download_latency=args.download_latency,
+                                          partial_outputs=True))
+    os.environ["WAVESPEED_BASE_URL"] = server.base_url
+    node_module = import_node_module("bytedance_seedream_v4_sequential")
+    node = node_module.ByteDanceSeedDreamV4Sequential()
+    spec = node.SPEC
+    client = {"api_key": "mock-key", "polling_policy": "adaptive"}
+
+    print(f"{args.images} outputs of {args.image_size}x{args.image_size}, job time {args.job_latency:.1f} s")
+    print(f"{'outputs fetched':<16} {'seconds':>8} {'after job':>10}  batch")
+    for name, partial_outputs in (("after the job", False), ("while running", True)):
+        spec.partial_outputs = partial_outputs
+        start = time.perf_counter()
+        (batch,) = node.execute(client, "a sequence of images", args.images, "2048x2048 (1:1)", 0, False)
+        seconds = time.perf_counter() - start
+        print(f"{name:<16} {seconds:>8.2f} {seconds - args.job_latency:>10.2f}  {tuple(batch.shape)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Batch throughput against an account with request-rate and task limits
+
+Runs one large batch through the Batch Image node against the mock API
+configured with a per-key request rate and concurrent-task limit, once
+with the client-side limiter disabled and once with it matching the
+account limits, and reports wall time and how many 429s the server sent.
+
+    python benchmarks/rate_limit.py --predictions 48 --rate-limit 10 --max-concurrent-tasks 8
+"""
+import argparse
+import os
+import time
+from common import import_node_module
+from mock_server import MockConfig, start_mock_server
+from run_benchmark import request_counts
+
+
+def run_batch(server, predictions, max_in_flight, limits, api_key):
+    node = import_node_module("wavespeed_batch").WaveSpeedAIBatchImage()
+    prompts = "\n".join(f"a lighthouse, variation {index}" for index in range(predictions))
+
+    before = request_counts(server)
+    start = time.perf_counter()
+    error = None
+    try:
+        client = {"api_key": api_key, "polling_policy": "adaptive", "requests_per_second": limits[0],
+                  "max_concurrent_tasks": limits[1]}
+        node.execute(client, "Qwen Image Text-to-Image", prompts, max_in_flight=max_in_flight)
+    except Exception as e:
+        error = str(e).splitlines()[0][:120]
+    wall = time.perf_counter() - start
+    after = request_counts(server)
+    return wall, after.get("429", 0) - before.get("429", 0), error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--predictions", type=int, default=48)
+    parser.add_argument("--max-in-flight", type=int, default=48)
+    parser.add_argument("--rate-limit", type=float, default=10, help="Account API requests per second")
+    parser.add_argument("--max-concurrent-tasks", type=int, default=8, help="Account concurrent task limit")
+    parser.add_argument("--job-latency", type=float, default=2.0)
+    args = parser.parse_args()
+
+    config = MockConfig(job_latency=args.job_latency, job_latency_jitter=0, image_size=256, rate_limit=args.rate_limit,
+                        max_concurrent_tasks=args.max_concurrent_tasks)
+    runs = [("no client limits", (0, 0), "key-unlimited"),
+            ("client limits match account", (args.rate_limit, args.max_concurrent_tasks), "key-limited")]
+    for name, limits, api_key in runs:
+        # A fresh server and key per run so one run's leftovers do not count against the next
+        server = start_mock_server(config)
+        os.environ["WAVESPEED_BASE_URL"] = server.base_url
+        wall, rejected, error = run_batch(server, args.predictions, args.max_in_flight, limits, api_key)
+        status = f"failed: {error}" if error else "ok"
+        print(f"{name}: {args.predictions} predictions in {wall:.1f}s, {rejected} x 429, {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Decode large outputs at full size and at preview size
+
+Encodes an 8K photo-like image, the size ImageUpscalerNode returns, as
+JPEG and PNG and decodes a batch of it into an IMAGE tensor at full
+resolution and with a longest side of 1024, each in a fresh interpreter.
+Reports the time and the memory decoding needed on top of the encoded
+inputs (peak RSS minus RSS before it).
+
+    python benchmarks/reduced_decode.py --count 2 --size 8192 --max-side 1024
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import PIL.Image
+from common import import_node_module
+from image_conversion import peak_rss_mb, rss_mb
+from upload_encoding import photo_like
+
+
+FORMATS = ["JPEG", "PNG"]
+
+
+def run_one(path, count, max_side):
+    utils = import_node_module("wavespeed_api.utils")
+    tensors = import_node_module("wavespeed_api.tensors")
+    with open(path, "rb") as f:
+        data = f.read()
+    bodies = [data] * count
+    before = rss_mb()
+    start = time.perf_counter()
+    # What imageurl2tensor does with each downloaded body
+    batch = utils.pixels2tensor([tensors.image_to_array(utils.decode_image(body, max_side=max_side))
+                                 for body in bodies])
+    seconds = time.perf_counter() - start
+    print(json.dumps({"seconds": seconds, "extra_mb": peak_rss_mb() - before, "shape": list(batch.shape)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=2)
+    parser.add_argument("--size", type=int, default=8192)
+    parser.add_argument("--max-side", type=int, default=1024)
+    parser.add_argument("--run", metavar="PATH", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run_one(args.run, args.count, args.max_side)
+        return
+
+    # Upscaled from 2K like the upscaler's outputs; rendering noise at 8K takes several GB
+    image = photo_like(2048, 2048).resize((args.size, args.size), PIL.Image.Resampling.BICUBIC)
+    print(f"{args.count} x {args.size}x{args.size} outputs")
+    print(f"{'format':<6} {'MB':>6} {'max side':>9} {'seconds':>8} {'extra MB':>9}  batch")
+    with tempfile.TemporaryDirectory() as directory:
+        for image_format in FORMATS:
+            buffered = io.BytesIO()
+            image.save(buffered, format=image_format, **({"quality": 95} if image_format == "JPEG" else {}))
+            path = os.path.join(directory, f"output.{image_format.lower()}")
+            with open(path, "wb") as f:
+                f.write(buffered.getvalue())
+            for max_side in (0, args.max_side):
+                completed = subprocess.run([sys.executable, __file__, "--count", str(args.count), "--max-side",
+                                            str(max_side), "--run", path], capture_output=True, text=True,
+                                           check=True)
+                stats = json.loads(completed.stdout.strip().splitlines()[-1])
+                print(f"{image_format:<6} {len(buffered.getvalue()) / 1e6:>6.1f} {max_side or 'full':>9} "
+                      f"{stats['seconds']:>8.2f} {stats['extra_mb']:>9.0f}  {tuple(stats['shape'])}")
+
+
+if __name__ == "__main__":
+    main()
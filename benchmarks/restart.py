@@ -0,0 +1,67 @@
+"""
+What a worker restart in the middle of a long prediction costs
+
+Runs a node with a long job in a child process against the mock API, kills
+the child partway through the wait, then runs the same node again in a new
+child, the way ComfyUI re-executes a queue after a restart. Reports how
+many predictions were submitted and how long the second run took, with
+the task journal disabled and enabled.
+
+    python benchmarks/restart.py --job-latency 20 --kill-after 8
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from common import ROOT_DIR
+from mock_server import MockConfig, start_mock_server
+from run_benchmark import request_counts
+
+
+RUN_NODE = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from common import import_node_module
+node = import_node_module("google_veo31_fast_text_to_video").GoogleVeo31FastTextToVideo()
+node.execute({"api_key": "key-restart", "polling_policy": "adaptive"}, prompt="waves on a beach",
+             enable_sync_mode=False)
+"""
+
+
+def run_child(env, kill_after=None):
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, "-c", RUN_NODE, os.path.join(ROOT_DIR, "benchmarks")], env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        child.wait(timeout=kill_after)
+    except subprocess.TimeoutExpired:
+        child.kill()
+        child.wait()
+        return None
+    if child.returncode != 0:
+        raise Exception(f"Node run failed with exit code {child.returncode}")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--job-latency", type=float, default=20.0)
+    parser.add_argument("--kill-after", type=float, default=8.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, journal in (("journal disabled", "0"), ("journal enabled", os.path.join(tmp_dir, "tasks.db"))):
+            server = start_mock_server(MockConfig(job_latency=args.job_latency, job_latency_jitter=0,
+                                                  video_bytes=1024 * 1024))
+            env = dict(os.environ, WAVESPEED_BASE_URL=server.base_url, WAVESPEED_TASK_JOURNAL=journal)
+            run_child(env, kill_after=args.kill_after)
+            rerun = run_child(env)
+            submits = request_counts(server).get("submit", 0)
+            print(f"{name}: {submits} predictions submitted, rerun after the restart took {rerun:.1f}s "
+                  f"for a {args.job_latency:.0f}s job")
+
+
+if __name__ == "__main__":
+    main()
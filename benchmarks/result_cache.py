@@ -0,0 +1,50 @@
+"""
+What re-running a node with a fixed seed costs, with and without the result cache
+
+Runs the Flux Kontext Dev node several times with the same inputs and a
+fixed seed against the mock API, the way a workflow is re-run while
+iterating on downstream nodes, and reports predictions submitted, output
+downloads and time per re-run for each result cache mode. A random seed
+always submits.
+
+    python benchmarks/result_cache.py --runs 5
+"""
+import argparse
+import os
+import time
+from common import import_node_module
+from mock_server import MockConfig, start_mock_server
+from run_benchmark import request_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--job-latency", type=float, default=3.0)
+    args = parser.parse_args()
+
+    server = start_mock_server(MockConfig(job_latency=args.job_latency, job_latency_jitter=0, image_size=1024))
+    os.environ["WAVESPEED_BASE_URL"] = server.base_url
+    node = import_node_module("flux_kontext_dev").FluxKontextDevNode()
+    result_cache = import_node_module("wavespeed_api.result_cache")
+
+    for mode in result_cache.RESULT_CACHE_MODES:
+        for seed in (42, -1):
+            result_cache.get_result_cache().clear()
+            client = {"api_key": "key-cache", "polling_policy": "adaptive", "result_cache": mode}
+            before = request_counts(server)
+            latencies = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                node.execute(client, prompt="make it night", image_url=f"{server.base_url}/outputs/input/0.png",
+                             seed=seed, enable_sync_mode=False)
+                latencies.append(time.perf_counter() - start)
+            after = request_counts(server)
+            reruns = latencies[1:]
+            print(f"{mode}, seed {seed}: {after['submit'] - before.get('submit', 0)} submits, "
+                  f"{after['download'] - before.get('download', 0)} downloads for {args.runs} runs, "
+                  f"first run {latencies[0]:.2f}s, re-runs {sum(reruns) / len(reruns):.3f}s on average")
+
+
+if __name__ == "__main__":
+    main()
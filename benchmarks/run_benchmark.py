@@ -0,0 +1,139 @@
+"""
+End-to-end benchmark of node execute methods against the mock API
+
+Starts benchmarks/mock_server.py in-process, points the nodes at it through
+WAVESPEED_BASE_URL and drives real node execute calls from a pool of worker
+threads, the way parallel ComfyUI workers would. Reports throughput,
+p50/p99 latency, API request counts and peak memory per scenario.
+
+Requires the ComfyUI environment (torch, comfy_api) to import the nodes.
+
+    python benchmarks/run_benchmark.py --scenario all --iterations 20 --workers 8
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from common import import_node_module, percentile
+from mock_server import add_config_arguments, config_from_args, start_mock_server
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+CLIENT = {"api_key": "mock-key", "polling_policy": "adaptive"}
+
+# name -> (module in py/, node class, execute kwargs)
+SCENARIOS = {
+    "qwen_t2i_sync": ("qwen_image_text_to_image", "QwenImageTextToImageNode",
+                      {"prompt": "a lighthouse at dusk", "enable_sync_mode": True}),
+    "qwen_t2i_async": ("qwen_image_text_to_image", "QwenImageTextToImageNode",
+                       {"prompt": "a lighthouse at dusk", "enable_sync_mode": False}),
+    "seedream_sequential_15": ("bytedance_seedream_v4_sequential", "ByteDanceSeedDreamV4Sequential",
+                               {"prompt": "a comic strip", "max_images": 15, "size_preset": "2048x2048 (1:1)",
+                                "seed": 0, "enable_sync_mode": False}),
+    "nano_banana_multi_4": ("google_nano_banana_pro_text_to_image_multi", "GoogleNanoBananaProTextToImageMulti",
+                            {"prompt": "product shots", "aspect_ratio": "1:1", "num_images": 4,
+                             "output_format": "png", "enable_sync_mode": False}),
+    "image_upscaler": ("image_upscaler", "ImageUpscalerNode",
+                       {"image_url": "{base_url}/outputs/input/0.png", "enable_sync_mode": False}),
+    "qwen_edit_async": ("qwen_image_edit", "QwenImageEditNode",
+                        {"prompt": "make it snow", "image_url": "{base_url}/outputs/input/0.png",
+                         "enable_sync_mode": False}),
+    "nano_banana_edit_async": ("google_nano_banana_edit", "GoogleNanoBananaEditNode",
+                               {"prompt": "make it snow", "image_url": "{base_url}/outputs/input/0.png",
+                                "enable_sync_mode": False}),
+    "flux_controlnet_async": ("flux_controlnet_union_pro_2", "FluxControlNetUnionPro2",
+                              {"prompt": "a castle", "control_image": "{base_url}/outputs/input/0.png",
+                               "enable_sync_mode": False}),
+    "batch_qwen_t2i_16": ("wavespeed_batch", "WaveSpeedAIBatchImage",
+                          {"model": "Qwen Image Text-to-Image", "max_in_flight": 16,
+                           "prompts": "\n".join(f"a lighthouse at dusk, variation {i}" for i in range(16))}),
+    "veo31_fast_async": ("google_veo31_fast_text_to_video", "GoogleVeo31FastTextToVideo",
+                         {"prompt": "waves on a beach", "enable_sync_mode": False}),
+}
+
+
+def request_counts(server):
+    with urllib.request.urlopen(f"{server.base_url}/__stats") as response:
+        return json.loads(response.read())
+
+
+def peak_rss_mb():
+    if resource is None:
+        return float("nan")
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_scenario(name, server, iterations, workers, trace_memory):
+    module_name, class_name, kwargs = SCENARIOS[name]
+    node_class = getattr(import_node_module(module_name), class_name)
+    kwargs = {key: value.format(base_url=server.base_url) if isinstance(value, str) else value
+              for key, value in kwargs.items()}
+
+    def _execute(_):
+        start = time.perf_counter()
+        node_class().execute(CLIENT, **kwargs)
+        return time.perf_counter() - start
+
+    before = request_counts(server)
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        latencies = list(pool.map(_execute, range(iterations)))
+    wall = time.perf_counter() - start
+    traced_peak = None
+    if trace_memory:
+        traced_peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    after = request_counts(server)
+
+    counts = {key: after.get(key, 0) - before.get(key, 0) for key in after if after.get(key, 0) != before.get(key, 0)}
+    return {
+        "scenario": name,
+        "iterations": iterations,
+        "workers": workers,
+        "throughput_per_s": iterations / wall,
+        "p50_s": percentile(latencies, 0.5),
+        "p99_s": percentile(latencies, 0.99),
+        "requests": counts,
+        "status_checks_per_job": counts.get("status", 0) / iterations,
+        "peak_rss_mb": peak_rss_mb(),
+        "traced_peak_mb": traced_peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", default="all", help=f"One of {', '.join(SCENARIOS)} or all")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--trace-memory", action="store_true", help="Also report tracemalloc peak (slower)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON lines")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = start_mock_server(config_from_args(args))
+    os.environ["WAVESPEED_BASE_URL"] = server.base_url
+
+    names = list(SCENARIOS) if args.scenario == "all" else args.scenario.split(",")
+    for name in names:
+        result = run_scenario(name, server, args.iterations, args.workers, args.trace_memory)
+        if args.json:
+            print(json.dumps(result))
+            continue
+        print(f"{name}: {result['throughput_per_s']:.2f} jobs/s, p50 {result['p50_s']:.2f}s, "
+              f"p99 {result['p99_s']:.2f}s, {result['status_checks_per_job']:.1f} status checks/job, "
+              f"peak RSS {result['peak_rss_mb']:.0f} MB")
+        print(f"    requests: {result['requests']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark upload encodings on typical generation-sized inputs
+
+Compares the historical PNG path (compress level 6) with every codec
+in encoding.UPLOAD_CODECS on synthetic photo-like 1K, 2K and 4K images.
+
+    python benchmarks/upload_encoding.py
+"""
+import io
+import numpy
+import PIL.Image
+from common import import_node_module, timed
+
+
+SIZES = [("1K", 1024, 1024), ("2K", 2048, 2048), ("4K", 4096, 4096)]
+
+
+def photo_like(width, height, seed=0):
+    # Smooth gradients plus sensor-like noise compress roughly like real photos
+    rng = numpy.random.default_rng(seed)
+    y, x = numpy.mgrid[0:height, 0:width].astype(numpy.float32)
+    base = numpy.stack([
+        128 + 100 * numpy.sin(x / 97.0) * numpy.cos(y / 131.0),
+        128 + 100 * numpy.sin((x + y) / 173.0),
+        128 + 100 * numpy.cos(x / 59.0 - y / 83.0),
+    ], axis=-1)
+    noise = rng.normal(0, 6, size=base.shape)
+    return PIL.Image.fromarray(numpy.clip(base + noise, 0, 255).astype(numpy.uint8))
+
+
+def legacy_png(image):
+    buffered = io.BytesIO()
+    image.save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+def main():
+    encoding = import_node_module("wavespeed_api.encoding")
+    print(f"{'size':<5} {'codec':<14} {'ms':>8} {'MB':>8}")
+    for label, width, height in SIZES:
+        image = photo_like(width, height)
+        seconds, data = timed(legacy_png, image)
+        print(f"{label:<5} {'legacy png':<14} {seconds * 1000:>8.0f} {len(data) / 1e6:>8.2f}")
+        for codec in encoding.UPLOAD_CODECS:
+            seconds, (data, _, _) = timed(encoding.encode_for_upload, image, codec=codec)
+            print(f"{label:<5} {codec:<14} {seconds * 1000:>8.0f} {len(data) / 1e6:>8.2f}")
+        seconds, (data, _, _) = timed(encoding.encode_for_upload, image, codec="auto", allow_lossy=True)
+        print(f"{label:<5} {'auto (lossy)':<14} {seconds * 1000:>8.0f} {len(data) / 1e6:>8.2f}")
+        source = legacy_png(image)
+        seconds, (data, _, _) = timed(encoding.encode_for_upload, image, source_bytes=source)
+        print(f"{label:<5} {'passthrough':<14} {seconds * 1000:>8.0f} {len(data) / 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
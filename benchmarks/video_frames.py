@@ -0,0 +1,101 @@
+"""
+Download an output video and decode its frames into an IMAGE batch
+
+Encodes a 1080p clip, serves it from the mock API and turns it into
+frames the way a hand-made download node does (whole file in memory,
+every frame converted to float and stacked) and with
+video.videourl2frames at full size, with a frame stride and size limit,
+and for a time range. Each run happens in a fresh interpreter and
+reports time and the memory it needed (peak RSS minus RSS before it).
+
+    python benchmarks/video_frames.py --seconds 5 --fps 24
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy
+import torch
+from common import import_node_module
+from image_conversion import peak_rss_mb, rss_mb
+from mock_server import MockConfig, start_mock_server
+
+
+RUNS = {
+    "buffered": {},
+    "streamed": {},
+    "stride 2, 768": {"frame_stride": 2, "max_side": 768},
+    "2 s to 6 s": {"start_time": 2.0, "duration": 4.0},
+}
+
+
+def encode_clip(path, seconds, fps, width=1920, height=1080):
+    import av
+    y, x = numpy.mgrid[0:height, 0:width]
+    base = numpy.stack([(x * 255 // width), (y * 255 // height), ((x + y) * 255 // (width + height))],
+                       axis=-1).astype(numpy.uint8)
+    with av.open(path, mode="w") as container:
+        stream = container.add_stream("libx264", rate=fps, options={"preset": "ultrafast"})
+        stream.width, stream.height, stream.pix_fmt = width, height, "yuv420p"
+        for index in range(int(seconds * fps)):
+            frame = av.VideoFrame.from_ndarray(numpy.roll(base, index * 8, axis=1), format="rgb24")
+            container.mux(stream.encode(frame))
+        container.mux(stream.encode(None))
+
+
+def buffered_frames(url):
+    import av
+    utils = import_node_module("wavespeed_api.utils")
+    data = utils.fetch_image(url)
+    with av.open(io.BytesIO(data)) as container:
+        frames = [torch.from_numpy(frame.to_ndarray(format="rgb24")).float() / 255.0
+                  for frame in container.decode(video=0)]
+    return torch.stack(frames)
+
+
+def run_one(url, name):
+    video = import_node_module("wavespeed_api.video")
+    before = rss_mb()
+    start = time.perf_counter()
+    if name == "buffered":
+        frames = buffered_frames(url)
+    else:
+        frames, _ = video.videourl2frames(url, **RUNS[name])
+    seconds = time.perf_counter() - start
+    print(json.dumps({"seconds": seconds, "extra_mb": peak_rss_mb() - before, "shape": list(frames.shape)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--fps", type=int, default=24)
+    parser.add_argument("--run", nargs=2, metavar=("URL", "NAME"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        run_one(*args.run)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "clip.mp4")
+        encode_clip(path, args.seconds, args.fps)
+        server = start_mock_server(MockConfig(download_latency=0.1, video_path=path))
+        url = f"{server.base_url}/outputs/task0/0.mp4"
+        print(f"1920x1080 clip, {args.seconds:.0f} s at {args.fps} fps, {os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"{'run':<14} {'seconds':>8} {'extra MB':>9}  frames")
+        for name in RUNS:
+            completed = subprocess.run([sys.executable, __file__, "--run", url, name], capture_output=True, text=True)
+            if completed.returncode != 0:
+                reason = "killed, likely out of memory" if completed.returncode < 0 else \
+                    completed.stderr.strip().splitlines()[-1]
+                print(f"{name:<14} {'failed':>8} ({reason})")
+                continue
+            stats = json.loads(completed.stdout.strip().splitlines()[-1])
+            print(f"{name:<14} {stats['seconds']:>8.2f} {stats['extra_mb']:>9.0f}  {tuple(stats['shape'])}")
+
+
+if __name__ == "__main__":
+    main()
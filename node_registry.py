@@ -0,0 +1,244 @@
+"""
+Precomputed registry of the nodes in py/
+
+ComfyUI only needs a node's INPUT_TYPES and output metadata to build its
+node list. The registry stores that metadata so __init__.py can register
+lightweight proxy classes at startup. The real module, and everything it
+pulls in (torch, torchaudio, av, pydantic, comfy_api), is imported the
+first time one of its nodes executes.
+
+Entries carry a hash of their source file, so a module edited since the
+registry was built is imported eagerly until the registry is rebuilt:
+
+    python node_registry.py
+
+Inputs keep their source order, which ComfyUI uses for the widget order
+and saved workflows rely on. Check that the proxies match the real nodes
+with:
+
+    python node_registry.py --check
+"""
+import copy
+import hashlib
+import importlib
+import json
+import os
+import sys
+import types
+
+
+REGISTRY_FILE = "node_registry.json"
+# Version 1 files stored inputs sorted by name
+REGISTRY_VERSION = 2
+# Class attributes ComfyUI reads besides INPUT_TYPES
+PLAIN_ATTRIBUTES = ["RETURN_TYPES", "RETURN_NAMES", "FUNCTION", "CATEGORY", "OUTPUT_NODE", "OUTPUT_IS_LIST",
+                    "INPUT_IS_LIST", "OUTPUT_TOOLTIPS", "DESCRIPTION", "DEPRECATED", "EXPERIMENTAL"]
+# Hooks ComfyUI calls on the class itself, which a proxy cannot provide lazily
+CLASS_HOOKS = ["IS_CHANGED", "VALIDATE_INPUTS", "check_lazy_status"]
+
+
+def file_hash(path):
+    """
+    Hash a source file
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_registry(ext_dir):
+    """
+    Load the registry file
+
+    Args:
+        ext_dir (str): Extension root directory
+
+    Returns:
+        dict: Module file name to registry entry, empty if missing or outdated
+    """
+    try:
+        with open(os.path.join(ext_dir, REGISTRY_FILE), "r", encoding="utf-8") as f:
+            registry = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if registry.get("version") != REGISTRY_VERSION:
+        return {}
+    return registry.get("modules", {})
+
+
+def is_current(entry, path):
+    """
+    Check whether a registry entry still matches its source file
+
+    Args:
+        entry (dict): Registry entry for the module
+        path (str): Path to the module source
+
+    Returns:
+        bool: True if the entry can be used instead of importing the module
+    """
+    return entry.get("sha256") == file_hash(path)
+
+
+def _restore_input_types(input_types):
+    # JSON turns the (type, options) tuples into lists
+    return {section: {name: tuple(spec) for name, spec in inputs.items()}
+            for section, inputs in input_types.items()}
+
+
+def make_lazy_node(load_module, class_name, meta):
+    """
+    Build a proxy class that imports the real node on first execute
+
+    Args:
+        load_module (callable): Imports and returns the node's module
+        class_name (str): Name of the node class in that module
+        meta (dict): Registry metadata for the node
+
+    Returns:
+        type: Proxy node class
+    """
+    input_types = _restore_input_types(meta["input_types"])
+    function_name = meta["attributes"]["FUNCTION"]
+
+    def INPUT_TYPES(cls):
+        return copy.deepcopy(input_types)
+
+    def __init__(self):
+        self._node = None
+
+    def run(self, *args, **kwargs):
+        if self._node is None:
+            self._node = getattr(load_module(), class_name)()
+        return getattr(self._node, function_name)(*args, **kwargs)
+
+    attributes = {"INPUT_TYPES": classmethod(INPUT_TYPES), "__init__": __init__, function_name: run,
+                  "__doc__": meta.get("doc")}
+    for name, value in meta["attributes"].items():
+        attributes[name] = tuple(value) if isinstance(value, list) else value
+    return type(class_name, (object,), attributes)
+
+
+def describe_node(node_class):
+    """
+    Collect the registry metadata for a node class
+
+    Args:
+        node_class (type): The real node class
+
+    Returns:
+        dict | None: Metadata, or None if the node needs its class hooks and cannot be proxied
+    """
+    if any(hasattr(node_class, hook) for hook in CLASS_HOOKS):
+        return None
+    attributes = {name: getattr(node_class, name) for name in PLAIN_ATTRIBUTES if hasattr(node_class, name)}
+    return {
+        "class_name": node_class.__name__,
+        "doc": node_class.__doc__,
+        "input_types": node_class.INPUT_TYPES(),
+        "attributes": attributes,
+    }
+
+
+def build_registry(ext_dir):
+    """
+    Import every node module and write the registry file
+
+    Args:
+        ext_dir (str): Extension root directory
+
+    Returns:
+        dict: The registry that was written
+    """
+    py_dir = os.path.join(ext_dir, "py")
+    modules = {}
+    for file, module in _import_node_modules(ext_dir):
+        class_mappings = getattr(module, "NODE_CLASS_MAPPINGS", {})
+        display_mappings = getattr(module, "NODE_DISPLAY_NAME_MAPPINGS", {})
+        nodes = {}
+        for node_name, node_class in class_mappings.items():
+            meta = describe_node(node_class)
+            if meta is None:
+                nodes = None
+                break
+            meta["display_name"] = display_mappings.get(node_name, node_name)
+            nodes[node_name] = meta
+        if nodes is None:
+            print(f"{file}: node uses class hooks, it will be imported eagerly")
+            continue
+        modules[file] = {"sha256": file_hash(os.path.join(py_dir, file)), "nodes": nodes}
+
+    registry = {"version": REGISTRY_VERSION, "modules": modules}
+    with open(os.path.join(ext_dir, REGISTRY_FILE), "w", encoding="utf-8") as f:
+        # Not sorted: the order of the inputs is the order of the widgets
+        json.dump(registry, f, indent=1)
+        f.write("\n")
+    return registry
+
+
+def _import_node_modules(ext_dir):
+    package_name = "wavespeed_nodes_registry"
+    py_dir = os.path.join(ext_dir, "py")
+    package = types.ModuleType(package_name)
+    package.__path__ = [py_dir]
+    sys.modules[package_name] = package
+    for file in sorted(os.listdir(py_dir)):
+        if file.endswith(".py"):
+            yield file, importlib.import_module(f"{package_name}.{os.path.splitext(file)[0]}")
+
+
+def check_registry(ext_dir):
+    """
+    Compare the proxies built from the registry file with the real node classes
+
+    INPUT_TYPES are compared key for key in order, since ComfyUI lays out
+    widgets in that order and saved workflows store widget values by position.
+
+    Args:
+        ext_dir (str): Extension root directory
+
+    Returns:
+        list: Descriptions of the differences, empty when the registry matches
+    """
+    registry = load_registry(ext_dir)
+    problems = []
+    for file, module in _import_node_modules(ext_dir):
+        entry = registry.get(file)
+        if entry is None:
+            continue
+        if not is_current(entry, os.path.join(ext_dir, "py", file)):
+            problems.append(f"{file}: registry entry is outdated")
+            continue
+        class_mappings = getattr(module, "NODE_CLASS_MAPPINGS", {})
+        if list(entry["nodes"]) != list(class_mappings):
+            problems.append(f"{file}: registered nodes differ")
+            continue
+        for node_name, node_class in class_mappings.items():
+            proxy = make_lazy_node(lambda: module, node_class.__name__, entry["nodes"][node_name])
+            # JSON compares nested dicts in order, which == does not
+            if json.dumps(proxy.INPUT_TYPES()) != json.dumps(node_class.INPUT_TYPES()):
+                problems.append(f"{file}: INPUT_TYPES of {node_name} differ")
+            for name in PLAIN_ATTRIBUTES:
+                if json.dumps(getattr(proxy, name, None)) != json.dumps(getattr(node_class, name, None)):
+                    problems.append(f"{file}: {name} of {node_name} differs")
+    return problems
+
+
+if __name__ == "__main__":
+    ext_dir = os.path.dirname(os.path.abspath(__file__))
+    if "--check" in sys.argv[1:]:
+        problems = check_registry(ext_dir)
+        for problem in problems:
+            print(problem)
+        if problems:
+            sys.exit(1)
+        print(f"{REGISTRY_FILE} matches the node classes")
+    else:
+        registry = build_registry(ext_dir)
+        count = sum(len(entry["nodes"]) for entry in registry["modules"].values())
+        print(f"Wrote {count} nodes from {len(registry['modules'])} modules to {REGISTRY_FILE}")
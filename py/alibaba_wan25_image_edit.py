@@ -4,9 +4,7 @@ API Endpoint: /api/v3/alibaba/wan-2.5/image-edit
 Documentation: https://wavespeed.ai/docs/docs-api/alibaba/alibaba-wan-2.5-image-edit
 """
 
-import time
-from .wavespeed_api.utils import imageurl2tensor
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
 
 
 class AlibabaWan25ImageEdit:
@@ -89,6 +87,8 @@ class AlibabaWan25ImageEdit:
     RETURN_NAMES = ("output_image",)
     CATEGORY = "WaveSpeedAI/Alibaba"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/alibaba/wan-2.5/image-edit", output="image", expected_duration="image",
+                     polling_interval=2, timeout=300)
 
     def execute(self, client, prompt, image_1, size="1024x1024 (1:1)", seed=-1,
                 enable_sync_mode=True, image_2="", custom_width=1024, custom_height=1024):
@@ -97,9 +97,6 @@ class AlibabaWan25ImageEdit:
         Preserves layout and subject structure while implementing high-quality updates
         """
 
-        # Create the actual client object from the client dict
-        real_client = WaveSpeedClient(api_key=client["api_key"])
-
         # Build images array (1-2 images supported)
         images = [image_1]
         if image_2 and image_2.strip():
@@ -132,64 +129,11 @@ class AlibabaWan25ImageEdit:
         if seed != -1:
             payload["seed"] = seed
 
-        # API endpoint
-        endpoint = "/api/v3/alibaba/wan-2.5/image-edit"
-
         print(f"Alibaba Wan 2.5 Image Edit - Sending request with {len(images)} image(s)")
         print(f"Output size: {output_size}")
         print(f"Prompt: {prompt[:100]}..." if len(prompt) > 100 else f"Prompt: {prompt}")
 
-        try:
-            # Send request
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            # Handle sync mode
-            if enable_sync_mode:
-                # In sync mode, the API should return the completed result
-                if "outputs" in response and response["outputs"]:
-                    image_urls = response["outputs"]  # Already a list
-                    print(f"Sync mode: Received {len(image_urls)} output image(s)")
-                    return (imageurl2tensor(image_urls),)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-
-            # Handle async mode
-            else:
-                # Extract task ID for async polling
-                task_id = response.get("id")
-                if not task_id:
-                    raise Exception(f"No task ID received from async API. Response: {response}")
-
-                print(f"Async mode: Task submitted successfully. Request ID: {task_id}")
-                print("Polling for results...")
-
-                try:
-                    # Poll for task completion
-                    result = real_client.wait_for_task(
-                        task_id,
-                        polling_interval=2,  # Poll every 2 seconds
-                        timeout=300  # 5 minute timeout
-                    )
-
-                    # Extract output URLs from completed task
-                    if "outputs" in result and result["outputs"]:
-                        image_urls = result["outputs"]  # Already a list
-                        print(f"Async mode: Task completed. Received {len(image_urls)} output image(s)")
-
-                        # Check for NSFW content warning
-                        if "has_nsfw_contents" in result and any(result["has_nsfw_contents"]):
-                            print("Warning: Some outputs may contain NSFW content")
-
-                        return (imageurl2tensor(image_urls),)
-                    else:
-                        raise Exception("Task completed but no output images received")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-
-        except Exception as e:
-            print(f"Error in Alibaba Wan 2.5 Image Edit: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 # Node registration - REQUIRED
@@ -1,6 +1,4 @@
-import time
-from .wavespeed_api.utils import imageurl2tensor
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
 
 
 class ByteDanceSeedDreamV4:
@@ -51,11 +49,10 @@ class ByteDanceSeedDreamV4:
     RETURN_NAMES = ("output_image",)
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/bytedance/seedream-v4", output="image", expected_duration="fast_image",
+                     polling_interval=0.5, timeout=300)
     
     def execute(self, client, prompt, size_preset, seed, enable_sync_mode):
-        # Create the actual client object from the client dict
-        real_client = WaveSpeedClient(api_key=client["api_key"])
-
         # Find the preset dimensions
         preset_data = next((preset for preset in self.RECOMMENDED_PRESETS_SEEDREAM_4 if preset[0] == size_preset), None)
         if preset_data:
@@ -74,41 +71,8 @@ class ByteDanceSeedDreamV4:
         # Add seed if not 0 (0 means random for this API)
         if seed != 0:
             payload["seed"] = seed
-        
-        # API endpoint
-        endpoint = "/api/v3/bytedance/seedream-v4"
-        
-        try:
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-            
-            if enable_sync_mode:
-                # In sync mode, we get the results directly
-                if "outputs" in response and response["outputs"]:
-                    image_urls = response["outputs"]  # Already a list
-                    return (imageurl2tensor(image_urls),)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-            else:
-                # In async mode, we need to poll for results
-                task_id = response["id"]
-                print(f"Task submitted successfully. Request ID: {task_id}")
-                
-                try:
-                    # Wait for task to complete
-                    result = real_client.wait_for_task(task_id, polling_interval=0.5, timeout=300)
-                    
-                    if "outputs" in result and result["outputs"]:
-                        image_urls = result["outputs"]  # Already a list
-                        return (imageurl2tensor(image_urls),)
-                    else:
-                        raise Exception("Task completed but no output received")
-                        
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-                
-        except Exception as e:
-            print(f"Error in {self.__class__.__name__}: {str(e)}")
-            raise e
+
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 # Node registration - REQUIRED
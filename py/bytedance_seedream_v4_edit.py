@@ -1,6 +1,4 @@
-import time
-from .wavespeed_api.utils import imageurl2tensor
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
 
 
 class BytedanceSeedreamV4Edit:
@@ -56,10 +54,10 @@ class BytedanceSeedreamV4Edit:
     RETURN_NAMES = ("output_image",)
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/bytedance/seedream-v4/edit", output="image", expected_duration="fast_image",
+                     polling_interval=1, timeout=300)
 
     def execute(self, client, prompt, image_url, size_preset, seed, enable_sync_mode):
-        real_client = WaveSpeedClient(api_key=client["api_key"])
-
         # Find the preset dimensions
         preset_data = next((preset for preset in self.RECOMMENDED_PRESETS_SEEDREAM_4 if preset[0] == size_preset), None)
         if preset_data:
@@ -79,36 +77,7 @@ class BytedanceSeedreamV4Edit:
         if seed != 0:
             payload["seed"] = seed
 
-        endpoint = "/api/v3/bytedance/seedream-v4/edit"
-        
-        try:
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-            
-            if enable_sync_mode:
-                if "outputs" in response and response["outputs"]:
-                    image_urls = response["outputs"]
-                    return (imageurl2tensor(image_urls),)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-            else:
-                task_id = response["id"]
-                print(f"Task submitted successfully. Request ID: {task_id}")
-                
-                try:
-                    result = real_client.wait_for_task(task_id, polling_interval=1, timeout=300)
-                    
-                    if "outputs" in result and result["outputs"]:
-                        image_urls = result["outputs"]
-                        return (imageurl2tensor(image_urls),)
-                    else:
-                        raise Exception("Task completed but no output received")
-                        
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-                
-        except Exception as e:
-            print(f"Error in {self.__class__.__name__}: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 NODE_CLASS_MAPPINGS = {
@@ -1,6 +1,4 @@
-import time
-from .wavespeed_api.utils import imageurl2tensor
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
 
 
 class BytedanceSeedreamV4EditSequential:
@@ -99,11 +97,12 @@ class BytedanceSeedreamV4EditSequential:
     RETURN_NAMES = ("output_images",)
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/bytedance/seedream-v4/edit-sequential", output="image", expected_duration="image_batch",
+                     polling_interval=1, timeout=600, partial_outputs=True)
 
     def execute(self, client, prompt, max_images, size_preset, seed, enable_sync_mode,
                 image_1="", image_2="", image_3="", image_4="", image_5="",
                 image_6="", image_7="", image_8="", image_9="", image_10=""):
-        real_client = WaveSpeedClient(api_key=client["api_key"])
 
         # Collect all provided image URLs
         image_inputs = [image_1, image_2, image_3, image_4, image_5, image_6, image_7, image_8, image_9, image_10]
@@ -136,40 +135,7 @@ class BytedanceSeedreamV4EditSequential:
         if seed != 0:
             payload["seed"] = seed
 
-        # API endpoint for edit sequential
-        endpoint = "/api/v3/bytedance/seedream-v4/edit-sequential"
-
-        try:
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            if enable_sync_mode:
-                # In sync mode, we get the results directly
-                if "outputs" in response and response["outputs"]:
-                    image_urls = response["outputs"]  # Already a list
-                    return (imageurl2tensor(image_urls),)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-            else:
-                # In async mode, we need to poll for results
-                task_id = response["id"]
-                print(f"Task submitted successfully. Request ID: {task_id}")
-
-                try:
-                    # Wait for task to complete - longer timeout for sequential editing
-                    result = real_client.wait_for_task(task_id, polling_interval=1, timeout=600)
-
-                    if "outputs" in result and result["outputs"]:
-                        image_urls = result["outputs"]  # Already a list
-                        return (imageurl2tensor(image_urls),)
-                    else:
-                        raise Exception("Task completed but no output received")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-
-        except Exception as e:
-            print(f"Error in {self.__class__.__name__}: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 # Node registration - REQUIRED
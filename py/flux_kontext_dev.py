@@ -1,6 +1,5 @@
-import time
-from .wavespeed_api.utils import imageurl2tensor
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
+
 
 class FluxKontextDevNode:
     """
@@ -73,6 +72,8 @@ class FluxKontextDevNode:
 
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/wavespeed-ai/flux-kontext-dev", output="image", expected_duration="image",
+                     polling_interval=1, timeout=300)
 
     def execute(self, client, prompt, image_url, guidance_scale=2.5,
                 num_inference_steps=28, seed=-1, output_format="jpeg", enable_sync_mode=True,
@@ -108,54 +109,7 @@ class FluxKontextDevNode:
             "enable_base64_output": False
         }
 
-        # API endpoint for Flux Kontext Dev
-        endpoint = "/api/v3/wavespeed-ai/flux-kontext-dev"
-
-        try:
-            # Create the actual client object from the client dict
-            real_client = WaveSpeedClient(api_key=client["api_key"])
-
-            # Make the API request
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            # Handle sync mode response
-            if enable_sync_mode:
-                # WaveSpeedClient already extracts the 'data' field
-                if "outputs" in response and response["outputs"]:
-                    image_urls = response["outputs"]
-                    print(f"Sync mode completed. Generated {len(image_urls)} image(s)")
-                    # Pass the full URLs array
-                    return (imageurl2tensor(image_urls),)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-
-            # Handle async mode response
-            else:
-                # Extract task ID from response
-                if "id" not in response:
-                    raise Exception(f"No task ID received from API. Response: {response}")
-
-                task_id = response["id"]
-                print(f"Task submitted successfully. Request ID: {task_id}")
-
-                # Use the client's wait_for_task method for polling
-                try:
-                    result = real_client.wait_for_task(task_id, polling_interval=1, timeout=300)
-
-                    if "outputs" in result and result["outputs"]:
-                        image_urls = result["outputs"]
-                        print(f"Task completed. Generated {len(image_urls)} image(s)")
-                        # Pass the full URLs array
-                        return (imageurl2tensor(image_urls),)
-                    else:
-                        raise Exception("Task completed but no output received")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-
-        except Exception as e:
-            print(f"Error in Flux Kontext Dev: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 # Node registration
@@ -1,7 +1,4 @@
-import time
-
-from .wavespeed_api.client import WaveSpeedClient
-from .wavespeed_api.utils import imageurl2tensor
+from .wavespeed_api.executor import ModelSpec, run_model
 
 
 class GoogleNanoBananaProEditUltra:
@@ -132,6 +129,8 @@ class GoogleNanoBananaProEditUltra:
     RETURN_NAMES = ("output_image",)
     CATEGORY = "WaveSpeedAI/Google"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/google/nano-banana-pro/edit-ultra", output="image", expected_duration="image",
+                     polling_interval=1, timeout=300)
 
     def execute(
         self,
@@ -148,8 +147,6 @@ class GoogleNanoBananaProEditUltra:
         image_5="",
         image_6="",
     ):
-        real_client = WaveSpeedClient(api_key=client["api_key"])
-
         # Build images array from all provided image inputs
         images = [image_1]
 
@@ -167,42 +164,7 @@ class GoogleNanoBananaProEditUltra:
             "enable_base64_output": False,
         }
 
-        endpoint = "/api/v3/google/nano-banana-pro/edit-ultra"
-
-        try:
-            response = real_client.post(
-                endpoint, payload, timeout=real_client.once_timeout
-            )
-
-            if enable_sync_mode:
-                if "outputs" in response and response["outputs"]:
-                    image_urls = response["outputs"]
-                    return (imageurl2tensor(image_urls),)
-                else:
-                    raise Exception(
-                        f"No output received from sync API. Response: {response}"
-                    )
-            else:
-                task_id = response["id"]
-                print(f"Task submitted successfully. Request ID: {task_id}")
-
-                try:
-                    result = real_client.wait_for_task(
-                        task_id, polling_interval=1, timeout=300
-                    )
-
-                    if "outputs" in result and result["outputs"]:
-                        image_urls = result["outputs"]
-                        return (imageurl2tensor(image_urls),)
-                    else:
-                        raise Exception("Task completed but no output received")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-
-        except Exception as e:
-            print(f"Error in {self.__class__.__name__}: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 NODE_CLASS_MAPPINGS = {
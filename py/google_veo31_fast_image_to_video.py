@@ -1,5 +1,5 @@
-import time
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
+
 
 class GoogleVeo31FastImageToVideo:
     """
@@ -66,6 +66,8 @@ class GoogleVeo31FastImageToVideo:
     RETURN_NAMES = ("video_url",)
     CATEGORY = "WaveSpeedAI/Google VEO 3.1"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/google/veo3.1-fast/image-to-video", output="video_url", expected_duration="video",
+                     polling_interval=2, timeout=1800)
 
     def execute(self, client, image, prompt, aspect_ratio="16:9", duration=8, resolution="1080p",
                 generate_audio=False, negative_prompt="", seed=-1, enable_sync_mode=False):
@@ -88,9 +90,6 @@ class GoogleVeo31FastImageToVideo:
             Video URL string
         """
 
-        # Create the actual client object from the client dict
-        real_client = WaveSpeedClient(api_key=client["api_key"])
-
         # Build payload with all parameters
         payload = {
             "prompt": prompt,
@@ -108,43 +107,7 @@ class GoogleVeo31FastImageToVideo:
         if seed != -1:
             payload["seed"] = seed
 
-        # API endpoint
-        endpoint = "/api/v3/google/veo3.1-fast/image-to-video"
-
-        try:
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            if enable_sync_mode:
-                # For sync mode, response should contain outputs directly
-                if "outputs" in response and response["outputs"]:
-                    video_url = response["outputs"][0]
-                    print(f"Video generation completed. URL: {video_url}")
-                    return (video_url,)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-            else:
-                # For async mode, get task ID and poll for results
-                task_id = response["id"]
-                print(f"Video generation task submitted. Request ID: {task_id}")
-                print(f"This may take several minutes to complete...")
-
-                try:
-                    print(f"Waiting for video generation to complete (task ID: {task_id})...")
-                    result = real_client.wait_for_task(task_id, polling_interval=2, timeout=1800)  # 30 minutes
-
-                    if "outputs" in result and result["outputs"]:
-                        video_url = result["outputs"][0]
-                        print(f"Video generation completed. URL: {video_url}")
-                        return (video_url,)
-                    else:
-                        raise Exception("Task completed but no output received")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-
-        except Exception as e:
-            print(f"Error in Google VEO 3.1 Fast Image-to-Video: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 # Node registration
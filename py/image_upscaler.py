@@ -1,6 +1,5 @@
-import time
-from .wavespeed_api.utils import imageurl2tensor
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
+
 
 class ImageUpscalerNode:
     """
@@ -47,6 +46,8 @@ class ImageUpscalerNode:
     RETURN_NAMES = ("upscaled_image",)
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/wavespeed-ai/image-upscaler", output="image", expected_duration="image",
+                     polling_interval=1, timeout=300, deterministic=True)
 
     def execute(self, client, image_url, target_resolution="4k", creativity=0.0,
                 output_format="jpeg", enable_sync_mode=True):
@@ -65,9 +66,6 @@ class ImageUpscalerNode:
             Upscaled image tensor
         """
 
-        # Create the actual client object from the client dict
-        real_client = WaveSpeedClient(api_key=client["api_key"])
-
         # Validate creativity range
         if creativity < -2.0 or creativity > 2.0:
             raise ValueError(f"Creativity must be between -2 and 2, got {creativity}")
@@ -82,41 +80,7 @@ class ImageUpscalerNode:
             "enable_base64_output": False
         }
 
-        # API endpoint for Image Upscaler
-        endpoint = "/api/v3/wavespeed-ai/image-upscaler"
-
-        try:
-            # Make the API request
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            if enable_sync_mode:
-                # In sync mode, we get the results directly
-                if "outputs" in response and response["outputs"]:
-                    image_urls = response["outputs"]  # Already a list
-                    return (imageurl2tensor(image_urls),)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-            else:
-                # In async mode, we need to poll for results
-                task_id = response["id"]
-                print(f"Task submitted successfully. Request ID: {task_id}")
-
-                try:
-                    # Wait for task to complete using the helper method
-                    result = real_client.wait_for_task(task_id, polling_interval=1, timeout=300)
-
-                    if "outputs" in result and result["outputs"]:
-                        image_urls = result["outputs"]  # Already a list
-                        return (imageurl2tensor(image_urls),)
-                    else:
-                        raise Exception("Task completed but no output received")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-
-        except Exception as e:
-            print(f"Error in {self.__class__.__name__}: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 # Node registration
@@ -1,6 +1,4 @@
-import time
-from .wavespeed_api.utils import imageurl2tensor
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
 
 
 class InfiniteTalk:
@@ -68,6 +66,8 @@ class InfiniteTalk:
     RETURN_NAMES = ("video_url",)
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/wavespeed-ai/infinitetalk", output="video_url", expected_duration="long_video",
+                     polling_interval=2, timeout=1200)
 
     def execute(self, client, audio, image, resolution, enable_sync_mode,
                 prompt="", mask_image="", seed=-1, enable_base64_output=False):
@@ -89,9 +89,6 @@ class InfiniteTalk:
             Video URL as string
         """
 
-        # Create the actual client object from the client dict
-        real_client = WaveSpeedClient(api_key=client["api_key"])
-
         # Build payload
         payload = {
             "audio": audio,
@@ -112,43 +109,7 @@ class InfiniteTalk:
         if seed != -1:
             payload["seed"] = seed
 
-        # API endpoint for InfiniteTalk
-        endpoint = "/api/v3/wavespeed-ai/infinitetalk"
-
-        try:
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            if enable_sync_mode:
-                # In sync mode, we get the results directly
-                if "outputs" in response and response["outputs"]:
-                    # InfiniteTalk returns video URLs, take the first one
-                    video_url = response["outputs"][0]
-                    return (video_url,)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-            else:
-                # In async mode, we need to poll for results
-                task_id = response["id"]
-                print(f"InfiniteTalk task submitted successfully. Request ID: {task_id}")
-                print("Note: Video generation may take several minutes depending on audio length and resolution.")
-
-                try:
-                    # Wait for task to complete - longer timeout for video generation
-                    result = real_client.wait_for_task(task_id, polling_interval=2, timeout=1200)  # 20 minutes timeout
-
-                    if "outputs" in result and result["outputs"]:
-                        # Take the first video URL from outputs
-                        video_url = result["outputs"][0]
-                        return (video_url,)
-                    else:
-                        raise Exception("Task completed but no output received")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-
-        except Exception as e:
-            print(f"Error in InfiniteTalk: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 # Node registration - REQUIRED
@@ -1,6 +1,4 @@
-import time
-from .wavespeed_api.utils import imageurl2tensor
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
 
 
 class InfiniteTalkMulti:
@@ -78,6 +76,8 @@ class InfiniteTalkMulti:
     RETURN_NAMES = ("video_url",)
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/wavespeed-ai/infinitetalk/multi", output="video_url", expected_duration="long_video",
+                     polling_interval=2, timeout=1200)
 
     def execute(self, client, left_audio, right_audio, image, resolution, enable_sync_mode,
                 prompt="", audio_order="meanwhile", mask_image="", seed=-1, enable_base64_output=False):
@@ -101,9 +101,6 @@ class InfiniteTalkMulti:
             Video URL as string
         """
 
-        # Create the actual client object from the client dict
-        real_client = WaveSpeedClient(api_key=client["api_key"])
-
         # Build payload with dual audio inputs
         payload = {
             "left_audio": left_audio,
@@ -128,43 +125,7 @@ class InfiniteTalkMulti:
         if seed != -1:
             payload["seed"] = seed
 
-        # API endpoint for InfiniteTalk Multi
-        endpoint = "/api/v3/wavespeed-ai/infinitetalk/multi"
-
-        try:
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            if enable_sync_mode:
-                # In sync mode, we get the results directly
-                if "outputs" in response and response["outputs"]:
-                    # InfiniteTalk Multi returns video URLs, take the first one
-                    video_url = response["outputs"][0]
-                    return (video_url,)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-            else:
-                # In async mode, we need to poll for results
-                task_id = response["id"]
-                print(f"InfiniteTalk Multi task submitted successfully. Request ID: {task_id}")
-                print("Note: Multi-character video generation may take several minutes depending on audio length and complexity.")
-
-                try:
-                    # Wait for task to complete - longer timeout for multi-character video generation
-                    result = real_client.wait_for_task(task_id, polling_interval=2, timeout=1200)  # 20 minutes timeout
-
-                    if "outputs" in result and result["outputs"]:
-                        # Take the first video URL from outputs
-                        video_url = result["outputs"][0]
-                        return (video_url,)
-                    else:
-                        raise Exception("Task completed but no output received")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-
-        except Exception as e:
-            print(f"Error in InfiniteTalk Multi: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 # Node registration - REQUIRED
@@ -1,6 +1,5 @@
-import time
-from .wavespeed_api.utils import imageurl2tensor
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
+
 
 class QwenImageEditNode:
     """
@@ -49,6 +48,8 @@ class QwenImageEditNode:
     
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/wavespeed-ai/qwen-image/edit", output="image", expected_duration="image",
+                     polling_interval=1, timeout=1800)
     
     def execute(self, client, prompt, image_url, seed=-1, output_format="jpeg", 
                 enable_sync_mode=True):
@@ -77,60 +78,7 @@ class QwenImageEditNode:
             "enable_base64_output": False
         }
         
-        # API endpoint for Qwen Image Edit
-        endpoint = "/api/v3/wavespeed-ai/qwen-image/edit"
-        
-        try:
-            # Create the actual client object from the client dict
-            real_client = WaveSpeedClient(api_key=client["api_key"])
-            
-            # Make the API request
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-            
-            # Handle sync mode response
-            if enable_sync_mode:
-                # Check if we have outputs
-                if "outputs" in response and response["outputs"]:
-                    # Get all output URLs
-                    image_urls = response["outputs"]
-                    # Pass the full URLs array like original nodes do
-                    return (imageurl2tensor(image_urls),)
-                else:
-                    raise Exception("No output received from API")
-            
-            # Handle async mode response
-            else:
-                # Poll for completion
-                task_id = response.get("id")
-                if not task_id:
-                    raise Exception("No task ID received from API")
-                
-                # Poll endpoint
-                poll_endpoint = f"/api/v3/tasks/{task_id}"
-                max_attempts = 60  # Max 30 minutes with 30 second intervals
-                
-                for attempt in range(max_attempts):
-                    time.sleep(30)  # Wait 30 seconds between polls
-                    
-                    poll_response = real_client.get(poll_endpoint)
-                    status = poll_response.get("status")
-                    
-                    if status == "completed":
-                        if "outputs" in poll_response and poll_response["outputs"]:
-                            image_urls = poll_response["outputs"]
-                            return (imageurl2tensor(image_urls),)
-                        else:
-                            raise Exception("Task completed but no output received")
-                    
-                    elif status == "failed":
-                        error_msg = poll_response.get("error", "Task failed without error message")
-                        raise Exception(f"Task failed: {error_msg}")
-                
-                raise Exception("Task timed out after 30 minutes")
-        
-        except Exception as e:
-            print(f"Error in Qwen Image Edit: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 # Node registration
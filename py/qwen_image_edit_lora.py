@@ -1,6 +1,5 @@
-import time
-from .wavespeed_api.utils import imageurl2tensor
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
+
 
 class QwenImageEditLoraNode:
     """
@@ -73,6 +72,8 @@ class QwenImageEditLoraNode:
 
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/wavespeed-ai/qwen-image/edit-lora", output="image", expected_duration="image",
+                     polling_interval=1, timeout=300)
 
     def execute(self, client, prompt, image_url, seed=-1, output_format="jpeg",
                 enable_sync_mode=True,
@@ -122,52 +123,7 @@ class QwenImageEditLoraNode:
             "loras": lora_list
         }
 
-        # API endpoint for Qwen Image Edit with LoRA
-        endpoint = "/api/v3/wavespeed-ai/qwen-image/edit-lora"
-
-        try:
-            # Create the actual client object from the client dict
-            real_client = WaveSpeedClient(api_key=client["api_key"])
-
-            # Make the API request
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            # Handle sync mode response
-            if enable_sync_mode:
-                # Check if we have outputs
-                if "outputs" in response and response["outputs"]:
-                    # Get all output URLs
-                    image_urls = response["outputs"]
-                    # Pass the full URLs array like original nodes do
-                    return (imageurl2tensor(image_urls),)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-
-            # Handle async mode response
-            else:
-                # Extract task ID
-                task_id = response.get("id")
-                if not task_id:
-                    raise Exception(f"No task ID received from API. Response: {response}")
-
-                print(f"Task submitted successfully. Request ID: {task_id}")
-
-                try:
-                    # Use the client's built-in wait_for_task method
-                    result = real_client.wait_for_task(task_id, polling_interval=1, timeout=300)
-
-                    if "outputs" in result and result["outputs"]:
-                        image_urls = result["outputs"]
-                        return (imageurl2tensor(image_urls),)
-                    else:
-                        raise Exception("Task completed but no output received")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-
-        except Exception as e:
-            print(f"Error in Qwen Image Edit LoRA: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 # Node registration
@@ -1,6 +1,4 @@
-import time
-from .wavespeed_api.utils import imageurl2tensor
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
 
 
 class QwenImageEditPlus:
@@ -76,12 +74,12 @@ class QwenImageEditPlus:
     RETURN_NAMES = ("output_image",)
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/wavespeed-ai/qwen-image/edit-plus", output="image", expected_duration="image",
+                     polling_interval=2, timeout=300)
 
     def execute(self, client, prompt="", image_url_1="", image_url_2="", image_url_3="",
                 size="1328x1328 (1:1)", custom_size="", seed=-1, output_format="jpeg",
                 enable_base64_output=False, enable_sync_mode=True):
-        # Create the actual client object from the client dict
-        real_client = WaveSpeedClient(api_key=client["api_key"])
 
         # Collect image URLs (max 3)
         image_urls = []
@@ -125,39 +123,7 @@ class QwenImageEditPlus:
         if seed != -1:
             payload["seed"] = seed
 
-        # API endpoint
-        endpoint = "/api/v3/wavespeed-ai/qwen-image/edit-plus"
-
-        try:
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            if enable_sync_mode:
-                # Sync mode - response should contain outputs directly
-                if "outputs" in response and response["outputs"]:
-                    image_urls = response["outputs"]
-                    return (imageurl2tensor(image_urls),)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-            else:
-                # Async mode - need to poll for results
-                task_id = response["id"]
-                print(f"Qwen Image Edit Plus task submitted. Request ID: {task_id}")
-
-                try:
-                    result = real_client.wait_for_task(task_id, polling_interval=2, timeout=300)
-
-                    if "outputs" in result and result["outputs"]:
-                        image_urls = result["outputs"]
-                        return (imageurl2tensor(image_urls),)
-                    else:
-                        raise Exception("Task completed but no output received")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
-
-        except Exception as e:
-            print(f"Error in Qwen Image Edit Plus: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 
 # Node registration
@@ -1,5 +1,5 @@
-import time
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
+
 
 class RunwaymlUpscaleV1Node:
     """
@@ -30,59 +30,19 @@ class RunwaymlUpscaleV1Node:
     RETURN_NAMES = ("upscaled_video_url",)
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/runwayml/upscale-v1", output="video_url", expected_duration="video",
+                     polling_interval=2, timeout=600, deterministic=True)
 
     def execute(self, client, video_url, enable_sync_mode):
-        # Create the actual client object from the client dict
-        real_client = WaveSpeedClient(api_key=client["api_key"])
-
         # Build payload
         payload = {
             "video": video_url
         }
 
-        # API endpoint
-        endpoint = "/api/v3/runwayml/upscale-v1"
-
-        try:
-            print(f"Submitting RunwayML Upscale V1 task...")
-            print(f"Video URL: {video_url[:50]}...")
-
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            if enable_sync_mode:
-                # In sync mode, wait for the result
-                if "outputs" in response and response["outputs"]:
-                    video_urls = response["outputs"]  # Already a list
-                    print(f"Task completed successfully. Received {len(video_urls)} video(s)")
-                    # Return the first video URL
-                    video_url = video_urls[0]
-                    return (video_url,)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-            else:
-                # In async mode, submit task and poll for results
-                task_id = response["id"]
-                print(f"Task submitted successfully. Request ID: {task_id}")
-
-                try:
-                    # Poll for task completion - longer timeout for upscaling
-                    result = real_client.wait_for_task(task_id, polling_interval=2, timeout=600)
-
-                    if "outputs" in result and result["outputs"]:
-                        video_urls = result["outputs"]  # Already a list
-                        print(f"Task completed successfully. Received {len(video_urls)} video(s)")
-                        # Return the first video URL
-                        video_url = video_urls[0]
-                        return (video_url,)
-                    else:
-                        raise Exception(f"Task completed but no output received. Response: {result}")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
+        print(f"Submitting RunwayML Upscale V1 task...")
+        print(f"Video URL: {video_url[:50]}...")
 
-        except Exception as e:
-            print(f"Error in RunwayML Upscale V1: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 # Add the mappings that your __init__.py file will automatically find
 NODE_CLASS_MAPPINGS = {
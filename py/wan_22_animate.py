@@ -1,5 +1,5 @@
-import time
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
+
 
 class WaveSpeedAIWAN22Animate:
     @classmethod
@@ -46,11 +46,10 @@ class WaveSpeedAIWAN22Animate:
     RETURN_NAMES = ("video_url",)
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/wavespeed-ai/wan-2.2/animate", output="video_url", expected_duration="video",
+                     polling_interval=2, timeout=600)
 
     def execute(self, client, image_url, video_url, resolution, enable_sync_mode, prompt="", seed=-1):
-        # Create the actual client object from the client dict
-        real_client = WaveSpeedClient(api_key=client["api_key"])
-
         # Build payload
         payload = {
             "image": image_url,
@@ -63,52 +62,13 @@ class WaveSpeedAIWAN22Animate:
         if prompt and prompt.strip():
             payload["prompt"] = prompt.strip()
 
-        # API endpoint
-        endpoint = "/api/v3/wavespeed-ai/wan-2.2/animate"
-
-        try:
-            print(f"Submitting WAN 2.2 Animate task...")
-            print(f"Resolution: {resolution}")
-            print(f"Seed: {seed}")
-            if prompt:
-                print(f"Prompt: {prompt[:100]}...")
-
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            if enable_sync_mode:
-                # In sync mode, wait for the result
-                if "outputs" in response and response["outputs"]:
-                    video_urls = response["outputs"]  # Already a list
-                    print(f"Task completed successfully. Received {len(video_urls)} video(s)")
-                    # Return the first video URL like other WaveSpeed video nodes
-                    video_url = video_urls[0]
-                    return (video_url,)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-            else:
-                # In async mode, submit task and poll for results
-                task_id = response["id"]
-                print(f"Task submitted successfully. Request ID: {task_id}")
-
-                try:
-                    # Poll for task completion
-                    result = real_client.wait_for_task(task_id, polling_interval=2, timeout=600)
-
-                    if "outputs" in result and result["outputs"]:
-                        video_urls = result["outputs"]  # Already a list
-                        print(f"Task completed successfully. Received {len(video_urls)} video(s)")
-                        # Return the first video URL like other WaveSpeed video nodes
-                        video_url = video_urls[0]
-                        return (video_url,)
-                    else:
-                        raise Exception(f"Task completed but no output received. Response: {result}")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
+        print(f"Submitting WAN 2.2 Animate task...")
+        print(f"Resolution: {resolution}")
+        print(f"Seed: {seed}")
+        if prompt:
+            print(f"Prompt: {prompt[:100]}...")
 
-        except Exception as e:
-            print(f"Error in WaveSpeedAI WAN 2.2 Animate: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 # Node registration - REQUIRED
 NODE_CLASS_MAPPINGS = {
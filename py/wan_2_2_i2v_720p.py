@@ -1,5 +1,5 @@
-import time
-from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.executor import ModelSpec, run_model
+
 
 class Wan2x2I2V720pNode:
     """
@@ -59,11 +59,11 @@ class Wan2x2I2V720pNode:
     RETURN_NAMES = ("video_url",)
     CATEGORY = "WaveSpeedAI"
     FUNCTION = "execute"
+    SPEC = ModelSpec("/api/v3/wavespeed-ai/wan-2.2/i2v-720p", output="video_url", expected_duration="video",
+                     polling_interval=2, timeout=600)
 
     def execute(self, client, image_url, prompt, duration, enable_sync_mode,
                 negative_prompt="", last_image_url="", seed=-1):
-        # Create the actual client object from the client dict
-        real_client = WaveSpeedClient(api_key=client["api_key"])
 
         # Build payload
         payload = {
@@ -80,52 +80,13 @@ class Wan2x2I2V720pNode:
         if last_image_url and last_image_url.strip():
             payload["last_image"] = last_image_url.strip()
 
-        # API endpoint
-        endpoint = "/api/v3/wavespeed-ai/wan-2.2/i2v-720p"
-
-        try:
-            print(f"Submitting WAN 2.2 I2V 720p task...")
-            print(f"Duration: {duration} seconds")
-            print(f"Seed: {seed}")
-            if prompt:
-                print(f"Prompt: {prompt[:100]}...")
-
-            response = real_client.post(endpoint, payload, timeout=real_client.once_timeout)
-
-            if enable_sync_mode:
-                # In sync mode, wait for the result
-                if "outputs" in response and response["outputs"]:
-                    video_urls = response["outputs"]  # Already a list
-                    print(f"Task completed successfully. Received {len(video_urls)} video(s)")
-                    # Return the first video URL
-                    video_url = video_urls[0]
-                    return (video_url,)
-                else:
-                    raise Exception(f"No output received from sync API. Response: {response}")
-            else:
-                # In async mode, submit task and poll for results
-                task_id = response["id"]
-                print(f"Task submitted successfully. Request ID: {task_id}")
-
-                try:
-                    # Poll for task completion - longer timeout for video generation
-                    result = real_client.wait_for_task(task_id, polling_interval=2, timeout=600)
-
-                    if "outputs" in result and result["outputs"]:
-                        video_urls = result["outputs"]  # Already a list
-                        print(f"Task completed successfully. Received {len(video_urls)} video(s)")
-                        # Return the first video URL
-                        video_url = video_urls[0]
-                        return (video_url,)
-                    else:
-                        raise Exception(f"Task completed but no output received. Response: {result}")
-
-                except Exception as e:
-                    raise Exception(f"Async task failed: {str(e)}")
+        print(f"Submitting WAN 2.2 I2V 720p task...")
+        print(f"Duration: {duration} seconds")
+        print(f"Seed: {seed}")
+        if prompt:
+            print(f"Prompt: {prompt[:100]}...")
 
-        except Exception as e:
-            print(f"Error in WAN 2.2 I2V 720p: {str(e)}")
-            raise e
+        return run_model(client, self.SPEC, payload, enable_sync_mode)
 
 # Add the mappings that your __init__.py file will automatically find
 NODE_CLASS_MAPPINGS = {
@@ -0,0 +1,639 @@
+import asyncio
+import contextlib
+import io
+import os
+import time
+import uuid
+import aiohttp
+import PIL.Image
+from .utils import BaseRequest
+from .transport import get_transport
+from .polling import get_polling_policy
+from . import poller
+from .upload_cache import get_upload_cache, bytes_key, image_key, file_key
+from .encoding import DEFAULT_UPLOAD_CODEC, encode_for_upload, passthrough_format, resolve_codec
+from .upload_stream import ProgressFile, upload_timeout
+from .ratelimit import RateLimitError, get_rate_limiter, parse_retry_after
+from .circuit import FAILURE_STATUS_CODES, get_circuit_breaker
+from .journal import get_task_journal, task_key
+from .result_cache import RESULT_CACHE_MODES, get_result_cache, is_reproducible, result_key
+from .retry import (RETRYABLE_STATUS_CODES, RetryPolicy, TransientError, get_retry_budget, is_retryable_exception,
+                    is_retryable_status)
+
+
+def raise_for_rate_limit(response):
+    """
+    Raise RateLimitError for a 429 response
+
+    Args:
+        response (Response): HTTP response
+    """
+    if response.status_code == 429:
+        retry_after = parse_retry_after(response.headers)
+        raise RateLimitError(f"Error: 429 Too Many Requests, retry after {retry_after:.0f} seconds",
+                             retry_after=retry_after)
+
+
+def parse_post_response(response):
+    """
+    Parse a submit response from the WaveSpeed AI API
+
+    Args:
+        response (Response): HTTP response
+
+    Returns:
+        dict: The response data
+    """
+    if response.status_code == 401:
+        raise Exception("Unauthorized: Invalid API key")
+    raise_for_rate_limit(response)
+
+    if response.status_code != 200:
+        error_message = f"Error: {response.status_code}"
+        try:
+            error_data = response.json()
+            if "message" in error_data:
+                error_message = f"Error: {error_data['message']}"
+        except:
+            pass
+        raise Exception(error_message)
+
+    response_data = response.json()
+    if isinstance(response_data, dict) and 'code' in response_data:
+        if response_data['code'] == 401:
+            raise Exception("Unauthorized: Invalid API key")
+        if response_data['code'] != 200:
+            raise Exception(f"API Error: {response_data.get('message', 'Unknown error')}")
+        return response_data.get('data', {})
+    return response_data
+
+
+def parse_get_response(response):
+    """
+    Parse a query response from the WaveSpeed AI API
+
+    Args:
+        response (Response): HTTP response
+
+    Returns:
+        dict: The response data
+    """
+    raise_for_rate_limit(response)
+    if response.status_code != 200:
+        error_message = f"Error: {response.status_code}"
+        try:
+            error_data = response.json()
+            if "error" in error_data:
+                error_message = f"Error: {error_data['error']}"
+        except:
+            pass
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            raise TransientError(error_message)
+        if response.status_code == 404:
+            raise poller.TaskFailedError(error_message)
+        raise Exception(error_message)
+
+    response_data = response.json()
+    if isinstance(response_data, dict) and 'code' in response_data:
+        if response_data['code'] != 200:
+            raise Exception(f"API Error: {response_data.get('message', 'Unknown error')}")
+        return response_data.get('data', {})
+    return response_data
+
+
+def parse_upload_response(response):
+    """
+    Parse a media upload response from the WaveSpeed AI API
+
+    Args:
+        response (Response): HTTP response
+
+    Returns:
+        str: Download URL of the uploaded file
+    """
+    raise_for_rate_limit(response)
+    if response.status_code != 200:
+        raise Exception(f"Upload failed with status {response.status_code}: {response.text}")
+
+    response_data = response.json()
+    if isinstance(response_data, dict) and 'code' in response_data:
+        if response_data['code'] != 200:
+            raise Exception(f"API Error: {response_data.get('message', 'Unknown error')}")
+        return response_data.get('data', {})["download_url"]
+
+    # If we get here, no proper response structure
+    raise Exception("No download URL in response")
+
+
+def upload_file_name(file_type):
+    """
+    Pick the multipart file name for a MIME type
+
+    Args:
+        file_type (str): MIME type of the file
+
+    Returns:
+        str: File name to send
+    """
+    if "video" in file_type:
+        return "video.mp4"
+    elif "image" in file_type:
+        return "image.png"
+    elif "audio" in file_type:
+        return "audio.mp3"
+    raise Exception("Invalid file type")
+
+
+class AsyncWaveSpeedClient:
+    """
+    Asynchronous WaveSpeed AI API Client
+
+    Same surface as WaveSpeedClient, but every call is a coroutine, so one
+    event loop can keep many predictions in flight without a blocked thread
+    per task.
+    """
+
+    BASE_URL = "https://api.wavespeed.ai"
+
+    def __init__(self, api_key, pool_size=None, polling_policy=None, base_url=None, retry_policy=None,
+                 result_cache="off"):
+        """
+        Initialize asynchronous WaveSpeed AI API client
+
+        Args:
+            api_key (str): WaveSpeed AI API key
+            pool_size (int, optional): Maximum number of pooled keep-alive connections
+            polling_policy (PollingPolicy | str, optional): Default polling policy for wait_for_task
+            base_url (str, optional): API base URL, defaults to WAVESPEED_BASE_URL or BASE_URL
+            retry_policy (RetryPolicy, optional): How transient failures are retried
+            result_cache (str): One of result_cache.RESULT_CACHE_MODES; whether run_prediction reuses the
+                results of reproducible payloads, and whether output files are kept as well
+        """
+        if result_cache not in RESULT_CACHE_MODES:
+            raise Exception(f"Unknown result cache mode: {result_cache}. Expected one of {RESULT_CACHE_MODES}")
+        self.api_key = api_key
+        self.result_cache = result_cache
+        self.base_url = (base_url or os.environ.get("WAVESPEED_BASE_URL") or self.BASE_URL).rstrip("/")
+        self.once_timeout = 1800  # Default timeout is 1800 seconds (30 minutes)
+        self.polling_policy = polling_policy
+        self.retry_policy = retry_policy or RetryPolicy()
+
+        self.headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        # Connections are shared process-wide by every client with the same key
+        self.transport = get_transport(api_key, self.base_url, pool_size=pool_size)
+        # So are the account's request-rate and concurrent-prediction limits, and its retry budget
+        self.limiter = get_rate_limiter(api_key)
+        self.retry_budget = get_retry_budget(api_key)
+
+    async def close(self):
+        """Close the pooled connections this client's event loop holds."""
+        await self.transport.close()
+
+    async def _send(self, family, method, url, timeout=None, idempotent=True, keyed=False, max_attempts=None,
+                    open_data=None, **kwargs):
+        """
+        Send a request, pacing it with the key's rate limiter and retrying transient failures
+
+        A 429 pauses every caller of the key for its Retry-After; other transient
+        failures back off with jitter while the key's retry budget lasts. Requests
+        that are not idempotent are only retried when the server cannot have
+        acted on them, or on gateway errors when they carry an Idempotency-Key.
+        While the endpoint family's circuit breaker is open no request is sent
+        and CircuitOpenError is raised at once.
+
+        Args:
+            family (str): Endpoint family, one of circuit.ENDPOINT_FAMILIES
+            method (str): HTTP method
+            url (str): Absolute URL
+            timeout (float, optional): Per-attempt timeout in seconds
+            idempotent (bool): Whether repeating the request has no further effect
+            keyed (bool): Whether every attempt carries the same Idempotency-Key header
+            max_attempts (int, optional): Overrides the retry policy's attempts
+            open_data (callable, optional): Returns a context manager yielding a fresh request body per attempt
+            **kwargs: Passed through to the transport
+
+        Returns:
+            Response: The last response received
+        """
+        breaker = get_circuit_breaker(self.base_url, family)
+        max_attempts = max_attempts or self.retry_policy.max_attempts
+        self.retry_budget.deposit()
+        for attempt in range(max_attempts):
+            last_attempt = attempt == max_attempts - 1
+            await self.limiter.requests.acquire()
+            breaker.before_call()
+            try:
+                if open_data is None:
+                    response = await self.transport.request(method, url, timeout=timeout, **kwargs)
+                else:
+                    with open_data() as data:
+                        response = await self.transport.request(method, url, timeout=timeout, data=data, **kwargs)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                breaker.record(False)
+                error = str(e) or type(e).__name__
+                if not is_retryable_exception(e, idempotent):
+                    raise Exception(f"Request failed after it may have reached the API, not retried: {error}")
+                if last_attempt or not self.retry_budget.withdraw():
+                    raise TransientError(f"Request failed after {attempt + 1} attempts: {error}")
+                seconds = self.retry_policy.delay(attempt)
+                print(f"Request failed: {error}. Retrying in {seconds:.1f} seconds...")
+                await asyncio.sleep(seconds)
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+
+            breaker.record(response.status_code not in FAILURE_STATUS_CODES)
+            if not is_retryable_status(response.status_code, idempotent, keyed) or last_attempt:
+                return response
+            if response.status_code == 429:
+                seconds = self.limiter.backoff(response.headers)
+                print(f"Rate limited by the API, retrying in {seconds:.1f} seconds...")
+                continue
+            if not self.retry_budget.withdraw():
+                return response
+            seconds = self.retry_policy.delay(attempt)
+            print(f"API answered {response.status_code}, retrying in {seconds:.1f} seconds...")
+            await asyncio.sleep(seconds)
+
+    async def post(self, endpoint, payload, timeout=30):
+        """
+        Send POST request to WaveSpeed AI API
+
+        A POST creates a prediction, so it is only retried when the API cannot
+        have received it, rejected it with 429 or a gateway answered 502, 503 or
+        504. Every attempt carries the same Idempotency-Key, which lets the API
+        drop a duplicate should one of those have got through.
+
+        Args:
+            endpoint (str): API endpoint
+            payload (dict): Request payload
+            timeout (float, optional): Request timeout in seconds
+
+        Returns:
+            dict: API response
+        """
+        url = f"{self.base_url}{endpoint}"
+        headers = {**self.headers, "Idempotency-Key": uuid.uuid4().hex}
+        response = await self._send("submit", "POST", url, idempotent=False, keyed=True, headers=headers,
+                                    json=payload, timeout=timeout)
+        return parse_post_response(response)
+
+    async def get(self, endpoint, params=None, timeout=30):
+        """
+        Send GET request to WaveSpeed AI API
+
+        Args:
+            endpoint (str): API endpoint
+            params (dict, optional): Query parameters
+            timeout (float, optional): Request timeout in seconds
+
+        Returns:
+            dict: API response
+        """
+        url = f"{self.base_url}{endpoint}"
+        response = await self._send("status", "GET", url, headers=self.headers, params=params, timeout=timeout)
+        return parse_get_response(response)
+
+    async def check_task_status(self, request_id):
+        """
+        Check the status of a task
+
+        Args:
+            request_id (str): Task ID
+
+        Returns:
+            dict: Task status information, including status, progress, output, etc.
+        """
+        if not request_id:
+            raise Exception("No valid task ID provided")
+        return await self.get(f"/api/v2/predictions/{request_id}/result")
+
+    async def wait_for_task(self, request_id, polling_interval=5, timeout=None, polling_policy=None,
+                            expected_duration=None, on_progress=None):
+        """
+        Wait for task completion and return the result
+
+        Args:
+            request_id (str, optional): Task ID.
+            polling_interval (int): Polling interval in seconds, the shortest interval for adaptive policies.
+            timeout (int): Maximum time to wait for task completion in seconds.
+            polling_policy (PollingPolicy | str, optional): Overrides the client's polling policy.
+            expected_duration (float | str, optional): Expected run time in seconds or a duration class.
+            on_progress (callable, optional): Called with the task status whenever a check finds the task still
+                running with some outputs already available. Runs on the shared event loop and must not block.
+
+        Returns:
+            dict: Task result.
+
+        Raises:
+            Exception: If the task fails or times out.
+        """
+        if not timeout:
+            timeout = self.once_timeout
+
+        if not request_id:
+            raise Exception("No valid task ID provided")
+
+        policy = get_polling_policy(polling_policy or self.polling_policy, polling_interval=polling_interval,
+                                    expected_duration=expected_duration)
+        # Status checks are multiplexed with every other waiter in the process
+        return await poller.wait_for_task(self, request_id, policy, timeout, on_progress=on_progress)
+
+    async def send_request(self, request: BaseRequest, wait_for_completion=True, polling_interval=5, timeout=None,
+                           polling_policy=None, expected_duration=None):
+        """
+        Sends an API request using a request object.
+
+        Args:
+            request (BaseRequest): The request object containing payload and endpoint logic.
+            wait_for_completion (bool, optional): Whether to wait for task completion.
+            polling_interval (int): Polling interval in seconds.
+            timeout (int): Maximum time to wait for task completion in seconds.
+            polling_policy (PollingPolicy | str, optional): Overrides the client's polling policy.
+            expected_duration (float | str, optional): Expected run time in seconds or a duration class.
+
+        Returns:
+            dict: API response or task result.
+        """
+        payload = request.build_payload()
+        payload["enable_base64_output"] = False
+        if "seed" in payload:
+            payload["seed"] = payload["seed"] % 9999999999 if payload["seed"] != -1 else -1
+        response = await self.post(request.get_api_path(), payload)
+        request_id = response.get("id")
+        if not request_id:
+            raise Exception("No request ID in response")
+
+        if not wait_for_completion:
+            return {"request_id": request_id, "status": "processing"}
+
+        return await self.wait_for_task(request_id, polling_interval=polling_interval, timeout=timeout,
+                                        polling_policy=polling_policy, expected_duration=expected_duration)
+
+    async def run_prediction(self, endpoint, payload, enable_sync_mode=False, polling_interval=5, timeout=None,
+                             polling_policy=None, expected_duration=None, node_type=None, deterministic=False,
+                             on_progress=None):
+        """
+        Submit a prediction and wait for its result
+
+        Holds one of the API key's concurrent-prediction slots from submit until
+        the result is in, so predictions beyond the account limit queue here
+        instead of failing on the server.
+
+        With the result cache on, a payload with a fixed seed, or any payload of
+        a deterministic model, that was run before returns the earlier result
+        without submitting anything.
+
+        Async predictions are recorded in the task journal. If an earlier run
+        left a prediction with the same endpoint and payload that nobody is
+        waiting on, e.g. because the worker restarted mid-wait, its result is
+        waited on instead of submitting again. Pass the result to
+        mark_delivered once its outputs have been handed on.
+
+        Args:
+            endpoint (str): API endpoint
+            payload (dict): Request payload
+            enable_sync_mode (bool): Whether the API answers with the outputs instead of a task ID
+            polling_interval (int): Polling interval in seconds, the shortest interval for adaptive policies.
+            timeout (int): Maximum time to wait for the task in seconds.
+            polling_policy (PollingPolicy | str, optional): Overrides the client's polling policy.
+            expected_duration (float | str, optional): Expected run time in seconds or a duration class.
+            node_type (str, optional): Node class submitting the prediction, recorded in the journal
+            deterministic (bool): Whether the model gives the same outputs for a payload without a seed
+            on_progress (callable, optional): Called with partial results of an async prediction, see wait_for_task
+
+        Returns:
+            dict: Task result
+        """
+        cache_key = None
+        if self.result_cache != "off" and is_reproducible(payload, deterministic):
+            cache_key = result_key(f"{self.base_url}{endpoint}", payload)
+            result = get_result_cache().get(cache_key)
+            if result is not None:
+                print(f"Reusing the outputs of an identical earlier prediction {result.get('id', '')}")
+                return result
+
+        result = await self._predict(endpoint, payload, enable_sync_mode, node_type, polling_interval=polling_interval,
+                                     timeout=timeout, polling_policy=polling_policy,
+                                     expected_duration=expected_duration, on_progress=on_progress)
+        if cache_key is not None and result.get("outputs") and result.get("status") != "failed":
+            get_result_cache().put(cache_key, result)
+        return result
+
+    async def _predict(self, endpoint, payload, enable_sync_mode, node_type, **wait_args):
+        async with self.limiter.tasks:
+            if enable_sync_mode:
+                return await self.post(endpoint, payload, timeout=self.once_timeout)
+
+            journal = get_task_journal()
+            key = task_key(self.api_key, f"{self.base_url}{endpoint}", payload) if journal is not None else None
+            claimed = await self._journal(journal, "claim", key) if journal is not None else None
+            if claimed:
+                request_id, submitted_at = claimed
+                print(f"Reattaching to prediction {request_id} submitted {time.time() - submitted_at:.0f} seconds "
+                      f"ago by an earlier run")
+                try:
+                    return await self._wait_journaled(journal, request_id, **wait_args)
+                except poller.TaskFailedError as e:
+                    print(f"Earlier prediction {request_id} is unusable ({str(e)}), submitting again")
+
+            response = await self.post(endpoint, payload, timeout=self.once_timeout)
+            request_id = response.get("id")
+            if not request_id:
+                raise Exception(f"No task ID received from API. Response: {response}")
+            print(f"Task submitted successfully. Request ID: {request_id}")
+            if journal is not None:
+                await self._journal(journal, "record", key, request_id, endpoint, payload, node_type)
+            return await self._wait_journaled(journal, request_id, **wait_args)
+
+    async def _wait_journaled(self, journal, request_id, **wait_args):
+        try:
+            result = await self.wait_for_task(request_id, **wait_args)
+        except poller.TaskFailedError:
+            await self._journal(journal, "failed", request_id)
+            raise
+        except poller.TaskTimeoutError:
+            # Likely stuck; reattaching would only wait out the timeout again, so later runs submit anew
+            await asyncio.shield(self._journal(journal, "abandoned", request_id))
+            raise
+        except BaseException:
+            # The prediction may still finish; leave it for a later run to pick up
+            await asyncio.shield(self._journal(journal, "release", request_id))
+            raise
+        await self._journal(journal, "completed", request_id)
+        return result
+
+    async def _journal(self, journal, method, *args):
+        # The journal only saves work after a restart, so a journal error never fails the prediction
+        if journal is None:
+            return None
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, getattr(journal, method), *args)
+        except Exception as e:
+            print(f"Task journal {method} failed: {str(e)}")
+            return None
+
+    async def mark_delivered(self, results):
+        """
+        Record that the outputs of predictions were handed on, so they are never reattached to
+
+        Args:
+            results (list): Task results returned by run_prediction or run_batch
+        """
+        journal = get_task_journal()
+        for result in results:
+            if result and result.get("id"):
+                await self._journal(journal, "consumed", result["id"])
+
+    async def release_results(self, results):
+        """
+        Leave completed predictions whose outputs were not delivered for a later run to pick up
+
+        Args:
+            results (list): Task results returned by run_prediction or run_batch
+        """
+        journal = get_task_journal()
+        for result in results:
+            if result and result.get("id"):
+                await self._journal(journal, "release", result["id"])
+
+    async def run_batch(self, endpoint, payloads, max_in_flight=4, polling_interval=5, timeout=None,
+                        polling_policy=None, expected_duration=None, node_type=None, deterministic=False):
+        """
+        Run many predictions on one endpoint concurrently
+
+        Each payload is submitted in async mode and waited on; at most max_in_flight
+        predictions are submitted or running at a time, and never more than the API
+        key's concurrent-prediction limit. If any prediction fails, the
+        ones not yet submitted are cancelled and the error is raised.
+
+        Args:
+            endpoint (str): API endpoint
+            payloads (list): Request payloads
+            max_in_flight (int): Maximum number of predictions in flight
+            polling_interval (int): Polling interval in seconds, the shortest interval for adaptive policies.
+            timeout (int): Maximum time to wait for each task in seconds.
+            polling_policy (PollingPolicy | str, optional): Overrides the client's polling policy.
+            expected_duration (float | str, optional): Expected run time in seconds or a duration class.
+            node_type (str, optional): Node class submitting the predictions, recorded in the journal
+            deterministic (bool): Whether the model gives the same outputs for a payload without a seed
+
+        Returns:
+            list: Task results in the order of payloads
+        """
+        semaphore = asyncio.Semaphore(max(1, max_in_flight))
+
+        async def _run(index, payload):
+            async with semaphore:
+                try:
+                    return await self.run_prediction(endpoint, {**payload, "enable_sync_mode": False},
+                                                     polling_interval=polling_interval, timeout=timeout,
+                                                     polling_policy=polling_policy,
+                                                     expected_duration=expected_duration, node_type=node_type,
+                                                     deterministic=deterministic)
+                except Exception as e:
+                    raise Exception(f"Batch item {index} failed: {str(e)}")
+
+        tasks = [asyncio.ensure_future(_run(index, payload)) for index, payload in enumerate(payloads)]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+            # Items that did finish are kept for a rerun of the batch
+            await self.release_results([outcome for outcome in outcomes if isinstance(outcome, dict)])
+            raise
+
+    async def _upload(self, open_body, file_name, file_type, timeout, max_retries):
+        url = f"{self.base_url}/api/v2/media/upload/binary"
+        headers = {'Authorization': f'Bearer {self.api_key}'}
+
+        @contextlib.contextmanager
+        def open_form():
+            with open_body() as body:
+                form = aiohttp.FormData()
+                form.add_field('file', body, filename=file_name, content_type=file_type)
+                yield form
+
+        # A repeated upload only produces another URL for the same bytes, so every transient failure is retried
+        try:
+            response = await self._send("upload", "POST", url, timeout=timeout, max_attempts=max_retries,
+                                        open_data=open_form, headers=headers)
+        except TransientError as e:
+            raise Exception(f"Upload failed: {str(e)}")
+        return parse_upload_response(response)
+
+    async def upload_file(self, image: PIL.Image.Image, max_retries=3, use_cache=True, codec=DEFAULT_UPLOAD_CODEC,
+                          allow_lossy=False, source_bytes=None):
+        """
+        Upload a file to WaveSpeed AI API, retrying transient failures
+
+        Args:
+            image (PIL.Image.Image): Image to be uploaded
+            max_retries (int): Maximum number of retry attempts
+            use_cache (bool): Reuse the URL of an earlier upload with identical pixels
+            codec (str): Upload encoding, one of encoding.UPLOAD_CODECS; "auto" opts into lossless WebP
+                for images over 1 megapixel
+            allow_lossy (bool): Whether the automatic codec policy may choose JPEG
+            source_bytes (bytes, optional): Original encoded file, sent untouched when it is a PNG or JPEG
+
+        Returns:
+            str: Download URL of the uploaded file
+        """
+        loop = asyncio.get_running_loop()
+        cache = get_upload_cache() if use_cache else None
+        if cache is not None:
+            # Hashing and encoding are CPU bound, keep them off the event loop
+            if passthrough_format(source_bytes):
+                # The bytes sent, not the pixels: two files with the same pixels are different uploads
+                key = await loop.run_in_executor(None, bytes_key, source_bytes)
+            else:
+                key = await loop.run_in_executor(None, image_key, image,
+                                                 resolve_codec(image, codec, allow_lossy=allow_lossy))
+            url = cache.get(key)
+            if url:
+                return url
+
+        data, file_name, content_type = await loop.run_in_executor(
+            None, lambda: encode_for_upload(image, codec=codec, allow_lossy=allow_lossy, source_bytes=source_bytes))
+        url = await self._upload(lambda: io.BytesIO(data), file_name, content_type, 30, max_retries)
+        if cache is not None:
+            cache.put(key, url)
+        return url
+
+    async def upload_file_with_type(self, file_path: str, file_type: str, max_retries=3, use_cache=True,
+                                    progress=None, timeout=None):
+        """
+        Upload a file to WaveSpeed AI API, retrying transient failures
+
+        The file is streamed from disk in chunks, so memory use does not grow
+        with the file size. A retry streams the file again from the start.
+
+        Args:
+            file_path (str): Path to the file to be uploaded
+            file_type (str): MIME type of the file
+            max_retries (int): Maximum number of retry attempts
+            use_cache (bool): Reuse the URL of an earlier upload with identical bytes
+            progress (callable, optional): Called as progress(bytes_sent, total_bytes)
+            timeout (float, optional): Per-attempt timeout, defaults to one proportional to the file size
+
+        Returns:
+            str: Download URL of the uploaded file
+        """
+        file_name = upload_file_name(file_type)
+        cache = get_upload_cache() if use_cache else None
+        if cache is not None:
+            key = await asyncio.get_running_loop().run_in_executor(None, file_key, file_path, file_type)
+            url = cache.get(key)
+            if url:
+                return url
+
+        if timeout is None:
+            timeout = upload_timeout(os.path.getsize(file_path))
+        url = await self._upload(lambda: ProgressFile(file_path, progress), file_name, file_type, timeout,
+                                 max_retries)
+        if cache is not None:
+            cache.put(key, url)
+        return url
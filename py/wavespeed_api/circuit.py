@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from collections import deque
+from .retry import TransientError
+
+
+# Endpoint families tracked separately: the API can accept status checks
+# while submits or uploads are failing, and the other way round
+ENDPOINT_FAMILIES = ["submit", "status", "upload"]
+# Responses that say the API itself is unhealthy; 429 and other 4xx are answers
+FAILURE_STATUS_CODES = {500, 502, 503, 504}
+DEFAULT_WINDOW = 30
+DEFAULT_MIN_CALLS = 5
+DEFAULT_FAILURE_RATIO = 0.5
+DEFAULT_RESET_TIMEOUT = 15
+DEFAULT_MAX_RESET_TIMEOUT = 60
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(TransientError):
+    """Raised instead of sending a request while the API is known to be failing."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for one endpoint family of the API
+
+    Closed, it lets every call through and keeps the outcomes of the last
+    `window` seconds. Once at least `min_calls` calls were made and
+    `failure_ratio` of them failed it opens, and calls fail at once with
+    CircuitOpenError. After `reset_timeout` it lets a single probe through:
+    a success closes it again, a failure reopens it for twice as long, up to
+    `max_reset_timeout`. Shared by every client and thread in the process.
+    """
+
+    def __init__(self, name, window=DEFAULT_WINDOW, min_calls=DEFAULT_MIN_CALLS, failure_ratio=DEFAULT_FAILURE_RATIO,
+                 reset_timeout=DEFAULT_RESET_TIMEOUT, max_reset_timeout=DEFAULT_MAX_RESET_TIMEOUT, enabled=True):
+        """
+        Args:
+            name (str): Endpoint family, used in error messages
+            window (float): Seconds of outcomes the failure ratio is computed over
+            min_calls (int): Calls in the window needed before the breaker can open
+            failure_ratio (float): Fraction of failed calls that opens the breaker
+            reset_timeout (float): Seconds the breaker stays open before the first probe
+            max_reset_timeout (float): Upper bound on the open time after failed probes
+            enabled (bool): False lets every call through
+        """
+        self.name = name
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.enabled = enabled
+        self.state = CLOSED
+        self._outcomes = deque()
+        self._open_for = reset_timeout
+        self._opened_at = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Check that a call may be sent
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with its probe in flight
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self._opened_at + self._open_for - time.monotonic()
+            if self.state == OPEN and remaining <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            retry_after = max(remaining, 1)
+        raise CircuitOpenError(f"WaveSpeed API {self.name} requests are failing, not sending any for "
+                               f"{retry_after:.0f} seconds", retry_after=retry_after)
+
+    def record(self, success):
+        """
+        Record the outcome of a call let through by before_call
+
+        Args:
+            success (bool): Whether the API answered healthily
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self.state == HALF_OPEN and self._probing:
+                self._probing = False
+                if success:
+                    print(f"WaveSpeed API {self.name} requests are succeeding again")
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                    self._open_for = self.reset_timeout
+                else:
+                    self._open(now, min(self._open_for * 2, self.max_reset_timeout))
+                return
+            if self.state != CLOSED:
+                # A call sent before the breaker opened
+                return
+
+            self._outcomes.append((now, success))
+            while self._outcomes and self._outcomes[0][0] < now - self.window:
+                self._outcomes.popleft()
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if len(self._outcomes) >= self.min_calls and failures >= self.failure_ratio * len(self._outcomes):
+                print(f"WaveSpeed API {self.name} requests are failing ({failures} of {len(self._outcomes)} in "
+                      f"the last {self.window:.0f} seconds), pausing them for {self.reset_timeout:.0f} seconds")
+                self._open(now, self.reset_timeout)
+
+    def release(self):
+        """Give up a call let through by before_call without an outcome, e.g. when it was cancelled."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+
+    def _open(self, now, open_for):
+        self.state = OPEN
+        self._opened_at = now
+        self._open_for = open_for
+        self._outcomes.clear()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(base_url, family):
+    """
+    Get the process-wide circuit breaker for an endpoint family of an API
+
+    WAVESPEED_CIRCUIT_BREAKER=0 disables the breakers.
+
+    Args:
+        base_url (str): API base URL
+        family (str): One of ENDPOINT_FAMILIES
+
+    Returns:
+        CircuitBreaker: Shared breaker
+    """
+    if family not in ENDPOINT_FAMILIES:
+        raise Exception(f"Unknown endpoint family: {family}. Expected one of {ENDPOINT_FAMILIES}")
+    with _breakers_lock:
+        breaker = _breakers.get((base_url, family))
+        if breaker is None:
+            breaker = CircuitBreaker(family, enabled=os.environ.get("WAVESPEED_CIRCUIT_BREAKER") != "0")
+            _breakers[(base_url, family)] = breaker
+        return breaker
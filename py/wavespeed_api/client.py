@@ -1,9 +1,8 @@
-import time
-import requests
 from .utils import BaseRequest
+from .async_client import AsyncWaveSpeedClient
+from .encoding import DEFAULT_UPLOAD_CODEC
+from .runtime import run_sync
 import PIL.Image
-import io
-import base64
 
 
 class WaveSpeedClient:
@@ -11,21 +10,34 @@ class WaveSpeedClient:
     WaveSpeed AI API Client
 
     This class handles the core communication with the WaveSpeed AI API.
+    It is a blocking wrapper around AsyncWaveSpeedClient: every call runs on the
+    shared background event loop, so sync and async callers share connection
+    pools and response parsing.
     """
 
-    BASE_URL = "https://api.wavespeed.ai"
+    BASE_URL = AsyncWaveSpeedClient.BASE_URL
 
-    def __init__(self, api_key):
+    def __init__(self, api_key, pool_size=None, polling_policy=None, base_url=None, retry_policy=None,
+                 result_cache="off"):
         """
         Initialize WaveSpeed AI API client
 
         Args:
             api_key (str): WaveSpeed AI API key
-        """
+            pool_size (int, optional): Maximum number of pooled keep-alive connections
+            polling_policy (PollingPolicy | str, optional): Default polling policy for wait_for_task
+            base_url (str, optional): API base URL, defaults to WAVESPEED_BASE_URL or BASE_URL
+            retry_policy (RetryPolicy, optional): How transient failures are retried
+            result_cache (str): One of result_cache.RESULT_CACHE_MODES
+        """
+        self.async_client = AsyncWaveSpeedClient(api_key, pool_size=pool_size, polling_policy=polling_policy,
+                                                 base_url=base_url, retry_policy=retry_policy,
+                                                 result_cache=result_cache)
         self.api_key = api_key
-        self.once_timeout = 1800  # Default timeout is 1800 seconds (30 minutes)
-
-        self.headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        self.result_cache = result_cache
+        self.base_url = self.async_client.base_url
+        self.once_timeout = self.async_client.once_timeout
+        self.headers = self.async_client.headers
 
     def post(self, endpoint, payload, timeout=30):
         """
@@ -39,30 +51,7 @@ class WaveSpeedClient:
         Returns:
             dict: API response
         """
-        url = f"{self.BASE_URL}{endpoint}"
-        response = requests.post(url, headers=self.headers, json=payload, timeout=timeout)
-
-        if response.status_code == 401:
-            raise Exception("Unauthorized: Invalid API key")
-
-        if response.status_code != 200:
-            error_message = f"Error: {response.status_code}"
-            try:
-                error_data = response.json()
-                if "message" in error_data:
-                    error_message = f"Error: {error_data['message']}"
-            except:
-                pass
-            raise Exception(error_message)
-
-        response_data = response.json()
-        if isinstance(response_data, dict) and 'code' in response_data:
-            if response_data['code'] == 401:
-                raise Exception("Unauthorized: Invalid API key")
-            if response_data['code'] != 200:
-                raise Exception(f"API Error: {response_data.get('message', 'Unknown error')}")
-            return response_data.get('data', {})
-        return response_data
+        return run_sync(self.async_client.post(endpoint, payload, timeout=timeout))
 
     def get(self, endpoint, params=None, timeout=30):
         """
@@ -76,25 +65,7 @@ class WaveSpeedClient:
         Returns:
             dict: API response
         """
-        url = f"{self.BASE_URL}{endpoint}"
-        response = requests.get(url, headers=self.headers, params=params, timeout=timeout)
-
-        if response.status_code != 200:
-            error_message = f"Error: {response.status_code}"
-            try:
-                error_data = response.json()
-                if "error" in error_data:
-                    error_message = f"Error: {error_data['error']}"
-            except:
-                pass
-            raise Exception(error_message)
-
-        response_data = response.json()
-        if isinstance(response_data, dict) and 'code' in response_data:
-            if response_data['code'] != 200:
-                raise Exception(f"API Error: {response_data.get('message', 'Unknown error')}")
-            return response_data.get('data', {})
-        return response_data
+        return run_sync(self.async_client.get(endpoint, params=params, timeout=timeout))
 
     def check_task_status(self, request_id):
         """
@@ -106,18 +77,19 @@ class WaveSpeedClient:
         Returns:
             dict: Task status information, including status, progress, output, etc.
         """
-        if not request_id:
-            raise Exception("No valid task ID provided")
-        return self.get(f"/api/v2/predictions/{request_id}/result")
+        return run_sync(self.async_client.check_task_status(request_id))
 
-    def wait_for_task(self, request_id, polling_interval=5, timeout=None):
+    def wait_for_task(self, request_id, polling_interval=5, timeout=None, polling_policy=None,
+                      expected_duration=None):
         """
         Wait for task completion and return the result
 
         Args:
             request_id (str, optional): Task ID.
-            polling_interval (int): Polling interval in seconds.
+            polling_interval (int): Polling interval in seconds, the shortest interval for adaptive policies.
             timeout (int): Maximum time to wait for task completion in seconds.
+            polling_policy (PollingPolicy | str, optional): Overrides the client's polling policy.
+            expected_duration (float | str, optional): Expected run time in seconds or a duration class.
 
         Returns:
             dict: Task result.
@@ -125,28 +97,12 @@ class WaveSpeedClient:
         Raises:
             Exception: If the task fails or times out.
         """
-        if not timeout:
-            timeout = self.once_timeout
-
-        if not request_id:
-            raise Exception("No valid task ID provided")
-
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            task_status = self.check_task_status(request_id)
-            status = task_status.get("status")
+        return run_sync(self.async_client.wait_for_task(
+            request_id, polling_interval=polling_interval, timeout=timeout, polling_policy=polling_policy,
+            expected_duration=expected_duration))
 
-            if status == "completed":
-                return task_status
-            elif status == "failed":
-                error_message = task_status.get("error", "Task failed")
-                raise Exception(f"Task failed: {error_message}")
-
-            time.sleep(polling_interval)
-
-        raise Exception("Task timed out")
-
-    def send_request(self, request: BaseRequest, wait_for_completion=True, polling_interval=5, timeout=None):
+    def send_request(self, request: BaseRequest, wait_for_completion=True, polling_interval=5, timeout=None,
+                     polling_policy=None, expected_duration=None):
         """
         Sends an API request using a request object.
 
@@ -155,167 +111,122 @@ class WaveSpeedClient:
             wait_for_completion (bool, optional): Whether to wait for task completion.
             polling_interval (int): Polling interval in seconds.
             timeout (int): Maximum time to wait for task completion in seconds.
+            polling_policy (PollingPolicy | str, optional): Overrides the client's polling policy.
+            expected_duration (float | str, optional): Expected run time in seconds or a duration class.
 
         Returns:
             dict: API response or task result.
         """
-        payload = request.build_payload()
-        payload["enable_base64_output"] = False
-        if "seed" in payload:
-            payload["seed"] = payload["seed"] % 9999999999 if payload["seed"] != -1 else -1
-        response = self.post(request.get_api_path(), payload)
-        request_id = response.get("id")
-        if not request_id:
-            raise Exception("No request ID in response")
-
-        if not wait_for_completion:
-            return {"request_id": request_id, "status": "processing"}
-
-        task_result = self.wait_for_task(request_id, polling_interval=polling_interval, timeout=timeout)
-        return task_result
-
-    def upload_file(self, image: PIL.Image.Image, max_retries=3):
+        return run_sync(self.async_client.send_request(
+            request, wait_for_completion=wait_for_completion, polling_interval=polling_interval, timeout=timeout,
+            polling_policy=polling_policy, expected_duration=expected_duration))
+
+    def run_prediction(self, endpoint, payload, enable_sync_mode=False, polling_interval=5, timeout=None,
+                       polling_policy=None, expected_duration=None, node_type=None, deterministic=False,
+                       on_progress=None):
         """
-        Upload a file to WaveSpeed AI API with retry logic for SSL issues
+        Submit a prediction and wait for its result, reattaching to a journaled one when possible
+
+        Args:
+            endpoint (str): API endpoint
+            payload (dict): Request payload
+            enable_sync_mode (bool): Whether the API answers with the outputs instead of a task ID
+            polling_interval (int): Polling interval in seconds, the shortest interval for adaptive policies.
+            timeout (int): Maximum time to wait for the task in seconds.
+            polling_policy (PollingPolicy | str, optional): Overrides the client's polling policy.
+            expected_duration (float | str, optional): Expected run time in seconds or a duration class.
+            node_type (str, optional): Node class submitting the prediction, recorded in the journal
+            deterministic (bool): Whether the model gives the same outputs for a payload without a seed
+            on_progress (callable, optional): Called on the shared event loop with partial results of an async
+                prediction; must not block
+
+        Returns:
+            dict: Task result
+        """
+        return run_sync(self.async_client.run_prediction(
+            endpoint, payload, enable_sync_mode=enable_sync_mode, polling_interval=polling_interval,
+            timeout=timeout, polling_policy=polling_policy, expected_duration=expected_duration, node_type=node_type,
+            deterministic=deterministic, on_progress=on_progress))
+
+    def run_batch(self, endpoint, payloads, max_in_flight=4, polling_interval=5, timeout=None, polling_policy=None,
+                  expected_duration=None, node_type=None, deterministic=False):
+        """
+        Run many predictions on one endpoint concurrently
+
+        Args:
+            endpoint (str): API endpoint
+            payloads (list): Request payloads
+            max_in_flight (int): Maximum number of predictions in flight
+            polling_interval (int): Polling interval in seconds, the shortest interval for adaptive policies.
+            timeout (int): Maximum time to wait for each task in seconds.
+            polling_policy (PollingPolicy | str, optional): Overrides the client's polling policy.
+            expected_duration (float | str, optional): Expected run time in seconds or a duration class.
+            node_type (str, optional): Node class submitting the predictions, recorded in the journal
+            deterministic (bool): Whether the model gives the same outputs for a payload without a seed
+
+        Returns:
+            list: Task results in the order of payloads
+        """
+        return run_sync(self.async_client.run_batch(
+            endpoint, payloads, max_in_flight=max_in_flight, polling_interval=polling_interval, timeout=timeout,
+            polling_policy=polling_policy, expected_duration=expected_duration, node_type=node_type,
+            deterministic=deterministic))
+
+    def mark_delivered(self, results):
+        """
+        Record that the outputs of predictions were handed on, so they are never reattached to
+
+        Args:
+            results (list): Task results returned by run_prediction or run_batch
+        """
+        run_sync(self.async_client.mark_delivered(results))
+
+    def release_results(self, results):
+        """
+        Leave completed predictions whose outputs were not delivered for a later run to pick up
+
+        Args:
+            results (list): Task results returned by run_prediction or run_batch
+        """
+        run_sync(self.async_client.release_results(results))
+
+    def upload_file(self, image: PIL.Image.Image, max_retries=3, use_cache=True, codec=DEFAULT_UPLOAD_CODEC,
+                    allow_lossy=False, source_bytes=None):
+        """
+        Upload a file to WaveSpeed AI API, retrying transient failures
 
         Args:
             image (PIL.Image.Image): Image to be uploaded
             max_retries (int): Maximum number of retry attempts
+            use_cache (bool): Reuse the URL of an earlier upload with identical pixels
+            codec (str): Upload encoding, one of encoding.UPLOAD_CODECS; "auto" opts into lossless WebP
+                for images over 1 megapixel
+            allow_lossy (bool): Whether the automatic codec policy may choose JPEG
+            source_bytes (bytes, optional): Original encoded file, sent untouched when it is a PNG or JPEG
 
         Returns:
             str: Download URL of the uploaded file
         """
-        url = f"{self.BASE_URL}/api/v2/media/upload/binary"
-        buffered = io.BytesIO()
-        image.save(buffered, format="PNG")
-        buffered.seek(0)
-        
-        headers = {'Authorization': f'Bearer {self.api_key}'}
-        files = {'file': ('image.png', buffered, 'image/png')}
-        
-        last_exception = None
-        
-        for attempt in range(max_retries):
-            try:
-                # Reset buffer position for retry attempts
-                buffered.seek(0)
-                
-                # Configure session with SSL settings
-                session = requests.Session()
-                # Add SSL adapter configuration
-                session.verify = True
-                
-                response = session.post(
-                    url, 
-                    headers=headers, 
-                    files={'file': ('image.png', buffered, 'image/png')},
-                    timeout=30
-                )
-
-                if response.status_code != 200:
-                    raise Exception(f"Upload failed with status {response.status_code}: {response.text}")
-
-                response_data = response.json()
-                if isinstance(response_data, dict) and 'code' in response_data:
-                    if response_data['code'] != 200:
-                        raise Exception(f"API Error: {response_data.get('message', 'Unknown error')}")
-                    return response_data.get('data', {})["download_url"]
-                    
-                # If we get here, no proper response structure
-                raise Exception("No download URL in response")
-                
-            except (requests.exceptions.SSLError, requests.exceptions.ConnectionError) as e:
-                last_exception = e
-                print(f"Upload attempt {attempt + 1} failed with SSL/Connection error: {str(e)}")
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2  # Progressive backoff: 2, 4, 6 seconds
-                    print(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    break
-            except Exception as e:
-                # For non-SSL errors, don't retry
-                raise e
-            finally:
-                if 'session' in locals():
-                    session.close()
-        
-        # If we get here, all retries failed
-        raise Exception(f"Upload failed after {max_retries} attempts. Last error: {str(last_exception)}")
-
-
-    def upload_file_with_type(self, file_path: str, file_type: str, max_retries=3):
+        return run_sync(self.async_client.upload_file(
+            image, max_retries=max_retries, use_cache=use_cache, codec=codec, allow_lossy=allow_lossy,
+            source_bytes=source_bytes))
+
+    def upload_file_with_type(self, file_path: str, file_type: str, max_retries=3, use_cache=True,
+                              progress=None, timeout=None):
         """
-        Upload a file to WaveSpeed AI API with retry logic for SSL issues
+        Upload a file to WaveSpeed AI API, retrying transient failures
 
         Args:
             file_path (str): Path to the file to be uploaded
             file_type (str): MIME type of the file
             max_retries (int): Maximum number of retry attempts
+            use_cache (bool): Reuse the URL of an earlier upload with identical bytes
+            progress (callable, optional): Called as progress(bytes_sent, total_bytes)
+            timeout (float, optional): Per-attempt timeout, defaults to one proportional to the file size
 
         Returns:
             str: Download URL of the uploaded file
         """
-        url = f"{self.BASE_URL}/api/v2/media/upload/binary"
-        
-        # Determine file name based on type
-        file_name = ""
-        if "video" in file_type:
-           file_name = "video.mp4"
-        elif "image" in file_type:
-            file_name = "image.png"
-        elif "audio" in file_type:
-            file_name = "audio.mp3"
-        else:
-            raise Exception("Invalid file type")
-            
-        headers = {'Authorization': f'Bearer {self.api_key}'}
-        last_exception = None
-        
-        for attempt in range(max_retries):
-            try:
-                # Configure session with SSL settings
-                session = requests.Session()
-                session.verify = True
-                
-                with open(file_path, "rb") as file:
-                    files = {'file': (file_name, file, file_type)}
-                    response = session.post(
-                        url, 
-                        headers=headers, 
-                        files=files,
-                        timeout=60  # Longer timeout for file uploads
-                    )
-
-                if response.status_code != 200:
-                    raise Exception(f"Upload failed with status {response.status_code}: {response.text}")
-
-                response_data = response.json()
-                if isinstance(response_data, dict) and 'code' in response_data:
-                    if response_data['code'] != 200:
-                        raise Exception(f"API Error: {response_data.get('message', 'Unknown error')}")
-                    return response_data.get('data', {})["download_url"]
-                    
-                # If we get here, no proper response structure
-                raise Exception("No download URL in response")
-                
-            except (requests.exceptions.SSLError, requests.exceptions.ConnectionError) as e:
-                last_exception = e
-                print(f"Upload attempt {attempt + 1} failed with SSL/Connection error: {str(e)}")
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2  # Progressive backoff: 2, 4, 6 seconds
-                    print(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    break
-            except Exception as e:
-                # For non-SSL errors, don't retry
-                raise e
-            finally:
-                if 'session' in locals():
-                    session.close()
-        
-        # If we get here, all retries failed
-        raise Exception(f"Upload failed after {max_retries} attempts. Last error: {str(last_exception)}")
\ No newline at end of file
+        return run_sync(self.async_client.upload_file_with_type(
+            file_path, file_type, max_retries=max_retries, use_cache=use_cache, progress=progress,
+            timeout=timeout))
@@ -0,0 +1,208 @@
+import asyncio
+import os
+import tempfile
+import aiohttp
+from .download_cache import get_download_cache
+from .retry import RETRYABLE_STATUS_CODES, backoff_delay
+from .runtime import run_sync
+from .transport import get_download_transport
+
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 120
+DEFAULT_MAX_RETRIES = 3
+
+
+async def fetch_bytes(url, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES):
+    """
+    Download a URL, retrying transient failures with exponential backoff
+
+    When the download cache is enabled, a URL downloaded before is read
+    from disk instead.
+
+    Args:
+        url (str): URL to download
+        timeout (float): Per-attempt timeout in seconds
+        max_retries (int): Maximum number of attempts
+
+    Returns:
+        bytes: Response body
+    """
+    loop = asyncio.get_running_loop()
+    cache = get_download_cache()
+    if cache is not None:
+        data = await loop.run_in_executor(None, cache.get, url)
+        if data is not None:
+            return data
+
+    transport = get_download_transport()
+    last_exception = None
+    for attempt in range(max_retries):
+        try:
+            response = await transport.request("GET", url, timeout=timeout)
+            if response.status_code == 200:
+                if cache is not None:
+                    await _cache_download(loop, cache, url, response.content)
+                return response.content
+            last_exception = Exception(f"Download failed with status {response.status_code}: {url}")
+            if response.status_code not in RETRYABLE_STATUS_CODES:
+                raise last_exception
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            last_exception = e
+        if attempt < max_retries - 1:
+            wait_time = backoff_delay(attempt, base_delay=0.5)
+            print(f"Download attempt {attempt + 1} failed: {str(last_exception)}. Retrying in {wait_time:.1f} seconds...")
+            await asyncio.sleep(wait_time)
+    raise Exception(f"Download failed after {max_retries} attempts. Last error: {str(last_exception)}")
+
+
+async def _cache_download(loop, cache, url, data):
+    try:
+        await loop.run_in_executor(None, cache.put, url, data)
+    except OSError as e:
+        # A full disk or a read-only directory only costs the next download
+        print(f"Unable to cache download of {url}: {str(e)}")
+
+
+class _StatusError(Exception):
+    """Raised when a streamed download is answered with an error status."""
+
+    def __init__(self, status_code, url):
+        super().__init__(f"Download failed with status {status_code}: {url}")
+        self.status_code = status_code
+
+
+async def _stream_to_file(transport, url, f, timeout):
+    loop = asyncio.get_running_loop()
+
+    async def _write(chunk):
+        await loop.run_in_executor(None, f.write, chunk)
+
+    response = await transport.download(url, _write, timeout=timeout)
+    if response.status_code != 200:
+        raise _StatusError(response.status_code, url)
+
+
+def _open_temporary(extension):
+    fd, path = tempfile.mkstemp(prefix="wavespeed_", suffix=extension)
+    os.close(fd)
+    # Opened by path so the file's name is the path, not the descriptor
+    return open(path, "wb")
+
+
+def _remove_temporary(f):
+    f.close()
+    os.remove(f.name)
+
+
+async def fetch_file(url, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES):
+    """
+    Stream a URL to a file, retrying transient failures with exponential backoff
+
+    The body goes to disk chunk by chunk, so a large video is never held in
+    memory. When the download cache is enabled the file is written into the
+    cache, and a URL downloaded before is not fetched again; otherwise it is
+    written to a temporary file.
+
+    Args:
+        url (str): URL to download
+        timeout (float): Seconds to wait for each chunk
+        max_retries (int): Maximum number of attempts
+
+    Returns:
+        tuple: (path, temporary); the caller deletes the file when temporary is True
+    """
+    loop = asyncio.get_running_loop()
+    cache = get_download_cache()
+    if cache is not None:
+        path = await loop.run_in_executor(None, cache.get_path, url)
+        if path is not None:
+            return path, False
+
+    transport = get_download_transport()
+    extension = os.path.splitext(url.split("?", 1)[0])[1][:8]
+    last_exception = None
+    for attempt in range(max_retries):
+        try:
+            # Opening, renaming and evicting touch the disk, so they run in the thread pool like the writes
+            if cache is not None:
+                f = await loop.run_in_executor(None, cache.begin_write, url)
+                try:
+                    await _stream_to_file(transport, url, f, timeout)
+                except BaseException:
+                    await loop.run_in_executor(None, cache.abort_write, f)
+                    raise
+                path = await loop.run_in_executor(None, cache.finish_write, url, f)
+                if path is not None:
+                    return path, False
+                # Larger than the whole cache budget, so it was evicted right away; fetch it to a temporary file
+                cache = None
+            f = await loop.run_in_executor(None, _open_temporary, extension)
+            try:
+                await _stream_to_file(transport, url, f, timeout)
+                await loop.run_in_executor(None, f.close)
+            except BaseException:
+                await loop.run_in_executor(None, _remove_temporary, f)
+                raise
+            return f.name, True
+        except _StatusError as e:
+            last_exception = e
+            if e.status_code not in RETRYABLE_STATUS_CODES:
+                raise
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            last_exception = e
+        if attempt < max_retries - 1:
+            wait_time = backoff_delay(attempt, base_delay=0.5)
+            print(f"Download attempt {attempt + 1} failed: {str(last_exception)}. Retrying in {wait_time:.1f} seconds...")
+            await asyncio.sleep(wait_time)
+    raise Exception(f"Download failed after {max_retries} attempts. Last error: {str(last_exception)}")
+
+
+async def fetch_all(urls, decode=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                    max_retries=DEFAULT_MAX_RETRIES):
+    """
+    Download URLs concurrently and optionally decode each one
+
+    Decoding runs in the loop's thread pool as soon as its download finishes,
+    so it overlaps with the remaining downloads.
+
+    Args:
+        urls (list): URLs to download
+        decode (callable, optional): Function applied to each downloaded body
+        concurrency (int): Maximum number of downloads in flight
+        timeout (float): Per-attempt timeout in seconds
+        max_retries (int): Maximum number of attempts per URL
+
+    Returns:
+        list: Bodies, or decoded results, in the same order as urls
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def _fetch_one(url):
+        async with semaphore:
+            data = await fetch_bytes(url, timeout=timeout, max_retries=max_retries)
+        if decode is None:
+            return data
+        return await loop.run_in_executor(None, decode, data)
+
+    return await asyncio.gather(*[_fetch_one(url) for url in urls])
+
+
+def fetch_all_sync(urls, decode=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT,
+                   max_retries=DEFAULT_MAX_RETRIES):
+    """
+    Blocking variant of fetch_all that runs on the shared event loop
+
+    Args:
+        urls (list): URLs to download
+        decode (callable, optional): Function applied to each downloaded body
+        concurrency (int): Maximum number of downloads in flight
+        timeout (float): Per-attempt timeout in seconds
+        max_retries (int): Maximum number of attempts per URL
+
+    Returns:
+        list: Bodies, or decoded results, in the same order as urls
+    """
+    return run_sync(fetch_all(urls, decode=decode, concurrency=concurrency, timeout=timeout,
+                              max_retries=max_retries))
@@ -0,0 +1,263 @@
+import contextlib
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+# Eviction frees space down to this fraction of the budget, so a full cache
+# does not rescan the directory on every write
+EVICTION_TARGET = 0.9
+TMP_SUFFIX = ".tmp"
+
+
+class DownloadCache:
+    """
+    Disk cache of downloaded output files, keyed by URL
+
+    Output URLs point at immutable files, so a file downloaded once is read
+    from disk afterwards. Files are written to a temporary name and renamed
+    into place, so readers, including other processes sharing the
+    directory, only ever see complete files. Reading marks a file as used;
+    when the directory grows past max_bytes the least recently used files
+    are deleted. A reader that already opened a file keeps reading it even
+    if it is evicted meanwhile.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache
+
+        Args:
+            directory (str): Directory the files are kept in, created if missing
+            max_bytes (int): Budget for the total size of cached files
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    def _path(self, url):
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        extension = os.path.splitext(url.split("?", 1)[0])[1][:8]
+        return os.path.join(self.directory, digest[:2], digest + extension)
+
+    def get_path(self, url):
+        """
+        Find the cached file for a URL and mark it as used
+
+        Args:
+            url (str): Download URL
+
+        Returns:
+            str | None: Path of the cached file, or None on a miss
+        """
+        path = self._path(url)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def get(self, url):
+        """
+        Read a cached file
+
+        Args:
+            url (str): Download URL
+
+        Returns:
+            bytes | None: File contents, or None on a miss
+        """
+        path = self.get_path(url)
+        if path is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            # Evicted between the lookup and the open
+            return None
+
+    def put(self, url, data):
+        """
+        Cache a downloaded file
+
+        Args:
+            url (str): Download URL
+            data (bytes): File contents
+        """
+        with self.writer(url) as f:
+            f.write(data)
+
+    @contextlib.contextmanager
+    def writer(self, url):
+        """
+        Write a file into the cache as it is downloaded
+
+        The file only becomes visible under its URL once the block exits
+        without an error.
+
+        Args:
+            url (str): Download URL
+
+        Yields:
+            file: Binary file to write the contents to
+        """
+        f = self.begin_write(url)
+        try:
+            yield f
+        except BaseException:
+            self.abort_write(f)
+            raise
+        self.finish_write(url, f)
+
+    def begin_write(self, url):
+        """
+        Open a temporary file for a download, the first step of writer()
+
+        The three steps block on the disk; on an event loop run each in the
+        thread pool.
+
+        Args:
+            url (str): Download URL
+
+        Returns:
+            file: Binary file to write the contents to, then pass to finish_write or abort_write
+        """
+        path = self._path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return open(f"{path}.{os.getpid()}.{uuid.uuid4().hex[:8]}{TMP_SUFFIX}", "wb")
+
+    def finish_write(self, url, f):
+        """
+        Close a file from begin_write and move it into place under its URL
+
+        Evicts least recently used files when the cache grows past its budget.
+
+        Args:
+            url (str): Download URL
+            f (file): File returned by begin_write
+
+        Returns:
+            str | None: Path of the cached file, or None if it was evicted right away
+        """
+        try:
+            size = f.tell()
+            f.close()
+            os.replace(f.name, self._path(url))
+        except BaseException:
+            self.abort_write(f)
+            raise
+        with self._lock:
+            self._total_bytes += size
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self._evict()
+        return self.get_path(url)
+
+    def abort_write(self, f):
+        """
+        Close and delete a file from begin_write
+
+        Args:
+            f (file): File returned by begin_write
+        """
+        f.close()
+        with contextlib.suppress(OSError):
+            os.remove(f.name)
+
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                # Leftovers of writers that died mid-download
+                if name.endswith(TMP_SUFFIX) and time.time() - stat.st_mtime > 3600:
+                    with contextlib.suppress(OSError):
+                        os.remove(path)
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        # Other processes share the directory, so the disk is the source of truth
+        with self._lock:
+            entries = sorted(self._scan(), key=lambda entry: entry[2])
+            total = sum(size for _, size, _ in entries)
+            target = self.max_bytes * EVICTION_TARGET
+            for path, size, _ in entries:
+                if total <= target:
+                    break
+                if path.endswith(TMP_SUFFIX):
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    # Gone already, or open elsewhere on Windows
+                    continue
+                total -= size
+            self._total_bytes = total
+
+    def clear(self):
+        """Delete every cached file."""
+        with self._lock:
+            for path, _, _ in self._scan():
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+            self._total_bytes = 0
+
+
+_download_cache = None
+_download_cache_configured = False
+_download_cache_lock = threading.Lock()
+
+
+def configure_download_cache(directory, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Replace the process-wide download cache
+
+    Args:
+        directory (str | None): Directory to keep downloads in, None to disable the cache
+        max_bytes (int): Budget for the total size of cached files
+
+    Returns:
+        DownloadCache | None: The new cache
+    """
+    global _download_cache, _download_cache_configured
+    with _download_cache_lock:
+        _download_cache = DownloadCache(directory, max_bytes=max_bytes) if directory else None
+        _download_cache_configured = True
+        return _download_cache
+
+
+def get_download_cache():
+    """
+    Get the process-wide download cache
+
+    The cache is enabled when the WAVESPEED_DOWNLOAD_CACHE environment
+    variable names a directory; WAVESPEED_DOWNLOAD_CACHE_MB sets its budget.
+
+    Returns:
+        DownloadCache | None: The shared cache, or None when disabled
+    """
+    global _download_cache, _download_cache_configured
+    with _download_cache_lock:
+        if not _download_cache_configured:
+            _download_cache_configured = True
+            directory = os.environ.get("WAVESPEED_DOWNLOAD_CACHE")
+            if directory:
+                megabytes = os.environ.get("WAVESPEED_DOWNLOAD_CACHE_MB")
+                max_bytes = int(float(megabytes) * 1024 * 1024) if megabytes else DEFAULT_MAX_BYTES
+                try:
+                    _download_cache = DownloadCache(directory, max_bytes=max_bytes)
+                except OSError as e:
+                    print(f"Download cache disabled, unable to use {directory}: {str(e)}")
+        return _download_cache
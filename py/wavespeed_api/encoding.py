@@ -0,0 +1,127 @@
+import io
+
+
+UPLOAD_CODECS = ["auto", "png", "png_fast", "webp_lossless", "jpeg"]
+# Uploads stay PNG unless the caller opts into another codec, as not every model is known to accept WebP
+DEFAULT_UPLOAD_CODEC = "png"
+
+# Pixel count above which the automatic policy switches to a cheaper codec
+LARGE_IMAGE_PIXELS = 1024 * 1024
+
+# Source files in these formats are uploaded as they are; others, like WebP, are re-encoded
+PASSTHROUGH_FORMATS = ["PNG", "JPEG"]
+
+_FORMATS = {
+    "PNG": ("image.png", "image/png"),
+    "JPEG": ("image.jpg", "image/jpeg"),
+    "WEBP": ("image.webp", "image/webp"),
+}
+
+
+def sniff_image_format(data):
+    """
+    Detect the format of encoded image bytes from their signature
+
+    Args:
+        data (bytes): Encoded image
+
+    Returns:
+        str | None: "PNG", "JPEG" or "WEBP", or None if not recognized
+    """
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "PNG"
+    if data[:3] == b"\xff\xd8\xff":
+        return "JPEG"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+def passthrough_format(source_bytes):
+    """
+    Check whether an encoded source file can be uploaded without re-encoding
+
+    Args:
+        source_bytes (bytes | None): Original encoded file
+
+    Returns:
+        str | None: Its format if it is one of PASSTHROUGH_FORMATS, else None
+    """
+    if not source_bytes:
+        return None
+    source_format = sniff_image_format(source_bytes)
+    return source_format if source_format in PASSTHROUGH_FORMATS else None
+
+
+def resolve_codec(image, codec=DEFAULT_UPLOAD_CODEC, allow_lossy=False):
+    """
+    Pick a concrete codec for an image
+
+    PNG is the default. The automatic policy is opt-in and stays lossless
+    unless allow_lossy is set: images up to 1 megapixel keep PNG, larger ones
+    use fast lossless WebP, which is several times cheaper to encode than PNG
+    at about the same size. With allow_lossy, large opaque images are sent as
+    high quality JPEG instead.
+
+    Args:
+        image (PIL.Image.Image): Image to encode
+        codec (str): One of UPLOAD_CODECS
+        allow_lossy (bool): Whether the automatic policy may choose JPEG
+
+    Returns:
+        str: A concrete codec name
+    """
+    if codec not in UPLOAD_CODECS:
+        raise ValueError(f"Unknown upload codec: {codec}")
+    has_alpha = "A" in image.getbands()
+    if codec == "jpeg" and has_alpha:
+        return "png_fast"
+    if codec != "auto":
+        return codec
+
+    pixels = image.size[0] * image.size[1]
+    if pixels <= LARGE_IMAGE_PIXELS:
+        return "png"
+    if allow_lossy and not has_alpha:
+        return "jpeg"
+    return "webp_lossless"
+
+
+def encode_for_upload(image, codec=DEFAULT_UPLOAD_CODEC, allow_lossy=False, source_bytes=None):
+    """
+    Encode an image for upload
+
+    Args:
+        image (PIL.Image.Image): Image to encode
+        codec (str): One of UPLOAD_CODECS
+        allow_lossy (bool): Whether the automatic policy may choose JPEG
+        source_bytes (bytes, optional): Original encoded file the image was decoded from.
+            It is sent untouched when it is a PNG or JPEG, see PASSTHROUGH_FORMATS.
+
+    Returns:
+        tuple: (data, file_name, content_type)
+    """
+    source_format = passthrough_format(source_bytes)
+    if source_format:
+        file_name, content_type = _FORMATS[source_format]
+        return source_bytes, file_name, content_type
+
+    codec = resolve_codec(image, codec, allow_lossy=allow_lossy)
+    buffered = io.BytesIO()
+    if codec == "png":
+        image.save(buffered, format="PNG", compress_level=6)
+        image_format = "PNG"
+    elif codec == "png_fast":
+        image.save(buffered, format="PNG", compress_level=1)
+        image_format = "PNG"
+    elif codec == "webp_lossless":
+        image.save(buffered, format="WEBP", lossless=True, quality=0, method=0)
+        image_format = "WEBP"
+    else:
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.save(buffered, format="JPEG", quality=95, subsampling=0)
+        image_format = "JPEG"
+
+    file_name, content_type = _FORMATS[image_format]
+    return buffered.getvalue(), file_name, content_type
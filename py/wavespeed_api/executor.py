@@ -0,0 +1,208 @@
+from .client import WaveSpeedClient
+from .polling import POLLING_POLICIES
+from .ratelimit import RateLimitError, configure_rate_limit, default_limits
+from .result_cache import get_result_cache
+from .utils import OutputPrefetcher, imageurl2tensor
+
+
+# How a model's outputs are turned into node outputs
+OUTPUT_KINDS = ["image", "video_url"]
+
+
+class ModelSpec:
+    """
+    Declaration of how a node calls its model
+
+    Nodes keep their INPUT_TYPES and build the payload; everything after that
+    (submitting, sync or async completion, polling and output conversion) is
+    shared by run_model, so changes there reach every model at once.
+    """
+
+    def __init__(self, endpoint, output="image", expected_duration="image", polling_interval=1, timeout=300,
+                 deterministic=False, partial_outputs=False, polling_policy=None):
+        """
+        Args:
+            endpoint (str): API endpoint, e.g. "/api/v3/google/nano-banana/edit"
+            output (str): One of OUTPUT_KINDS
+            expected_duration (str | float): Expected run time class or seconds, see polling.EXPECTED_DURATIONS
+            polling_interval (float): Interval for the fixed polling policy in seconds
+            timeout (float): Maximum time to wait for an async task in seconds
+            deterministic (bool): Whether the model gives the same outputs for a payload without a seed,
+                which lets the result cache reuse them
+            partial_outputs (bool): Whether the model publishes outputs one by one while it runs, which lets
+                run_model download and decode them before the prediction completes
+            polling_policy (PollingPolicy | str, optional): Polling policy for this model, one of
+                polling.POLLING_POLICIES or an instance; None uses the Client node's policy
+        """
+        if output not in OUTPUT_KINDS:
+            raise Exception(f"Unknown output kind: {output}. Expected one of {OUTPUT_KINDS}")
+        if isinstance(polling_policy, str) and polling_policy not in POLLING_POLICIES:
+            raise Exception(f"Unknown polling policy: {polling_policy}. Expected one of {POLLING_POLICIES}")
+        self.endpoint = endpoint
+        self.output = output
+        self.expected_duration = expected_duration
+        self.polling_interval = polling_interval
+        self.timeout = timeout
+        self.deterministic = deterministic
+        self.partial_outputs = partial_outputs
+        self.polling_policy = polling_policy
+        self.node_type = None
+
+    def __set_name__(self, owner, name):
+        # Assigned as a node's SPEC attribute; the node class is recorded with its predictions in the task journal
+        self.node_type = owner.__name__
+
+
+def client_from_config(client):
+    """
+    Create an API client from the WAVESPEED_AI_API_CLIENT node output
+
+    Args:
+        client (dict): Output of the WaveSpeedAI Client node
+
+    Returns:
+        WaveSpeedClient: API client
+    """
+    # 0 on the Client node means no limit, unless the environment sets one; applied every time so that
+    # clearing a value on the node lifts the limit again
+    default_rate, default_tasks = default_limits()
+    configure_rate_limit(client["api_key"], requests_per_second=client.get("requests_per_second") or default_rate,
+                         max_concurrent_tasks=client.get("max_concurrent_tasks") or default_tasks)
+    return WaveSpeedClient(api_key=client["api_key"], polling_policy=client.get("polling_policy"),
+                           result_cache=client.get("result_cache") or "off")
+
+
+def output_cache(real_client):
+    """
+    Get the cache downloaded outputs are kept in, if the client keeps them
+
+    Args:
+        real_client (WaveSpeedClient): API client
+
+    Returns:
+        ResultCache | None: The result cache, or None
+    """
+    return get_result_cache() if real_client.result_cache == "urls and images" else None
+
+
+def convert_outputs(spec, outputs, cache=None, mixed_sizes="letterbox", max_side=0, prefetcher=None):
+    """
+    Convert output URLs to the node's return tuple
+
+    Args:
+        spec (ModelSpec): Model declaration
+        outputs (list): Output URLs
+        cache (ResultCache, optional): Reuse and keep downloaded images in this cache
+        mixed_sizes (str): How output images of different sizes are combined, see tensors.MIXED_SIZE_MODES
+        max_side (int): Decode output images at reduced scale so their longest side is at most this, 0 for full size
+        prefetcher (OutputPrefetcher, optional): Prefetcher that followed the prediction; it has the images
+            decoded already and its own cache and max_side
+
+    Returns:
+        tuple: Node outputs
+    """
+    if spec.output == "image" and prefetcher is not None:
+        return (prefetcher.to_tensor(outputs, mixed_sizes=mixed_sizes),)
+    if spec.output == "image":
+        return (imageurl2tensor(outputs, output_cache=cache, mixed_sizes=mixed_sizes, max_side=max_side),)
+    return (outputs[0],)
+
+
+def run_model(client, spec, payload, enable_sync_mode):
+    """
+    Submit a payload and return the node outputs
+
+    Args:
+        client (dict): Output of the WaveSpeedAI Client node
+        spec (ModelSpec): Model declaration
+        payload (dict): Request payload
+        enable_sync_mode (bool): Whether the API answers with the outputs instead of a task ID
+
+    Returns:
+        tuple: Node outputs
+    """
+    real_client = client_from_config(client)
+    max_side = client.get("output_max_side") or 0
+    prefetcher = None
+    if spec.partial_outputs and spec.output == "image" and not enable_sync_mode:
+        prefetcher = OutputPrefetcher(output_cache=output_cache(real_client), max_side=max_side)
+    try:
+        try:
+            result = real_client.run_prediction(spec.endpoint, payload, enable_sync_mode=enable_sync_mode,
+                                                polling_interval=spec.polling_interval, timeout=spec.timeout,
+                                                polling_policy=spec.polling_policy,
+                                                expected_duration=spec.expected_duration, node_type=spec.node_type,
+                                                deterministic=spec.deterministic,
+                                                on_progress=prefetcher.on_progress if prefetcher else None)
+        except Exception as e:
+            if not enable_sync_mode and not isinstance(e, RateLimitError):
+                e = Exception(f"Async task failed: {str(e)}")
+            print(f"Error in {spec.endpoint}: {str(e)}")
+            raise e
+
+        if "outputs" in result and result["outputs"]:
+            if any(result.get("has_nsfw_contents") or []):
+                print("Warning: Some outputs may contain NSFW content")
+            try:
+                outputs = convert_outputs(spec, result["outputs"], cache=output_cache(real_client),
+                                          mixed_sizes=client.get("mixed_sizes") or "letterbox", max_side=max_side,
+                                          prefetcher=prefetcher)
+            except Exception:
+                real_client.release_results([result])
+                raise
+            real_client.mark_delivered([result])
+            return outputs
+        real_client.mark_delivered([result])
+        if enable_sync_mode:
+            raise Exception(f"No output received from sync API. Response: {result}")
+        raise Exception(f"Task completed but no output received. Response: {result}")
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+
+
+def run_model_batch(client, spec, payloads, max_in_flight=4):
+    """
+    Run many payloads on one model concurrently and combine the node outputs
+
+    Args:
+        client (dict): Output of the WaveSpeedAI Client node
+        spec (ModelSpec): Model declaration
+        payloads (list): Request payloads, submitted in async mode
+        max_in_flight (int): Maximum number of predictions in flight
+
+    Returns:
+        tuple: For image models one IMAGE batch with every output in payload order,
+            for video models the list of first output URLs
+    """
+    real_client = client_from_config(client)
+    try:
+        print(f"Submitting {len(payloads)} predictions to {spec.endpoint}, {max_in_flight} at a time")
+        results = real_client.run_batch(spec.endpoint, payloads, max_in_flight=max_in_flight,
+                                        polling_interval=spec.polling_interval, timeout=spec.timeout,
+                                        polling_policy=spec.polling_policy,
+                                        expected_duration=spec.expected_duration, node_type=spec.node_type,
+                                        deterministic=spec.deterministic)
+        empty = [index for index, result in enumerate(results) if not result.get("outputs")]
+        if empty:
+            real_client.mark_delivered([results[index] for index in empty])
+            real_client.release_results([result for result in results if result.get("outputs")])
+            raise Exception(f"Batch item {empty[0]} completed but no output received. Response: {results[empty[0]]}")
+
+        try:
+            if spec.output == "image":
+                outputs = (imageurl2tensor([url for result in results for url in result["outputs"]],
+                                           output_cache=output_cache(real_client),
+                                           mixed_sizes=client.get("mixed_sizes") or "letterbox",
+                                           max_side=client.get("output_max_side") or 0),)
+            else:
+                outputs = ([result["outputs"][0] for result in results],)
+        except Exception:
+            real_client.release_results(results)
+            raise
+        real_client.mark_delivered(results)
+        return outputs
+
+    except Exception as e:
+        print(f"Error in {spec.endpoint}: {str(e)}")
+        raise e
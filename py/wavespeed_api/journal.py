@@ -0,0 +1,251 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+
+# Predictions older than this are dropped; their outputs have expired on the API by then
+DEFAULT_MAX_AGE = 24 * 3600
+SQLITE_TIMEOUT = 5
+
+PENDING = "pending"
+COMPLETED = "completed"
+CONSUMED = "consumed"
+FAILED = "failed"
+ABANDONED = "abandoned"
+
+# Identifies this process in the journal; a restarted worker gets a new one even if it reuses the PID
+PROCESS_TOKEN = uuid.uuid4().hex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    request_id TEXT PRIMARY KEY,
+    task_key TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    node_type TEXT,
+    payload_hash TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    status TEXT NOT NULL,
+    owner_token TEXT,
+    owner_pid INTEGER
+);
+CREATE INDEX IF NOT EXISTS tasks_by_key ON tasks (task_key, status);
+"""
+
+
+def payload_hash(payload):
+    """
+    Hash a request payload independently of key order
+
+    Args:
+        payload (dict): Request payload
+
+    Returns:
+        str: Hex digest
+    """
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def task_key(api_key, endpoint, payload):
+    """
+    Identify a prediction by what was asked for and on whose account
+
+    Args:
+        api_key (str): WaveSpeed AI API key, only its hash is stored
+        endpoint (str): API endpoint URL
+        payload (dict): Request payload
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update(hashlib.sha256(api_key.encode("utf-8")).digest())
+    digest.update(f":{endpoint}:{payload_hash(payload)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists but belongs to someone else
+        return True
+    return True
+
+
+class TaskJournal:
+    """
+    On-disk journal of submitted predictions
+
+    Every async submit is recorded with its request_id before the wait
+    starts, so a worker that restarts mid-wait does not lose a paid
+    prediction: when the same node runs again with the same payload it
+    reattaches to the recorded request_id instead of submitting again. Only
+    entries nobody is waiting on can be claimed, which keeps identical
+    predictions running side by side in one process apart. An entry is
+    consumed once its outputs have been delivered, and abandoned when a wait
+    on it timed out.
+    """
+
+    def __init__(self, path, max_age=DEFAULT_MAX_AGE):
+        """
+        Open the journal, creating it if needed
+
+        Args:
+            path (str): SQLite database file
+            max_age (float): Seconds after which entries are dropped
+        """
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(SCHEMA)
+        self.reconcile()
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # A short-lived connection per call: calls come from several threads and processes,
+        # and closing a connection rolls back a transaction an error left open
+        with self._lock:
+            db = sqlite3.connect(self.path, timeout=SQLITE_TIMEOUT, isolation_level=None)
+            try:
+                yield db
+            finally:
+                db.close()
+
+    def _execute(self, sql, params=()):
+        with self._connect() as db:
+            return db.execute(sql, params).fetchall()
+
+    def reconcile(self):
+        """
+        Drop finished and expired entries and release those of workers that are gone
+
+        Returns:
+            int: Number of predictions from earlier runs that can be reattached to
+        """
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            db.execute("DELETE FROM tasks WHERE status IN (?, ?, ?) OR submitted_at < ?",
+                       (CONSUMED, FAILED, ABANDONED, time.time() - self.max_age))
+            rows = db.execute("SELECT request_id, owner_token, owner_pid FROM tasks WHERE owner_token IS NOT NULL"
+                              ).fetchall()
+            for request_id, owner_token, owner_pid in rows:
+                if self._orphaned(owner_token, owner_pid):
+                    db.execute("UPDATE tasks SET owner_token = NULL, owner_pid = NULL WHERE request_id = ?",
+                               (request_id,))
+            claimable = db.execute("SELECT COUNT(*) FROM tasks WHERE owner_token IS NULL").fetchone()[0]
+            db.execute("COMMIT")
+        if claimable:
+            print(f"Task journal: {claimable} predictions from an earlier run can be reattached to")
+        return claimable
+
+    @staticmethod
+    def _orphaned(owner_token, owner_pid):
+        if owner_token == PROCESS_TOKEN:
+            return False
+        # Our own PID under another token is an earlier incarnation of this worker, e.g. in a restarted container
+        return owner_pid == os.getpid() or not _process_alive(owner_pid)
+
+    def claim(self, key):
+        """
+        Take over an unclaimed prediction for a task key
+
+        Args:
+            key (str): Task key, see task_key
+
+        Returns:
+            tuple | None: (request_id, submitted_at) of the claimed prediction, or None
+        """
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            rows = db.execute("SELECT request_id, submitted_at, owner_token, owner_pid FROM tasks "
+                              "WHERE task_key = ? AND status IN (?, ?) AND submitted_at >= ? "
+                              "ORDER BY submitted_at DESC",
+                              (key, PENDING, COMPLETED, time.time() - self.max_age)).fetchall()
+            for request_id, submitted_at, owner_token, owner_pid in rows:
+                if owner_token is None or self._orphaned(owner_token, owner_pid):
+                    db.execute("UPDATE tasks SET owner_token = ?, owner_pid = ? WHERE request_id = ?",
+                               (PROCESS_TOKEN, os.getpid(), request_id))
+                    db.execute("COMMIT")
+                    return request_id, submitted_at
+            db.execute("COMMIT")
+        return None
+
+    def record(self, key, request_id, endpoint, payload, node_type=None):
+        """
+        Record a submitted prediction, owned by this process
+
+        Args:
+            key (str): Task key, see task_key
+            request_id (str): Task ID returned by the API
+            endpoint (str): API endpoint
+            payload (dict): Request payload
+            node_type (str, optional): Node class that submitted it
+        """
+        self._execute("INSERT OR REPLACE INTO tasks (request_id, task_key, endpoint, node_type, payload_hash, "
+                      "submitted_at, status, owner_token, owner_pid) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                      (request_id, key, endpoint, node_type, payload_hash(payload), time.time(), PENDING,
+                       PROCESS_TOKEN, os.getpid()))
+
+    def completed(self, request_id):
+        """Mark a prediction as finished on the API but not yet delivered."""
+        self._execute("UPDATE tasks SET status = ? WHERE request_id = ? AND status = ?",
+                      (COMPLETED, request_id, PENDING))
+
+    def release(self, request_id):
+        """Stop waiting on a prediction that may still finish, so a later run can claim it."""
+        self._execute("UPDATE tasks SET owner_token = NULL, owner_pid = NULL WHERE request_id = ?", (request_id,))
+
+    def consumed(self, request_id):
+        """Mark a prediction whose outputs were delivered."""
+        self._execute("UPDATE tasks SET status = ?, owner_token = NULL, owner_pid = NULL WHERE request_id = ?",
+                      (CONSUMED, request_id))
+
+    def failed(self, request_id):
+        """Mark a prediction that failed or is gone from the API."""
+        self._execute("UPDATE tasks SET status = ?, owner_token = NULL, owner_pid = NULL WHERE request_id = ?",
+                      (FAILED, request_id))
+
+    def abandoned(self, request_id):
+        """Mark a prediction that did not finish in time, so no later run reattaches to it."""
+        self._execute("UPDATE tasks SET status = ?, owner_token = NULL, owner_pid = NULL WHERE request_id = ?",
+                      (ABANDONED, request_id))
+
+
+_journal = None
+_journal_opened = False
+_journal_lock = threading.Lock()
+
+
+def get_task_journal():
+    """
+    Get the process-wide task journal
+
+    The journal is enabled when the WAVESPEED_TASK_JOURNAL environment
+    variable names its file; unset or 0 leaves it disabled. A journal that
+    cannot be opened is disabled with a warning instead of failing the nodes.
+
+    Returns:
+        TaskJournal | None: The shared journal, or None when disabled
+    """
+    global _journal, _journal_opened
+    with _journal_lock:
+        if not _journal_opened:
+            _journal_opened = True
+            path = os.environ.get("WAVESPEED_TASK_JOURNAL")
+            if path and path != "0":
+                try:
+                    _journal = TaskJournal(os.path.expanduser(path))
+                except (OSError, sqlite3.Error) as e:
+                    print(f"Task journal disabled, unable to open {path}: {str(e)}")
+        return _journal
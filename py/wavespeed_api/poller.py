@@ -0,0 +1,257 @@
+import asyncio
+import threading
+from .ratelimit import RateLimitError
+from .retry import TransientError
+from .runtime import get_loop
+
+
+DEFAULT_MAX_CHECKS_PER_SECOND = 20
+DEFAULT_MAX_CONCURRENT_CHECKS = 16
+# Status checks in a row that may fail transiently before the waiters are failed;
+# the task keeps running on the server meanwhile, so a flaky check is not a failed task
+DEFAULT_MAX_FAILED_CHECKS = 5
+
+
+class TaskFailedError(Exception):
+    """Raised when the API reports a task as failed or no longer knows it."""
+
+
+class TaskTimeoutError(Exception):
+    """Raised when a task has not finished within the waiter's timeout."""
+
+
+class _PollEntry:
+    """Bookkeeping for one outstanding request_id."""
+
+    def __init__(self, client, request_id, future, now):
+        self.client = client
+        self.request_id = request_id
+        self.future = future
+        self.policies = []
+        self.listeners = []
+        self.waiters = 0
+        self.attempt = 0
+        self.failed_checks = 0
+        self.start_time = now
+        self.next_check = now
+        self.checking = False
+
+    def next_delay(self, elapsed):
+        # The most eager waiter decides how soon the task is checked again
+        return min(policy.next_delay(self.attempt, elapsed) for policy in self.policies)
+
+
+class TaskPoller:
+    """
+    Central background poller for in-flight predictions
+
+    Owns every outstanding request_id in the process and checks their status
+    from a single scheduling loop on the shared event loop. Waiters are woken
+    through futures, concurrent waits on the same request_id share one entry,
+    and status checks are paced so the whole process stays under a fixed
+    check rate however many nodes are waiting.
+    """
+
+    def __init__(self, max_checks_per_second=DEFAULT_MAX_CHECKS_PER_SECOND,
+                 max_concurrent_checks=DEFAULT_MAX_CONCURRENT_CHECKS, max_failed_checks=DEFAULT_MAX_FAILED_CHECKS):
+        """
+        Initialize the poller
+
+        Args:
+            max_checks_per_second (float): Upper bound on status checks issued per second
+            max_concurrent_checks (int): Upper bound on status checks in flight at once
+            max_failed_checks (int): Consecutive transient check failures tolerated per task
+        """
+        self.max_checks_per_second = max_checks_per_second
+        self.max_concurrent_checks = max_concurrent_checks
+        self.max_failed_checks = max_failed_checks
+        self._entries = {}
+        self._runner = None
+        self._wakeup = None
+        self._semaphore = None
+        self._last_check = 0
+
+    def pending(self):
+        """
+        Get the request_ids currently being polled
+
+        Returns:
+            list: Outstanding request_ids
+        """
+        return [entry.request_id for entry in self._entries.values()]
+
+    async def wait(self, client, request_id, policy, timeout, on_progress=None):
+        """
+        Wait until a task completes
+
+        Must be awaited on the poller's event loop.
+
+        Args:
+            client (AsyncWaveSpeedClient): Client used to check the task status
+            request_id (str): Task ID
+            policy (PollingPolicy): Polling policy requested by this waiter
+            timeout (float): Maximum time to wait in seconds
+            on_progress (callable, optional): Called on the poller's event loop with the task status of every
+                check that finds the task still running with some outputs; must not block
+
+        Returns:
+            dict: Task result
+
+        Raises:
+            Exception: If the task fails or times out.
+        """
+        loop = asyncio.get_running_loop()
+        self._ensure_running(loop)
+
+        key = (client.api_key, request_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = _PollEntry(client, request_id, loop.create_future(), loop.time())
+            self._entries[key] = entry
+        entry.policies.append(policy)
+        if on_progress is not None:
+            entry.listeners.append(on_progress)
+        entry.waiters += 1
+        self._wakeup.set()
+
+        try:
+            # Shield the shared future so one waiter giving up does not fail the others
+            return await asyncio.wait_for(asyncio.shield(entry.future), timeout)
+        except asyncio.TimeoutError:
+            raise TaskTimeoutError("Task timed out")
+        finally:
+            entry.policies.remove(policy)
+            if on_progress is not None:
+                entry.listeners.remove(on_progress)
+            entry.waiters -= 1
+            if entry.waiters == 0 and self._entries.get(key) is entry:
+                del self._entries[key]
+                if not entry.future.done():
+                    entry.future.cancel()
+
+    def _ensure_running(self, loop):
+        if self._runner is None or self._runner.done():
+            self._wakeup = asyncio.Event()
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_checks)
+            self._runner = loop.create_task(self._run())
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            due = [entry for entry in self._entries.values() if not entry.checking and entry.next_check <= now]
+            for entry in due:
+                await self._pace(loop)
+                entry.checking = True
+                loop.create_task(self._check(entry))
+
+            upcoming = [entry.next_check for entry in self._entries.values() if not entry.checking]
+            sleep_for = max(min(upcoming) - loop.time(), 0) if upcoming else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), sleep_for)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _pace(self, loop):
+        if self.max_checks_per_second:
+            spacing = 1.0 / self.max_checks_per_second
+            delay = self._last_check + spacing - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self._last_check = loop.time()
+
+    async def _check(self, entry):
+        loop = asyncio.get_running_loop()
+        retry_after = 0
+        try:
+            async with self._semaphore:
+                task_status = await entry.client.check_task_status(entry.request_id)
+        except (TransientError, RateLimitError) as e:
+            entry.failed_checks += 1
+            if entry.failed_checks >= self.max_failed_checks:
+                self._finish(entry, exception=e)
+                return
+            print(f"Status check for {entry.request_id} failed: {str(e)}. Checking again later")
+            # A Retry-After or an open circuit breaker says when checking again is worth it
+            retry_after = getattr(e, "retry_after", None) or 0
+            task_status = {}
+        except Exception as e:
+            self._finish(entry, exception=e)
+            return
+        else:
+            entry.failed_checks = 0
+        finally:
+            entry.checking = False
+            entry.attempt += 1
+
+        status = task_status.get("status")
+        if status == "completed":
+            self._finish(entry, result=task_status)
+        elif status == "failed":
+            error_message = task_status.get("error", "Task failed")
+            self._finish(entry, exception=TaskFailedError(f"Task failed: {error_message}"))
+        elif entry.policies:
+            if task_status.get("outputs"):
+                self._notify(entry, task_status)
+            now = loop.time()
+            entry.next_check = now + max(entry.next_delay(now - entry.start_time), retry_after)
+            self._wakeup.set()
+
+    def _notify(self, entry, task_status):
+        for listener in list(entry.listeners):
+            try:
+                listener(task_status)
+            except Exception as e:
+                # Partial outputs are only a head start, the final result still carries every output
+                print(f"Progress handler for {entry.request_id} failed: {str(e)}")
+
+    def _finish(self, entry, result=None, exception=None):
+        key = (entry.client.api_key, entry.request_id)
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        if entry.future.done():
+            return
+        if exception is not None:
+            entry.future.set_exception(exception)
+        else:
+            entry.future.set_result(result)
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+
+def get_poller():
+    """
+    Get the process-wide task poller
+
+    Returns:
+        TaskPoller: The shared poller, which runs on runtime.get_loop()
+    """
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = TaskPoller()
+        return _poller
+
+
+async def wait_for_task(client, request_id, policy, timeout, on_progress=None):
+    """
+    Wait for a task through the shared poller from any event loop
+
+    Args:
+        client (AsyncWaveSpeedClient): Client used to check the task status
+        request_id (str): Task ID
+        policy (PollingPolicy): Polling policy requested by this waiter
+        timeout (float): Maximum time to wait in seconds
+        on_progress (callable, optional): Called with partial task statuses, see TaskPoller.wait
+
+    Returns:
+        dict: Task result
+    """
+    poller_loop = get_loop()
+    coro = get_poller().wait(client, request_id, policy, timeout, on_progress=on_progress)
+    if asyncio.get_running_loop() is poller_loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, poller_loop))
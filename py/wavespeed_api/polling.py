@@ -0,0 +1,158 @@
+import random
+
+
+# Typical server-side run time in seconds for each class of model
+EXPECTED_DURATIONS = {
+    "fast_image": 5,
+    "image": 15,
+    "image_batch": 45,
+    "video": 120,
+    "long_video": 300,
+}
+
+
+class PollingPolicy:
+    """
+    Base class for task status polling policies
+
+    A policy decides how long wait_for_task sleeps before the next status
+    check. Policies are stateless and can be shared between concurrent waits.
+    """
+
+    def next_delay(self, attempt, elapsed):
+        """
+        Get the delay before the next status check
+
+        Args:
+            attempt (int): Number of status checks made so far
+            elapsed (float): Seconds since waiting started
+
+        Returns:
+            float: Seconds to sleep
+        """
+        raise NotImplementedError("Subclasses must implement next_delay")
+
+
+class FixedInterval(PollingPolicy):
+    """Polls at a constant interval."""
+
+    def __init__(self, interval=5):
+        self.interval = interval
+
+    def next_delay(self, attempt, elapsed):
+        return self.interval
+
+
+class ExponentialBackoff(PollingPolicy):
+    """Polls quickly at first and backs off exponentially, with jitter."""
+
+    def __init__(self, initial_interval=0.5, factor=1.5, max_interval=15, jitter=0.2):
+        self.initial_interval = initial_interval
+        self.factor = factor
+        self.max_interval = max_interval
+        self.jitter = jitter
+
+    def next_delay(self, attempt, elapsed):
+        delay = min(self.initial_interval * self.factor ** attempt, self.max_interval)
+        return _apply_jitter(delay, self.jitter)
+
+
+class FastThenSlow(PollingPolicy):
+    """Polls at a fast interval for a short window, then at a slow interval."""
+
+    def __init__(self, fast_interval=0.5, fast_period=10, slow_interval=5):
+        self.fast_interval = fast_interval
+        self.fast_period = fast_period
+        self.slow_interval = slow_interval
+
+    def next_delay(self, attempt, elapsed):
+        if elapsed < self.fast_period:
+            return self.fast_interval
+        return self.slow_interval
+
+
+class ExpectedDuration(PollingPolicy):
+    """
+    Polls sparsely early on and densely around the expected completion time
+
+    Before the expected duration has passed, the delay is a fraction of the
+    remaining expected time, but never more than a fraction of the time
+    already waited, so a job that finishes well ahead of its class estimate
+    is still picked up promptly. Once the job overruns, the delay grows with
+    the overrun so stuck jobs are not hammered.
+    """
+
+    def __init__(self, expected_duration, min_interval=1, max_interval=30, fraction=0.15, elapsed_fraction=0.2,
+                 jitter=0.1):
+        self.expected_duration = expected_duration
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.fraction = fraction
+        self.elapsed_fraction = elapsed_fraction
+        self.jitter = jitter
+
+    def next_delay(self, attempt, elapsed):
+        remaining = self.expected_duration - elapsed
+        if remaining > 0:
+            delay = min(self.fraction * remaining, self.elapsed_fraction * elapsed)
+        else:
+            delay = self.min_interval + self.fraction * -remaining
+        delay = min(max(delay, self.min_interval), self.max_interval)
+        return _apply_jitter(delay, self.jitter)
+
+
+POLLING_POLICIES = ["adaptive", "exponential", "fast_then_slow", "fixed"]
+
+
+def _apply_jitter(delay, jitter):
+    if not jitter:
+        return delay
+    return delay * random.uniform(1 - jitter, 1 + jitter)
+
+
+def resolve_expected_duration(expected_duration):
+    """
+    Resolve an expected duration given as seconds or a duration class name
+
+    Args:
+        expected_duration (float | str | None): Seconds or a key of EXPECTED_DURATIONS
+
+    Returns:
+        float | None: Expected duration in seconds
+    """
+    if isinstance(expected_duration, str):
+        if expected_duration not in EXPECTED_DURATIONS:
+            raise ValueError(f"Unknown duration class: {expected_duration}")
+        return EXPECTED_DURATIONS[expected_duration]
+    return expected_duration
+
+
+def get_polling_policy(policy, polling_interval=5, expected_duration=None):
+    """
+    Build a polling policy
+
+    Args:
+        policy (PollingPolicy | str | None): A policy instance or one of POLLING_POLICIES.
+            None keeps the historical fixed-interval behaviour.
+        polling_interval (float): Fixed interval, also used as the shortest
+            interval for adaptive policies
+        expected_duration (float | str, optional): Expected run time in seconds
+            or a duration class name, used by the adaptive policy
+
+    Returns:
+        PollingPolicy: The policy
+    """
+    if isinstance(policy, PollingPolicy):
+        return policy
+    if policy is None or policy == "fixed":
+        return FixedInterval(polling_interval)
+    if policy == "exponential":
+        return ExponentialBackoff(initial_interval=polling_interval)
+    if policy == "fast_then_slow":
+        return FastThenSlow(fast_interval=polling_interval)
+    if policy == "adaptive":
+        expected_duration = resolve_expected_duration(expected_duration)
+        if expected_duration is None:
+            return ExponentialBackoff(initial_interval=polling_interval)
+        return ExpectedDuration(expected_duration, min_interval=polling_interval)
+    raise ValueError(f"Unknown polling policy: {policy}")
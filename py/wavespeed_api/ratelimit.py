@@ -0,0 +1,285 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+
+
+# No client-side limits unless they are configured; a 429 with Retry-After
+# still pauses every request of the key
+DEFAULT_REQUESTS_PER_SECOND = 0
+DEFAULT_BURST = 1
+DEFAULT_MAX_CONCURRENT_TASKS = 0
+# Fraction of the account request rate the limiter paces at; network jitter
+# bunches requests up on the way to the server, so pacing at exactly the
+# quota still trips it now and then
+RATE_HEADROOM = 0.9
+DEFAULT_RETRY_AFTER = 5
+MAX_RETRY_AFTER = 120
+
+
+class RateLimitError(Exception):
+    """Raised when the API keeps answering 429 Too Many Requests."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(headers, default=DEFAULT_RETRY_AFTER):
+    """
+    Read the Retry-After header of a 429 response
+
+    Args:
+        headers (Mapping): Response headers
+        default (float): Seconds to use when the header is missing or not a number
+
+    Returns:
+        float: Seconds to wait, capped at MAX_RETRY_AFTER
+    """
+    value = headers.get("Retry-After") if headers is not None else None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        # HTTP dates are not worth parsing for a short backoff
+        seconds = default
+    return min(max(seconds, 0), MAX_RETRY_AFTER)
+
+
+class TokenBucket:
+    """
+    Token bucket shared by every thread and event loop in the process
+
+    Tokens are reserved under a lock and waited for with asyncio.sleep, so
+    callers on any loop queue up in arrival order without a loop-bound
+    primitive. pause() empties the bucket until a deadline, which is how a
+    Retry-After from the server holds back every caller of the key.
+    """
+
+    def __init__(self, rate=DEFAULT_REQUESTS_PER_SECOND, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0
+        self._lock = threading.Lock()
+
+    def configure(self, rate=None, burst=None):
+        with self._lock:
+            if rate is not None:
+                self.rate = rate
+            if burst is not None:
+                self.burst = burst
+                self._tokens = min(self._tokens, burst)
+
+    def _reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            if start > self._updated:
+                self._tokens = min(self.burst, self._tokens + (start - self._updated) * self.rate)
+                self._updated = start
+            self._tokens -= 1
+            # A negative balance is a queue of reservations, each 1/rate apart
+            wait = start - now
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    async def acquire(self):
+        """Wait for a token."""
+        if not self.rate:
+            # No pacing, but a Retry-After still holds every caller back
+            wait = self._paused_until - time.monotonic()
+        else:
+            wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds):
+        """
+        Hold back every caller for a number of seconds
+
+        Args:
+            seconds (float): Seconds before the next token is handed out
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = min(self._tokens, 0)
+            self._updated = max(self._updated, self._paused_until)
+
+
+class TaskSlots:
+    """
+    Counting semaphore for predictions that works across event loops
+
+    asyncio.Semaphore is bound to one loop; sync clients run on the shared
+    loop while async clients may run on their own, and the account limit
+    covers both. Waiters are woken in FIFO order through their own loop.
+    """
+
+    def __init__(self, limit=DEFAULT_MAX_CONCURRENT_TASKS):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    def configure(self, limit):
+        with self._lock:
+            self.limit = limit
+        self._wake()
+
+    async def acquire(self):
+        """Wait for a free prediction slot."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and (not self.limit or self.in_use < self.limit):
+                self.in_use += 1
+                return
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+                    raise
+            # The slot was handed over just as the wait was cancelled
+            self.release()
+            raise
+
+    def release(self):
+        """Free a slot, handing it to the longest waiter if there is one."""
+        with self._lock:
+            self.in_use -= 1
+        self._wake()
+
+    def _wake(self):
+        with self._lock:
+            while self._waiters and (not self.limit or self.in_use < self.limit):
+                loop, future = self._waiters.popleft()
+                self.in_use += 1
+                loop.call_soon_threadsafe(_resolve, future)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AccountLimiter:
+    """
+    Request-rate and concurrent-prediction limits for one API key
+
+    Every client using the key shares the limiter, so many nodes running at
+    once stay under the account quota together.
+    """
+
+    def __init__(self, requests_per_second=DEFAULT_REQUESTS_PER_SECOND, burst=DEFAULT_BURST,
+                 max_concurrent_tasks=DEFAULT_MAX_CONCURRENT_TASKS):
+        """
+        Args:
+            requests_per_second (float): Account API request rate, 0 for no limit
+            burst (int): Requests allowed back to back before pacing starts
+            max_concurrent_tasks (int): Predictions submitted but not finished, 0 for no limit
+        """
+        self.requests = TokenBucket(requests_per_second * RATE_HEADROOM, burst)
+        self.tasks = TaskSlots(max_concurrent_tasks)
+
+    def configure(self, requests_per_second=None, burst=None, max_concurrent_tasks=None):
+        """
+        Change the limits in place
+
+        Args:
+            requests_per_second (float, optional): Account API request rate, 0 for no limit
+            burst (int, optional): Requests allowed back to back before pacing starts
+            max_concurrent_tasks (int, optional): Predictions in flight, 0 for no limit
+        """
+        rate = requests_per_second * RATE_HEADROOM if requests_per_second is not None else None
+        self.requests.configure(rate=rate, burst=burst)
+        if max_concurrent_tasks is not None:
+            self.tasks.configure(max_concurrent_tasks)
+
+    def backoff(self, headers):
+        """
+        Pause all requests for the Retry-After of a 429 response
+
+        Args:
+            headers (Mapping): Response headers
+
+        Returns:
+            float: Seconds paused
+        """
+        seconds = parse_retry_after(headers)
+        self.requests.pause(seconds)
+        return seconds
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def _env_number(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def default_limits():
+    """
+    Get the limits a key has when nothing else sets them
+
+    These come from WAVESPEED_REQUESTS_PER_SECOND and
+    WAVESPEED_MAX_CONCURRENT_TASKS, and are unlimited when those are unset.
+
+    Returns:
+        tuple: (requests_per_second, max_concurrent_tasks), 0 for no limit
+    """
+    return (_env_number("WAVESPEED_REQUESTS_PER_SECOND", DEFAULT_REQUESTS_PER_SECOND),
+            int(_env_number("WAVESPEED_MAX_CONCURRENT_TASKS", DEFAULT_MAX_CONCURRENT_TASKS)))
+
+
+def get_rate_limiter(api_key):
+    """
+    Get the process-wide limiter for an API key
+
+    Args:
+        api_key (str): WaveSpeed AI API key
+
+    Returns:
+        AccountLimiter: Shared limiter, created with default_limits()
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(api_key)
+        if limiter is None:
+            rate, max_concurrent_tasks = default_limits()
+            limiter = AccountLimiter(requests_per_second=rate, burst=DEFAULT_BURST,
+                                     max_concurrent_tasks=max_concurrent_tasks)
+            _limiters[api_key] = limiter
+        return limiter
+
+
+def configure_rate_limit(api_key, requests_per_second=None, burst=None, max_concurrent_tasks=None):
+    """
+    Set the limits for an API key
+
+    Args:
+        api_key (str): WaveSpeed AI API key
+        requests_per_second (float, optional): Sustained API request rate, 0 for no limit
+        burst (int, optional): Requests allowed back to back
+        max_concurrent_tasks (int, optional): Predictions in flight, 0 for no limit
+
+    Returns:
+        AccountLimiter: The key's limiter
+    """
+    limiter = get_rate_limiter(api_key)
+    limiter.configure(requests_per_second=requests_per_second, burst=burst, max_concurrent_tasks=max_concurrent_tasks)
+    return limiter
@@ -0,0 +1,193 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+RESULT_CACHE_MODES = ["off", "urls", "urls and images"]
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_OUTPUT_BYTES = 512 * 1024 * 1024
+# Output URLs stay downloadable for a while after a prediction, but not forever
+DEFAULT_TTL = 6 * 3600
+# Payload fields that change how the result is delivered, not what it is
+DELIVERY_FIELDS = ("enable_sync_mode",)
+
+
+def result_key(url, payload):
+    """
+    Hash an endpoint and a payload into a cache key, independently of key order
+
+    Args:
+        url (str): API endpoint URL
+        payload (dict): Request payload
+
+    Returns:
+        str: Cache key
+    """
+    canonical = {key: value for key, value in payload.items() if key not in DELIVERY_FIELDS}
+    digest = hashlib.sha256()
+    digest.update(f"{url}:".encode("utf-8"))
+    digest.update(json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def is_reproducible(payload, deterministic=False):
+    """
+    Check whether submitting a payload again would produce the same outputs
+
+    Args:
+        payload (dict): Request payload
+        deterministic (bool): Whether the model gives the same outputs without a seed
+
+    Returns:
+        bool: False when the seed is random or left to the model
+    """
+    if "seed" in payload:
+        return payload["seed"] is not None and payload["seed"] != -1
+    return deterministic
+
+
+class ResultCache:
+    """
+    Cache of prediction results for reproducible payloads
+
+    Maps a hash of the endpoint and payload to the task result, so running a
+    workflow again with a fixed seed reuses the earlier outputs instead of
+    paying for a new prediction. The downloaded output files can be kept too,
+    keyed by URL, so nodes downstream of a cached result do not download
+    them again. Results expire after a TTL; results past max_entries and
+    outputs past max_output_bytes are evicted least recently used first.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, max_output_bytes=DEFAULT_MAX_OUTPUT_BYTES):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Maximum number of cached results
+            ttl (float): Seconds a cached result stays valid, None to never expire
+            max_output_bytes (int): Maximum total size of cached output files
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_output_bytes = max_output_bytes
+        self._results = OrderedDict()
+        self._outputs = OrderedDict()
+        self._output_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Look up a cached result
+
+        Args:
+            key (str): Cache key, see result_key
+
+        Returns:
+            dict | None: A copy of the cached result, or None on a miss
+        """
+        with self._lock:
+            entry = self._results.get(key)
+            if entry is None:
+                return None
+            result, created = entry
+            if self.ttl is not None and time.time() - created > self.ttl:
+                del self._results[key]
+                return None
+            self._results.move_to_end(key)
+            return copy.deepcopy(result)
+
+    def put(self, key, result):
+        """
+        Cache a completed result
+
+        Args:
+            key (str): Cache key, see result_key
+            result (dict): Task result with outputs
+        """
+        with self._lock:
+            self._results[key] = (copy.deepcopy(result), time.time())
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def get_output(self, url):
+        """
+        Look up a downloaded output file
+
+        Args:
+            url (str): Output URL
+
+        Returns:
+            bytes | None: File contents, or None on a miss
+        """
+        with self._lock:
+            data = self._outputs.get(url)
+            if data is not None:
+                self._outputs.move_to_end(url)
+            return data
+
+    def put_output(self, url, data):
+        """
+        Keep a downloaded output file
+
+        Args:
+            url (str): Output URL
+            data (bytes): File contents
+        """
+        if len(data) > self.max_output_bytes:
+            return
+        with self._lock:
+            previous = self._outputs.pop(url, None)
+            if previous is not None:
+                self._output_bytes -= len(previous)
+            self._outputs[url] = data
+            self._output_bytes += len(data)
+            while self._output_bytes > self.max_output_bytes:
+                _, evicted = self._outputs.popitem(last=False)
+                self._output_bytes -= len(evicted)
+
+    def clear(self):
+        """Drop every cached result and output."""
+        with self._lock:
+            self._results.clear()
+            self._outputs.clear()
+            self._output_bytes = 0
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def configure_result_cache(max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, max_output_bytes=DEFAULT_MAX_OUTPUT_BYTES):
+    """
+    Replace the process-wide result cache
+
+    Args:
+        max_entries (int): Maximum number of cached results
+        ttl (float): Seconds a cached result stays valid, None to never expire
+        max_output_bytes (int): Maximum total size of cached output files
+
+    Returns:
+        ResultCache: The new cache
+    """
+    global _result_cache
+    with _result_cache_lock:
+        _result_cache = ResultCache(max_entries=max_entries, ttl=ttl, max_output_bytes=max_output_bytes)
+        return _result_cache
+
+
+def get_result_cache():
+    """
+    Get the process-wide result cache
+
+    Returns:
+        ResultCache: The shared cache
+    """
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache()
+        return _result_cache
@@ -0,0 +1,179 @@
+import asyncio
+import random
+import threading
+import aiohttp
+
+
+# Statuses that say nothing about the request itself: the server or a proxy
+# in front of it was busy, restarting or timed out
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Statuses a gateway answers when the API was unreachable or overloaded;
+# requests carrying an Idempotency-Key are retried on them even if they are
+# not idempotent, since the API drops a duplicate that did get through
+GATEWAY_STATUS_CODES = {502, 503, 504}
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BASE_DELAY = 1
+DEFAULT_MAX_DELAY = 30
+# Retries a key may make on top of its requests: a fifth of the request
+# volume, plus a reserve so an idle process can still ride out a blip
+DEFAULT_RETRY_RATIO = 0.2
+DEFAULT_RETRY_RESERVE = 10
+# Errors raised before a connection was made. aiohttp only tells connect
+# timeouts apart from read timeouts since 3.10; older versions are limited
+# to refused connections
+CONNECT_ERRORS = (aiohttp.ClientConnectorError,) + tuple(
+    error for error in (getattr(aiohttp, "ConnectionTimeoutError", None),) if error is not None)
+
+
+class TransientError(Exception):
+    """Raised when a request still fails in a way that may succeed if it is sent again later."""
+
+
+def backoff_delay(attempt, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY):
+    """
+    Exponential backoff with jitter
+
+    Args:
+        attempt (int): Zero-based number of the attempt that just failed
+        base_delay (float): Delay after the first failure in seconds
+        max_delay (float): Upper bound on the delay in seconds
+
+    Returns:
+        float: Seconds to wait before the next attempt
+    """
+    return min(base_delay * 2 ** attempt, max_delay) * random.uniform(0.8, 1.2)
+
+
+def is_retryable_status(status_code, idempotent=True, keyed=False):
+    """
+    Check whether a response status is worth retrying
+
+    A 429 is a rejection before any work is done, so it is retryable for
+    every request. Gateway errors are also retryable for requests that carry
+    an Idempotency-Key; other statuses only for requests that are safe to
+    repeat.
+
+    Args:
+        status_code (int): HTTP status
+        idempotent (bool): Whether repeating the request has no further effect
+        keyed (bool): Whether every attempt carries the same Idempotency-Key
+
+    Returns:
+        bool: Whether to retry
+    """
+    if status_code == 429:
+        return True
+    if keyed and status_code in GATEWAY_STATUS_CODES:
+        return True
+    return idempotent and status_code in RETRYABLE_STATUS_CODES
+
+
+def is_retryable_exception(exception, idempotent=True):
+    """
+    Check whether a failed request is worth retrying
+
+    A request that never got a connection cannot have reached the server and
+    is retryable for every request. A dropped connection or a timeout may
+    have happened after the server acted on it, so it is only retried for
+    requests that are safe to repeat.
+
+    Args:
+        exception (Exception): Error raised by the transport
+        idempotent (bool): Whether repeating the request has no further effect
+
+    Returns:
+        bool: Whether to retry
+    """
+    if isinstance(exception, CONNECT_ERRORS):
+        return True
+    return idempotent and isinstance(exception, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+class RetryPolicy:
+    """How often and how far apart a failed request is sent again."""
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY):
+        """
+        Args:
+            max_attempts (int): Attempts per request, including the first
+            base_delay (float): Delay after the first failure in seconds
+            max_delay (float): Upper bound on the delay in seconds
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        """
+        Get the wait before the next attempt
+
+        Args:
+            attempt (int): Zero-based number of the attempt that just failed
+
+        Returns:
+            float: Seconds to wait
+        """
+        return backoff_delay(attempt, self.base_delay, self.max_delay)
+
+
+class RetryBudget:
+    """
+    Cap on retries relative to requests, shared by every client of a key
+
+    Every request adds `ratio` tokens and every retry spends one, so during
+    an outage retries add at most that fraction to the load instead of
+    multiplying it by the number of attempts.
+    """
+
+    def __init__(self, ratio=DEFAULT_RETRY_RATIO, reserve=DEFAULT_RETRY_RESERVE):
+        """
+        Args:
+            ratio (float): Retries earned per request
+            reserve (float): Tokens available up front and the most that can be saved up
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self._tokens = reserve
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Record a request."""
+        with self._lock:
+            self._tokens = min(self.reserve, self._tokens + self.ratio)
+
+    def withdraw(self):
+        """
+        Spend a token on a retry
+
+        Returns:
+            bool: Whether the retry may go ahead
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+_budgets = {}
+_budgets_lock = threading.Lock()
+
+
+def get_retry_budget(api_key):
+    """
+    Get the process-wide retry budget for an API key
+
+    Args:
+        api_key (str): WaveSpeed AI API key
+
+    Returns:
+        RetryBudget: Shared budget
+    """
+    with _budgets_lock:
+        budget = _budgets.get(api_key)
+        if budget is None:
+            budget = RetryBudget()
+            _budgets[api_key] = budget
+        return budget
@@ -0,0 +1,73 @@
+import asyncio
+import atexit
+import threading
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_loop():
+    """
+    Get the shared background event loop, starting it on first use
+
+    The loop runs forever in a daemon thread. Synchronous clients submit their
+    coroutines to it, so every sync caller in the process shares the same
+    connection pools and in-flight bookkeeping.
+
+    Returns:
+        asyncio.AbstractEventLoop: The shared event loop
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="wavespeed-event-loop", daemon=True)
+            thread.start()
+            _loop = loop
+        return _loop
+
+
+def run_sync(coro):
+    """
+    Run a coroutine on the shared event loop and block until it finishes
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        RuntimeError: If called from the shared event loop itself
+    """
+    loop = get_loop()
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        coro.close()
+        raise RuntimeError("Synchronous WaveSpeed calls cannot be made from the WaveSpeed event loop")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def _shutdown():
+    loop = _loop
+    if loop is None or loop.is_closed() or not loop.is_running():
+        return
+
+    async def _cancel_pending():
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout=5)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+
+
+atexit.register(_shutdown)
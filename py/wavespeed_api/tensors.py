@@ -0,0 +1,236 @@
+import numpy
+import PIL.Image
+import torch
+from collections import Counter
+
+
+# Elements converted per step when turning a float batch back into 8-bit images;
+# bounds the float temporaries to 64 MB however large the batch is
+DEFAULT_CHUNK_ELEMENTS = 16 * 1024 * 1024
+
+# How images of different sizes are combined into one batch: scaled to fit with black bars,
+# placed top left on a canvas large enough for all of them, or stretched
+MIXED_SIZE_MODES = ["letterbox", "pad", "resize"]
+# Pillow's bilinear filter covers the whole source footprint when shrinking, so it does not alias.
+# It is about twice as fast as Lanczos, and as torch's antialiased interpolate, per core, and
+# Pillow releases the GIL, so the images of a batch are resized in parallel on the decode threads.
+RESIZE_FILTER = PIL.Image.Resampling.BILINEAR
+
+
+def image_to_array(image):
+    """
+    Get the 8-bit pixels of an image as an array, copying them once
+
+    Args:
+        image (PIL.Image.Image | numpy.ndarray): Decoded image, arrays are returned as is
+
+    Returns:
+        numpy.ndarray: Pixels, (H, W, C) or (H, W) for single band images
+    """
+    if isinstance(image, numpy.ndarray):
+        return image
+    # asarray takes PIL's packed copy of the pixels as is, array() would copy it a second time
+    return numpy.asarray(image)
+
+
+def image_size(image):
+    """
+    Get the size of an image without decoding it
+
+    Args:
+        image (PIL.Image.Image | numpy.ndarray): Image, opened PIL images are only read up to their header
+
+    Returns:
+        tuple: (width, height)
+    """
+    if isinstance(image, numpy.ndarray):
+        return image.shape[1], image.shape[0]
+    return image.size
+
+
+def reduced_size(size, max_side):
+    """
+    Scale a size down so its longest side is at most max_side, keeping the aspect ratio
+
+    Args:
+        size (tuple): (width, height)
+        max_side (int): Longest side allowed, 0 for no limit
+
+    Returns:
+        tuple: (width, height), unchanged if already small enough
+    """
+    width, height = size
+    if not max_side or max(width, height) <= max_side:
+        return size
+    scale = max_side / max(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _image_channels(image):
+    if isinstance(image, numpy.ndarray):
+        return image.shape[2] if image.ndim > 2 else 1
+    return len(image.getbands())
+
+
+def batch_size(sizes, mixed_sizes="letterbox"):
+    """
+    Pick the size of a batch holding images of the given sizes
+
+    Args:
+        sizes (list): (width, height) of each image
+        mixed_sizes (str): One of MIXED_SIZE_MODES
+
+    Returns:
+        tuple: (width, height); the bounding size for pad, otherwise the most common size,
+            the earliest on ties
+    """
+    if mixed_sizes not in MIXED_SIZE_MODES:
+        raise ValueError(f"Unknown mixed size mode: {mixed_sizes}. Expected one of {MIXED_SIZE_MODES}")
+    if mixed_sizes == "pad":
+        return max(width for width, _ in sizes), max(height for _, height in sizes)
+    counts = Counter(sizes)
+    return max(counts, key=counts.get)
+
+
+def placement(size, target, mixed_sizes="letterbox"):
+    """
+    Find where an image goes in a batch item of another size
+
+    Args:
+        size (tuple): (width, height) of the image
+        target (tuple): (width, height) of the batch
+        mixed_sizes (str): One of MIXED_SIZE_MODES
+
+    Returns:
+        tuple: (left, top, width, height) of the area the image is scaled into
+    """
+    width, height = size
+    target_width, target_height = target
+    if size == target or mixed_sizes == "pad":
+        return 0, 0, width, height
+    if mixed_sizes == "resize":
+        return 0, 0, target_width, target_height
+    scale = min(target_width / width, target_height / height)
+    fitted_width = min(target_width, max(1, round(width * scale)))
+    fitted_height = min(target_height, max(1, round(height * scale)))
+    return (target_width - fitted_width) // 2, (target_height - fitted_height) // 2, fitted_width, fitted_height
+
+
+def allocate_batch(sizes, channels=3, mixed_sizes=None):
+    """
+    Allocate the float32 IMAGE batch for images of the given sizes
+
+    Args:
+        sizes (list): (width, height) of each image, e.g. from image headers
+        channels (int): Bands per image; single band images give an (N, H, W) batch
+        mixed_sizes (str, optional): One of MIXED_SIZE_MODES, None to refuse images of different sizes
+
+    Returns:
+        torch.Tensor: Batch to fill with write_image; zeroed when the images have different sizes
+    """
+    if not sizes:
+        raise ValueError("No images to convert")
+    if len(set(sizes)) == 1:
+        width, height = sizes[0]
+        allocate = torch.empty
+    elif mixed_sizes is None:
+        index = next(index for index, size in enumerate(sizes) if size != sizes[0])
+        raise ValueError(f"Image {index} is {sizes[index][0]}x{sizes[index][1]}, expected "
+                         f"{sizes[0][0]}x{sizes[0][1]} like the first image; images in a batch must have the same size")
+    else:
+        width, height = batch_size(sizes, mixed_sizes)
+        allocate = torch.zeros
+    shape = (len(sizes), height, width) + ((channels,) if channels > 1 else ())
+    return allocate(shape, dtype=torch.float32)
+
+
+def write_image(target, image, mixed_sizes="letterbox"):
+    """
+    Scale an image's pixels into one item of a batch, fitting it if its size differs
+
+    Args:
+        target (numpy.ndarray): Batch item, e.g. allocate_batch(...).numpy()[index]
+        image (PIL.Image.Image | numpy.ndarray): Decoded image
+        mixed_sizes (str): One of MIXED_SIZE_MODES
+    """
+    size = image_size(image)
+    left, top, width, height = placement(size, (target.shape[1], target.shape[0]), mixed_sizes)
+    if (width, height) != size:
+        if isinstance(image, numpy.ndarray):
+            image = PIL.Image.fromarray(image)
+        image = image.resize((width, height), RESIZE_FILTER)
+    pixels = image_to_array(image)
+    if pixels.shape[2:] != target.shape[2:]:
+        raise ValueError(f"Image has {_image_channels(image)} channels, expected "
+                         f"{target.shape[2] if target.ndim > 2 else 1} like the rest of the batch")
+    numpy.divide(pixels, numpy.float32(255), out=target[top:top + height, left:left + width], dtype=numpy.float32)
+
+
+def images_to_tensor(images, mixed_sizes=None):
+    """
+    Convert decoded images into an IMAGE batch
+
+    The float32 batch is allocated once and each image is scaled into its
+    slot in a single pass, so the only temporary is one image's 8-bit pixels
+    instead of a float copy of every image plus the stacked batch.
+
+    Args:
+        images (list): PIL images or uint8 arrays
+        mixed_sizes (str, optional): How images of different sizes are combined, one of
+            MIXED_SIZE_MODES; None raises a ValueError for them
+
+    Returns:
+        torch.Tensor: Batch of shape (N, H, W, C) with values in [0, 1]
+    """
+    images = list(images)
+    if not images:
+        raise ValueError("No images to convert")
+    batch = allocate_batch([image_size(image) for image in images], channels=_image_channels(images[0]),
+                           mixed_sizes=mixed_sizes)
+    target = batch.numpy()
+    for index, image in enumerate(images):
+        write_image(target[index], image, mixed_sizes=mixed_sizes)
+    return batch
+
+
+def tensor_to_uint8(tensor, chunk_elements=DEFAULT_CHUNK_ELEMENTS):
+    """
+    Convert an IMAGE batch into 8-bit pixels
+
+    Works through the batch in chunks of chunk_elements, scaling each chunk
+    on the tensor's device and writing it into one preallocated uint8
+    array, so neither a float64 nor a full size float temporary is made and
+    a GPU tensor is copied to the CPU as 8-bit values.
+
+    Args:
+        tensor (torch.Tensor): Batch with values in [0, 1], any float dtype or device
+        chunk_elements (int): Number of values converted per step
+
+    Returns:
+        numpy.ndarray: uint8 array of the same shape
+    """
+    source = tensor.detach().contiguous().view(-1)
+    result = torch.empty(tensor.shape, dtype=torch.uint8)
+    target = result.view(-1)
+    scratch = torch.empty(min(chunk_elements, source.numel()), dtype=source.dtype, device=source.device)
+    for start in range(0, source.numel(), chunk_elements):
+        chunk = source[start:start + chunk_elements]
+        scaled = scratch[:chunk.numel()]
+        torch.mul(chunk, 255.0, out=scaled).clamp_(0.0, 255.0)
+        # Truncates towards zero like numpy's astype
+        target[start:start + chunk.numel()].copy_(scaled)
+    return result.numpy()
+
+
+def tensor_to_images(tensor, chunk_elements=DEFAULT_CHUNK_ELEMENTS):
+    """
+    Convert an IMAGE batch into PIL images
+
+    Args:
+        tensor (torch.Tensor): Batch with values in [0, 1]
+        chunk_elements (int): Number of values converted per step, see tensor_to_uint8
+
+    Returns:
+        list: One PIL image per batch item
+    """
+    return [PIL.Image.fromarray(pixels) for pixels in tensor_to_uint8(tensor, chunk_elements=chunk_elements)]
@@ -0,0 +1,203 @@
+import asyncio
+import atexit
+import json
+import threading
+import weakref
+import aiohttp
+from .runtime import run_sync
+
+
+DEFAULT_POOL_SIZE = 32
+DEFAULT_KEEPALIVE_TIMEOUT = 60
+# Establishing a connection never takes this long when the API is up, however
+# long the request itself may run
+DEFAULT_CONNECT_TIMEOUT = 10
+# Chunk size for streamed downloads
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class Response:
+    """
+    Fully read HTTP response
+
+    The body is read before the underlying connection is released back to the
+    pool, so callers can inspect it without holding a connection.
+    """
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class Transport:
+    """
+    Pooled HTTP transport for the WaveSpeed AI API
+
+    Holds one aiohttp.ClientSession per event loop. Each session keeps its
+    connections alive between calls, so submits, status polls and uploads
+    reuse established TCP/TLS connections instead of paying a new handshake
+    every time. Sync clients all run on the shared background loop and
+    therefore share a single pool.
+    """
+
+    def __init__(self, api_key, base_url, pool_size=DEFAULT_POOL_SIZE):
+        """
+        Initialize the transport
+
+        Args:
+            api_key (str): WaveSpeed AI API key
+            base_url (str): API base URL, e.g. https://api.wavespeed.ai
+            pool_size (int): Maximum number of pooled connections per host
+        """
+        self.api_key = api_key
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self._sessions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.pool_size,
+                    limit_per_host=self.pool_size,
+                    keepalive_timeout=DEFAULT_KEEPALIVE_TIMEOUT,
+                )
+                session = aiohttp.ClientSession(connector=connector)
+                self._sessions[loop] = session
+            return session
+
+    async def request(self, method, url, timeout=None, **kwargs):
+        """
+        Send a request over the pooled session
+
+        Args:
+            method (str): HTTP method
+            url (str): Absolute URL
+            timeout (float, optional): Total request timeout in seconds
+            **kwargs: Passed through to aiohttp.ClientSession.request
+
+        Returns:
+            Response: The fully read response
+        """
+        session = self._get_session()
+        client_timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=DEFAULT_CONNECT_TIMEOUT)
+        async with session.request(method, url, timeout=client_timeout, **kwargs) as response:
+            content = await response.read()
+            return Response(response.status, response.headers, content)
+
+    async def download(self, url, write, timeout=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Stream a response body to a callback instead of reading it into memory
+
+        Args:
+            url (str): Absolute URL
+            write (callable): Coroutine function called with each chunk of a 200 response body
+            timeout (float, optional): Seconds to wait for each chunk
+            chunk_size (int): Largest chunk passed to write
+
+        Returns:
+            Response: Status and headers, with the body only for a non-200 response
+        """
+        session = self._get_session()
+        # A large file may take much longer than timeout in total, so it bounds the gaps between chunks instead
+        client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=DEFAULT_CONNECT_TIMEOUT, sock_read=timeout)
+        async with session.get(url, timeout=client_timeout) as response:
+            if response.status != 200:
+                return Response(response.status, response.headers, await response.read())
+            async for chunk in response.content.iter_chunked(chunk_size):
+                await write(chunk)
+            return Response(response.status, response.headers, b"")
+
+    async def close(self):
+        """Close the pooled connections owned by the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session = self._sessions.pop(loop, None)
+        if session is not None:
+            await session.close()
+
+
+_transports = {}
+_transports_lock = threading.Lock()
+_default_pool_size = DEFAULT_POOL_SIZE
+
+
+def configure_transport(pool_size=None):
+    """
+    Configure defaults for transports created from now on
+
+    Args:
+        pool_size (int, optional): Maximum number of pooled connections per host
+    """
+    global _default_pool_size
+    if pool_size is not None:
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        _default_pool_size = pool_size
+
+
+def get_transport(api_key, base_url, pool_size=None):
+    """
+    Get the process-wide transport for an API key and base URL
+
+    Transports are created on first use and shared by every client, sync or
+    async, that uses the same key and base URL. The pool size is fixed when
+    the transport is created.
+
+    Args:
+        api_key (str): WaveSpeed AI API key
+        base_url (str): API base URL
+        pool_size (int, optional): Maximum number of pooled connections per host
+
+    Returns:
+        Transport: Shared transport
+    """
+    key = (api_key, base_url)
+    with _transports_lock:
+        transport = _transports.get(key)
+        if transport is None:
+            transport = Transport(api_key, base_url, pool_size=pool_size or _default_pool_size)
+            _transports[key] = transport
+        return transport
+
+
+def get_download_transport():
+    """
+    Get the process-wide transport for fetching output files
+
+    Output files are served from CDN URLs that take no API key, so downloads
+    get a pool of their own.
+
+    Returns:
+        Transport: Shared download transport
+    """
+    return get_transport(None, None)
+
+
+def close_transports():
+    """Close the shared-loop connections of every transport and forget them."""
+    with _transports_lock:
+        transports = list(_transports.values())
+        _transports.clear()
+    if not transports:
+        return
+
+    async def _close_all():
+        for transport in transports:
+            await transport.close()
+
+    run_sync(_close_all())
+
+
+atexit.register(close_transports)
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL = 3600
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def image_key(image, variant=""):
+    """
+    Hash the pixel data of a PIL image
+
+    Args:
+        image (PIL.Image.Image): Image to hash
+        variant (str): How the image is encoded, so lossy and lossless uploads never collide
+
+    Returns:
+        str: Cache key
+    """
+    digest = hashlib.sha256()
+    digest.update(f"image:{variant}:{image.mode}:{image.size[0]}x{image.size[1]}:".encode("utf-8"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def bytes_key(data):
+    """
+    Hash an encoded file that is uploaded as it is
+
+    Args:
+        data (bytes): File contents
+
+    Returns:
+        str: Cache key
+    """
+    digest = hashlib.sha256()
+    digest.update(b"bytes:")
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def file_key(file_path, file_type):
+    """
+    Hash the bytes of a file
+
+    Args:
+        file_path (str): Path to the file
+        file_type (str): MIME type the file is uploaded as
+
+    Returns:
+        str: Cache key
+    """
+    digest = hashlib.sha256()
+    digest.update(f"file:{file_type}:".encode("utf-8"))
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class UploadCache:
+    """
+    Content-addressed cache of uploaded media
+
+    Maps a hash of the uploaded content to the download_url the API returned,
+    so re-uploading identical inputs costs a hash instead of an encode plus a
+    POST. Entries expire after a TTL, the least recently used entries are
+    evicted past max_entries, and the cache is optionally persisted to a JSON
+    file.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, path=None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Maximum number of cached uploads
+            ttl (float): Seconds a cached URL stays valid, None to never expire
+            path (str, optional): JSON file to persist the cache to
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+
+    def get(self, key):
+        """
+        Look up a cached download URL
+
+        Args:
+            key (str): Content hash
+
+        Returns:
+            str | None: The cached URL, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            url, created = entry
+            if self._expired(created):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return url
+
+    def put(self, key, url):
+        """
+        Cache a download URL
+
+        Args:
+            key (str): Content hash
+            url (str): Download URL returned by the upload
+        """
+        with self._lock:
+            self._entries[key] = (url, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.path:
+                self._save()
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+            if self.path:
+                self._save()
+
+    def _expired(self, created):
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, url, created in entries:
+            if not self._expired(created):
+                self._entries[key] = (url, created)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self):
+        entries = [[key, url, created] for key, (url, created) in self._entries.items()]
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Unable to persist upload cache: {str(e)}")
+
+
+_upload_cache = None
+_upload_cache_lock = threading.Lock()
+
+
+def configure_upload_cache(max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL, path=None):
+    """
+    Replace the process-wide upload cache
+
+    Args:
+        max_entries (int): Maximum number of cached uploads
+        ttl (float): Seconds a cached URL stays valid, None to never expire
+        path (str, optional): JSON file to persist the cache to
+
+    Returns:
+        UploadCache: The new cache
+    """
+    global _upload_cache
+    with _upload_cache_lock:
+        _upload_cache = UploadCache(max_entries=max_entries, ttl=ttl, path=path)
+        return _upload_cache
+
+
+def get_upload_cache():
+    """
+    Get the process-wide upload cache
+
+    Persistence is enabled when the WAVESPEED_UPLOAD_CACHE environment variable
+    names a file.
+
+    Returns:
+        UploadCache: The shared cache
+    """
+    global _upload_cache
+    with _upload_cache_lock:
+        if _upload_cache is None:
+            _upload_cache = UploadCache(path=os.environ.get("WAVESPEED_UPLOAD_CACHE") or None)
+        return _upload_cache
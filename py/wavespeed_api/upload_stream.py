@@ -0,0 +1,81 @@
+import io
+import os
+
+
+BASE_UPLOAD_TIMEOUT = 60
+# Slowest sustained upload rate the timeout still allows for, in bytes per second
+MIN_UPLOAD_THROUGHPUT = 1024 * 1024
+
+
+def upload_timeout(size, base_timeout=BASE_UPLOAD_TIMEOUT, min_throughput=MIN_UPLOAD_THROUGHPUT):
+    """
+    Get a timeout that grows with the upload size
+
+    Args:
+        size (int): Upload size in bytes
+        base_timeout (float): Timeout for an empty upload in seconds
+        min_throughput (float): Slowest upload rate to allow for, in bytes per second
+
+    Returns:
+        float: Timeout in seconds
+    """
+    return base_timeout + size / min_throughput
+
+
+class ProgressFile(io.RawIOBase):
+    """
+    Read-only file wrapper that reports how many bytes have been read
+
+    aiohttp streams file objects into multipart bodies chunk by chunk, so
+    wrapping the file keeps memory constant while letting callers follow the
+    upload. The callback runs on whichever thread reads the file, which is
+    usually a worker thread of the event loop's executor.
+    """
+
+    def __init__(self, file_path, progress=None):
+        """
+        Open a file for streaming
+
+        Args:
+            file_path (str): Path to the file
+            progress (callable, optional): Called as progress(bytes_sent, total_bytes)
+        """
+        self._file = open(file_path, "rb")
+        self.name = file_path
+        self.total = os.fstat(self._file.fileno()).st_size
+        self.progress = progress
+        self.sent = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def tell(self):
+        return self._file.tell()
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        position = self._file.seek(offset, whence)
+        self.sent = position
+        return position
+
+    def read(self, size=-1):
+        chunk = self._file.read(size)
+        if chunk:
+            self.sent += len(chunk)
+            if self.progress is not None:
+                self.progress(self.sent, self.total)
+        return chunk
+
+    def readinto(self, buffer):
+        chunk = self.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+    def close(self):
+        self._file.close()
+        super().close()
@@ -1,32 +1,184 @@
-import requests
+import asyncio
 import base64
 import io
 import os
-import numpy
 import PIL
-import requests
 import torch
 from collections.abc import Iterable
 from typing import List
 from pydantic import BaseModel, Field
 from comfy_api.input import ImageInput, AudioInput, VideoInput
-import torchaudio
-import av
-
-
-def imageurl2tensor(image_urls: List[str]):
-    images = []
+from . import download, tensors
+from .runtime import run_sync
+
+
+def imageurl2tensor(image_urls: List[str], max_concurrency=download.DEFAULT_CONCURRENCY,
+                    timeout=download.DEFAULT_TIMEOUT, max_retries=download.DEFAULT_MAX_RETRIES, output_cache=None,
+                    mixed_sizes="letterbox", as_list=False, max_side=0):
+    """
+    Download output images concurrently and decode them into an IMAGE tensor
+
+    Each image is decoded to 8-bit pixels in the thread pool as soon as its
+    download finishes, overlapping with the remaining downloads, and the
+    batch is then allocated from the decoded sizes and filled in one pass.
+
+    Args:
+        image_urls (List[str]): Output image URLs
+        max_concurrency (int): Maximum number of downloads in flight
+        timeout (float): Per-request timeout in seconds
+        max_retries (int): Maximum number of attempts per URL
+        output_cache (ResultCache, optional): Reuse and keep downloaded files in this cache
+        mixed_sizes (str): How images of different sizes are combined, one of tensors.MIXED_SIZE_MODES
+        as_list (bool): Return one single image tensor per URL at its own size instead of a batch
+        max_side (int): Decode images at reduced scale so their longest side is at most this, 0 for full size
+
+    Returns:
+        torch.Tensor | list: Images in the same order as image_urls
+    """
     if not image_urls:
-        return torch.zeros((1, 3, 1, 1))
-    for url in image_urls:
-        image_data = fetch_image(url)
-        image = decode_image(image_data)
-        images.append(image)
-    return images2tensor(images)
-
-
-def fetch_image(url, stream=True):
-    return requests.get(url, stream=stream).content
+        return [] if as_list else torch.zeros((1, 3, 1, 1))
+
+    def _decode(data):
+        return tensors.image_to_array(decode_image(data, max_side=max_side))
+
+    if output_cache is None:
+        pixels = download.fetch_all_sync(image_urls, decode=_decode, concurrency=max_concurrency, timeout=timeout,
+                                         max_retries=max_retries)
+    else:
+        cached = {url: output_cache.get_output(url) for url in image_urls}
+        missing = list(dict.fromkeys(url for url, data in cached.items() if data is None))
+        # The body is kept next to its pixels until every download is in, then stored in the cache
+        fetched = download.fetch_all_sync(missing, decode=lambda data: (data, _decode(data)),
+                                          concurrency=max_concurrency, timeout=timeout, max_retries=max_retries)
+        decoded = {}
+        for url, (data, image_pixels) in zip(missing, fetched):
+            output_cache.put_output(url, data)
+            decoded[url] = image_pixels
+        hits = [url for url in cached if url not in decoded]
+        decoded.update(zip(hits, run_sync(_decode_all([cached[url] for url in hits], _decode))))
+        pixels = [decoded[url] for url in image_urls]
+    return pixels2tensor(pixels, mixed_sizes=mixed_sizes, as_list=as_list)
+
+
+def pixels2tensor(pixels, mixed_sizes="letterbox", as_list=False):
+    """
+    Convert decoded 8-bit images into an IMAGE tensor
+
+    Args:
+        pixels (list): uint8 arrays of shape (H, W, C)
+        mixed_sizes (str): How images of different sizes are combined, one of tensors.MIXED_SIZE_MODES
+        as_list (bool): Return one single image tensor per image at its own size instead of a batch
+
+    Returns:
+        torch.Tensor | list: Images in the same order as pixels
+    """
+    if as_list:
+        return [tensors.images_to_tensor([image_pixels]) for image_pixels in pixels]
+    sizes = [tensors.image_size(image_pixels) for image_pixels in pixels]
+    batch = tensors.allocate_batch(sizes, mixed_sizes=mixed_sizes)
+    if len(set(sizes)) > 1:
+        print(f"Outputs have {len(set(sizes))} different sizes, combining them with {mixed_sizes} into "
+              f"{batch.shape[2]}x{batch.shape[1]}")
+    for target, image_pixels in zip(batch.numpy(), pixels):
+        tensors.write_image(target, image_pixels, mixed_sizes=mixed_sizes)
+    return batch
+
+
+async def _decode_all(bodies, decode):
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*[loop.run_in_executor(None, decode, data) for data in bodies])
+
+
+class OutputPrefetcher:
+    """
+    Downloads and decodes output images while the prediction producing them is still running
+
+    Pass on_progress to run_prediction: every output URL a status check
+    reports is downloaded and decoded to uint8 pixels at once, so a model
+    that publishes its outputs one by one has most of them decoded by the
+    time it completes, and to_tensor only converts them into the batch.
+    """
+
+    def __init__(self, max_concurrency=download.DEFAULT_CONCURRENCY, timeout=download.DEFAULT_TIMEOUT,
+                 max_retries=download.DEFAULT_MAX_RETRIES, output_cache=None, max_side=0):
+        """
+        Args:
+            max_concurrency (int): Maximum number of downloads in flight
+            timeout (float): Per-request timeout in seconds
+            max_retries (int): Maximum number of attempts per URL
+            output_cache (ResultCache, optional): Reuse and keep downloaded files in this cache
+            max_side (int): Decode images at reduced scale so their longest side is at most this, 0 for full size
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.output_cache = output_cache
+        self.max_side = max_side
+        # Output URL -> task decoding it, only touched on the shared event loop
+        self._tasks = {}
+        self._semaphore = None
+
+    def on_progress(self, task_status):
+        """
+        Start fetching the outputs of a task status that were not seen before
+
+        Called on the shared event loop.
+
+        Args:
+            task_status (dict): Status of the running prediction
+        """
+        for url in task_status.get("outputs") or []:
+            if url not in self._tasks:
+                self._tasks[url] = asyncio.ensure_future(self._fetch(url))
+
+    async def _fetch(self, url):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(self.max_concurrency, 1))
+        data = self.output_cache.get_output(url) if self.output_cache is not None else None
+        if data is None:
+            async with self._semaphore:
+                data = await download.fetch_bytes(url, timeout=self.timeout, max_retries=self.max_retries)
+            if self.output_cache is not None:
+                self.output_cache.put_output(url, data)
+        return await asyncio.get_running_loop().run_in_executor(None, self._decode, data)
+
+    def _decode(self, data):
+        return tensors.image_to_array(decode_image(data, max_side=self.max_side))
+
+    async def _collect(self, image_urls):
+        self.on_progress({"outputs": image_urls})
+        return await asyncio.gather(*[self._tasks[url] for url in image_urls])
+
+    def to_tensor(self, image_urls, mixed_sizes="letterbox"):
+        """
+        Build the IMAGE batch of a completed prediction
+
+        Outputs that were not prefetched are downloaded and decoded now.
+
+        Args:
+            image_urls (List[str]): Output image URLs of the completed prediction
+            mixed_sizes (str): How images of different sizes are combined, one of tensors.MIXED_SIZE_MODES
+
+        Returns:
+            torch.Tensor: Images in the same order as image_urls
+        """
+        if not image_urls:
+            return torch.zeros((1, 3, 1, 1))
+        return pixels2tensor(run_sync(self._collect(image_urls)), mixed_sizes=mixed_sizes)
+
+    def close(self):
+        """Cancel prefetches that are still running, e.g. after the prediction failed."""
+
+        async def _cancel():
+            for task in self._tasks.values():
+                task.cancel()
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+        run_sync(_cancel())
+
+
+def fetch_image(url, stream=True, timeout=download.DEFAULT_TIMEOUT):
+    return run_sync(download.fetch_bytes(url, timeout=timeout))
 
 
 def save_video(video: VideoInput, save_path: str):
@@ -36,97 +188,121 @@ def save_video(video: VideoInput, save_path: str):
         codec="h264",
     )
 
-def save_audio(audio: AudioInput, save_path: str):
-    quality = "128k"
-    format = "mp3"
-     # Use original sample rate initially
-    sample_rate = audio["sample_rate"]
-    # Opus supported sample rates
-    OPUS_RATES = [8000, 12000, 16000, 24000, 48000]
-
-    for (batch_number, waveform) in enumerate(audio["waveform"].cpu()):
-        # Use original sample rate initially
-        sample_rate = audio["sample_rate"]
-
-        # Handle Opus sample rate requirements
-        if format == "opus":
-            if sample_rate > 48000:
-                sample_rate = 48000
-            elif sample_rate not in OPUS_RATES:
-                # Find the next highest supported rate
-                for rate in sorted(OPUS_RATES):
-                    if rate > sample_rate:
-                        sample_rate = rate
-                        break
-                if sample_rate not in OPUS_RATES:  # Fallback if still not supported
-                    sample_rate = 48000
-
-            # Resample if necessary
-            if sample_rate != audio["sample_rate"]:
-                waveform = torchaudio.functional.resample(waveform, audio["sample_rate"], sample_rate)
-
-        # Create output with specified format
-        output_buffer = io.BytesIO()
-        output_container = av.open(output_buffer, mode='w', format=format)
-
-        # Set up the output stream with appropriate properties
-        if format == "opus":
-            out_stream = output_container.add_stream("libopus", rate=sample_rate)
-            if quality == "64k":
-                out_stream.bit_rate = 64000
-            elif quality == "96k":
-                out_stream.bit_rate = 96000
-            elif quality == "128k":
-                out_stream.bit_rate = 128000
-            elif quality == "192k":
-                out_stream.bit_rate = 192000
-            elif quality == "320k":
-                out_stream.bit_rate = 320000
-        elif format == "mp3":
-            out_stream = output_container.add_stream("libmp3lame", rate=sample_rate)
-            if quality == "V0":
-                #TODO i would really love to support V3 and V5 but there doesn't seem to be a way to set the qscale level, the property below is a bool
+# Samples per channel handed to the encoder at a time, about 3 s at 44.1 kHz
+DEFAULT_AUDIO_CHUNK_SAMPLES = 131072
+AUDIO_CODECS = {"mp3": "libmp3lame", "opus": "libopus", "flac": "flac"}
+AUDIO_BIT_RATES = {"64k": 64000, "96k": 96000, "128k": 128000, "192k": 192000, "320k": 320000}
+# Opus supported sample rates
+OPUS_RATES = [8000, 12000, 16000, 24000, 48000]
+
+
+def audio_paths(save_path, count):
+    """
+    Get the file each item of an AUDIO batch is saved to
+
+    The first item goes to save_path, so single clips keep their name;
+    later items get the batch index appended, e.g. speech_1.mp3.
+
+    Args:
+        save_path (str): Path of the first item
+        count (int): Number of batch items
+
+    Returns:
+        List[str]: One path per batch item
+    """
+    root, ext = os.path.splitext(save_path)
+    return [save_path] + [f"{root}_{index}{ext}" for index in range(1, count)]
+
+
+def save_audio(audio: AudioInput, save_path, format="mp3", quality="128k", batch_index=None,
+               chunk_samples=DEFAULT_AUDIO_CHUNK_SAMPLES):
+    """
+    Encode the clips of an AUDIO input to files
+
+    Each clip is handed to the encoder in chunks of chunk_samples, as
+    planar float views of the waveform, and the container writes packets
+    straight to its file. Memory stays at one chunk regardless of the clip
+    length, on top of the waveform itself. Rate and layout conversions are
+    left to the encoder's resampler.
+
+    Args:
+        audio (AudioInput): Audio with "waveform" (B, C, N) and "sample_rate"
+        save_path (str | file): Path of the first clip, see audio_paths, or a writable binary stream when
+            batch_index selects a single clip
+        format (str): Container and codec, one of "mp3", "opus" or "flac"
+        quality (str): Bit rate for mp3 and opus, e.g. "128k", or "V0" for mp3 variable bit rate
+        batch_index (int, optional): Encode only this clip, to save_path
+        chunk_samples (int): Samples per channel encoded at a time
+
+    Returns:
+        List[str | file]: Where each clip was written
+    """
+    # Imported here so loading the node modules does not pull in the audio stack
+    import av
+
+    if format not in AUDIO_CODECS:
+        raise ValueError(f"Unsupported audio format: {format}")
+    waveform = audio["waveform"]
+    if waveform.dim() != 3:
+        raise ValueError(f"Expected an audio waveform of shape (batch, channels, samples), got {tuple(waveform.shape)}")
+    layout = {1: "mono", 2: "stereo"}.get(waveform.shape[1])
+    if layout is None:
+        raise ValueError(f"Unsupported number of audio channels: {waveform.shape[1]}")
+
+    if batch_index is not None:
+        items = [(waveform[batch_index], save_path)]
+    elif isinstance(save_path, str):
+        items = list(zip(waveform, audio_paths(save_path, waveform.shape[0])))
+    elif waveform.shape[0] == 1:
+        items = [(waveform[0], save_path)]
+    else:
+        raise ValueError("A stream can only hold one clip, pass batch_index or a file path")
+
+    input_rate = int(audio["sample_rate"])
+    sample_rate = input_rate
+    if format == "opus" and sample_rate not in OPUS_RATES:
+        # The next highest supported rate, 48 kHz above that
+        sample_rate = next((rate for rate in OPUS_RATES if rate > sample_rate), 48000)
+
+    for clip, target in items:
+        with av.open(target, mode="w", format=format) as output_container:
+            out_stream = output_container.add_stream(AUDIO_CODECS[format], rate=sample_rate)
+            out_stream.layout = layout
+            if format == "mp3" and quality == "V0":
+                # Variable bit rate at the highest quality; qscale is only a switch in PyAV
                 out_stream.codec_context.qscale = 1
-            elif quality == "128k":
-                out_stream.bit_rate = 128000
-            elif quality == "320k":
-                out_stream.bit_rate = 320000
-        else: #format == "flac":
-            out_stream = output_container.add_stream("flac", rate=sample_rate)
+            elif format != "flac" and quality in AUDIO_BIT_RATES:
+                out_stream.bit_rate = AUDIO_BIT_RATES[quality]
 
-        frame = av.AudioFrame.from_ndarray(waveform.movedim(0, 1).reshape(1, -1).float().numpy(), format='flt', layout='mono' if waveform.shape[0] == 1 else 'stereo')
-        frame.sample_rate = sample_rate
-        frame.pts = 0
-        output_container.mux(out_stream.encode(frame))
+            for start in range(0, clip.shape[1], chunk_samples):
+                # Only this chunk is moved to the CPU and, if needed, converted to float32 and made contiguous,
+                # e.g. for a (B, N, C) waveform transposed to (B, C, N)
+                chunk = clip[:, start:start + chunk_samples].to("cpu", torch.float32).contiguous().numpy()
+                frame = av.AudioFrame.from_ndarray(chunk, format="fltp", layout=layout)
+                frame.sample_rate = input_rate
+                frame.pts = start
+                output_container.mux(out_stream.encode(frame))
 
-        # Flush encoder
-        output_container.mux(out_stream.encode(None))
-
-        # Close containers
-        output_container.close()
-
-        # Write the output to file
-        output_buffer.seek(0)
-        with open(save_path, 'wb') as f:
-            f.write(output_buffer.getbuffer())
-        break
+            # Flush encoder
+            output_container.mux(out_stream.encode(None))
+    return [target for _, target in items]
 
 
 def tensor2images(tensor):
-    np_imgs = numpy.clip(tensor.cpu().numpy() * 255.0,
-                         0.0, 255.0).astype(numpy.uint8)
-    return [PIL.Image.fromarray(np_img) for np_img in np_imgs]
+    return tensors.tensor_to_images(tensor)
 
 
 def images2tensor(images):
     if isinstance(images, Iterable):
-        return torch.stack([torch.from_numpy(numpy.array(image)).float() / 255.0 for image in images])
-    return torch.from_numpy(numpy.array(images)).unsqueeze(0).float() / 255.0
+        return tensors.images_to_tensor(images)
+    return tensors.images_to_tensor([images])
 
 
-def decode_image(data_bytes, rtn_mask=False):
+def decode_image(data_bytes, rtn_mask=False, max_side=0):
     with io.BytesIO(data_bytes) as bytes_io:
         img = PIL.Image.open(bytes_io)
+        if max_side:
+            img = _decode_reduced(img, max_side)
         if not rtn_mask:
             img = img.convert('RGB')
         elif 'A' in img.getbands():
@@ -136,6 +312,17 @@ def decode_image(data_bytes, rtn_mask=False):
     return img
 
 
+def _decode_reduced(img, max_side):
+    size = tensors.reduced_size(img.size, max_side)
+    if size == img.size:
+        return img
+    if img.format == "JPEG":
+        # Decodes at 1/2, 1/4 or 1/8 scale inside the JPEG decoder, the smallest still at least as large as size
+        img.draft("RGB", size)
+    # Box-reduces by an integer factor before resampling the rest, which is what makes large reductions cheap
+    return img.resize(size, tensors.RESIZE_FILTER, reducing_gap=2.0)
+
+
 def encode_image(img, mask=None):
     if mask is not None:
         img = img.copy()
@@ -0,0 +1,154 @@
+import os
+from . import download, tensors
+from .runtime import run_sync
+
+# Largest float32 frame batch decode_frames allocates; 1080p frames take about 24 MB each
+DEFAULT_MAX_BATCH_BYTES = 4 * 1024 * 1024 * 1024
+
+
+def max_batch_bytes():
+    """
+    Frame batch budget from WAVESPEED_MAX_FRAMES_MB, or DEFAULT_MAX_BATCH_BYTES when unset
+
+    Returns:
+        int: Maximum size of a decoded frame batch in bytes, 0 for no limit
+    """
+    megabytes = os.environ.get("WAVESPEED_MAX_FRAMES_MB")
+    return int(float(megabytes) * 1024 * 1024) if megabytes else DEFAULT_MAX_BATCH_BYTES
+
+
+def _check_batch_bytes(path, count, size, max_bytes):
+    needed = count * size[0] * size[1] * 3 * 4
+    if max_bytes and needed > max_bytes:
+        raise Exception(f"{count} frames of {size[0]}x{size[1]} from {os.path.basename(path)} need "
+                        f"{needed / 1024 / 1024:.0f} MB, over the {max_bytes / 1024 / 1024:.0f} MB frame budget; "
+                        f"set max_side, frame_stride, max_frames or duration to take fewer or smaller frames, "
+                        f"or raise WAVESPEED_MAX_FRAMES_MB")
+
+
+def _expected_frames(container, stream, fps, start_time, end_time, frame_stride, max_frames):
+    if stream.duration is not None:
+        length = float(stream.duration * stream.time_base)
+    elif container.duration is not None:
+        length = container.duration / 1000000
+    else:
+        return 0
+    if start_time == 0 and end_time is None and stream.frames:
+        count = stream.frames
+    else:
+        count = round((min(end_time or length, length) - start_time) * fps)
+    count = max(0, -(-count // frame_stride))
+    return min(count, max_frames) if max_frames else count
+
+
+def decode_frames(path, frame_stride=1, start_time=0, duration=0, max_side=0, max_frames=0, max_bytes=None):
+    """
+    Decode the frames of a video file into an IMAGE batch
+
+    Frames are decoded one at a time, scaled down to max_side by the
+    decoder's scaler, and only the selected ones are kept. The float batch
+    is allocated up front from the frame count in the container, and each
+    frame is written straight into it. Memory therefore grows with the
+    frames returned, not with the length or resolution of the video, and
+    a batch over max_bytes is refused before it is allocated.
+
+    Args:
+        path (str): Video file
+        frame_stride (int): Keep every frame_stride-th frame of the selected range
+        start_time (float): Seconds into the video the first frame is taken from
+        duration (float): Seconds of video to take frames from, 0 for everything after start_time
+        max_side (int): Scale frames down so their longest side is at most this, 0 for full size
+        max_frames (int): Stop after this many frames, 0 for no limit
+        max_bytes (int, optional): Largest frame batch in bytes, 0 for no limit, None for max_batch_bytes()
+
+    Returns:
+        tuple: (frames, fps) with frames as a (N, H, W, 3) tensor and fps the rate of the returned frames
+    """
+    # Imported here so loading the node modules does not pull in the video stack
+    import av
+    import torch
+
+    if frame_stride < 1:
+        raise ValueError("frame_stride must be at least 1")
+    end_time = start_time + duration if duration else None
+    if max_bytes is None:
+        max_bytes = max_batch_bytes()
+    with av.open(path) as container:
+        if not container.streams.video:
+            raise Exception(f"No video stream in {os.path.basename(path)}")
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        rate = stream.average_rate or stream.guessed_rate
+        fps = float(rate) if rate else 0.0
+        size = tensors.reduced_size((stream.codec_context.width, stream.codec_context.height), max_side)
+        expected = _expected_frames(container, stream, fps, start_time, end_time, frame_stride, max_frames)
+        _check_batch_bytes(path, expected, size, max_bytes)
+        batch = tensors.allocate_batch([size] * max(expected, 1))
+        target = batch.numpy()
+        # Frames beyond the count the container announced, kept as uint8 until the end
+        overflow = []
+        count = 0
+
+        if start_time > 0:
+            # Lands on the keyframe before start_time; the frames up to it are decoded and skipped below
+            container.seek(int(start_time / stream.time_base), stream=stream)
+        # Half a frame of slack so a start time on a frame boundary keeps that frame
+        first_time = start_time - 0.5 / fps if fps else start_time
+        selected = 0
+        for frame in container.decode(stream):
+            if frame.time is not None:
+                if frame.time < first_time:
+                    continue
+                if end_time is not None and frame.time >= end_time:
+                    break
+            if selected % frame_stride == 0:
+                pixels = frame.to_ndarray(format="rgb24", width=size[0], height=size[1])
+                if count < expected:
+                    tensors.write_image(target[count], pixels)
+                else:
+                    _check_batch_bytes(path, count + 1, size, max_bytes)
+                    overflow.append(pixels)
+                count += 1
+                if max_frames and count >= max_frames:
+                    break
+            selected += 1
+
+    if count == 0:
+        raise Exception(f"No frames in the selected range of {os.path.basename(path)}")
+    if overflow:
+        batch = torch.cat([batch[:count - len(overflow)], tensors.images_to_tensor(overflow)])
+    elif count < batch.shape[0]:
+        # A view; the frames the container announced but did not have are few, not worth a copy
+        batch = batch[:count]
+    return batch, fps / frame_stride
+
+
+def videourl2frames(video_url, frame_stride=1, start_time=0, duration=0, max_side=0, max_frames=0, max_bytes=None,
+                    timeout=download.DEFAULT_TIMEOUT, max_retries=download.DEFAULT_MAX_RETRIES):
+    """
+    Download an output video to disk and decode its frames into an IMAGE batch
+
+    The download is streamed to a file, kept in the download cache when it
+    is enabled, so the video is never held in memory as a whole.
+
+    Args:
+        video_url (str): Output video URL
+        frame_stride (int): Keep every frame_stride-th frame of the selected range
+        start_time (float): Seconds into the video the first frame is taken from
+        duration (float): Seconds of video to take frames from, 0 for everything after start_time
+        max_side (int): Scale frames down so their longest side is at most this, 0 for full size
+        max_frames (int): Stop after this many frames, 0 for no limit
+        max_bytes (int, optional): Largest frame batch in bytes, see decode_frames
+        timeout (float): Seconds to wait for each chunk of the download
+        max_retries (int): Maximum number of download attempts
+
+    Returns:
+        tuple: (frames, fps), see decode_frames
+    """
+    path, temporary = run_sync(download.fetch_file(video_url, timeout=timeout, max_retries=max_retries))
+    try:
+        return decode_frames(path, frame_stride=frame_stride, start_time=start_time, duration=duration,
+                             max_side=max_side, max_frames=max_frames, max_bytes=max_bytes)
+    finally:
+        if temporary:
+            os.remove(path)
@@ -0,0 +1,212 @@
+import json
+from .wavespeed_api.executor import run_model_batch
+from .bytedance_seedream_v4 import ByteDanceSeedDreamV4
+from .bytedance_seedream_v4_edit import BytedanceSeedreamV4Edit
+from .flux_kontext_pro import FluxKontextProNode
+from .google_nano_banana_edit import GoogleNanoBananaEditNode
+from .google_nano_banana_text_to_image import GoogleNanoBananaTextToImage
+from .google_veo31_fast_image_to_video import GoogleVeo31FastImageToVideo
+from .google_veo31_fast_text_to_video import GoogleVeo31FastTextToVideo
+from .qwen_image_edit import QwenImageEditNode
+from .qwen_image_text_to_image import QwenImageTextToImageNode
+from .wan_2_5_image_to_video_fast import WAN25ImageToVideoFast
+from .wan_2_5_text_to_image import WAN25TextToImage
+from .wan_2_5_text_to_video_fast import WAN25TextToVideoFast
+
+
+# Model name -> (node class whose SPEC is used, base payload, image field).
+# The image field is None for text-only models; "images" takes a list.
+IMAGE_BATCH_MODELS = {
+    "Qwen Image Text-to-Image": (QwenImageTextToImageNode, {"size": "1328*1328", "output_format": "jpeg",
+                                                             "enable_base64_output": False}, None),
+    "ByteDance Seedream V4": (ByteDanceSeedDreamV4, {"size": "2048*2048", "enable_base64_output": False}, None),
+    "Google Nano Banana Text-to-Image": (GoogleNanoBananaTextToImage, {"output_format": "png",
+                                                                       "enable_base64_output": False}, None),
+    "Alibaba WAN 2.5 Text-to-Image": (WAN25TextToImage, {"size": "1024*1024"}, None),
+    "Qwen Image Edit": (QwenImageEditNode, {"output_format": "jpeg", "enable_base64_output": False}, "image"),
+    "ByteDance Seedream V4 Edit": (BytedanceSeedreamV4Edit, {"size": "2048*2048", "enable_base64_output": False},
+                                   "images"),
+    "Google Nano Banana Edit": (GoogleNanoBananaEditNode, {"output_format": "png", "enable_base64_output": False},
+                                "images"),
+    "Flux Kontext Pro": (FluxKontextProNode, {"guidance_scale": 3.5}, "image"),
+}
+
+VIDEO_BATCH_MODELS = {
+    "Alibaba WAN 2.5 Text-to-Video Fast": (WAN25TextToVideoFast, {"size": "1280*720", "duration": 5}, None),
+    "Alibaba WAN 2.5 Image-to-Video Fast": (WAN25ImageToVideoFast, {"resolution": "720p", "duration": 5}, "image"),
+    "Google Veo 3.1 Fast Text-to-Video": (GoogleVeo31FastTextToVideo, {"aspect_ratio": "16:9", "duration": 8,
+                                                                      "resolution": "1080p"}, None),
+    "Google Veo 3.1 Fast Image-to-Video": (GoogleVeo31FastImageToVideo, {"aspect_ratio": "16:9", "duration": 8,
+                                                                        "resolution": "1080p"}, "image"),
+}
+
+
+def _split_lines(text):
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def _parse_seeds(text):
+    seeds = []
+    for item in text.replace(",", "\n").splitlines():
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            seeds.append(int(item))
+        except ValueError:
+            raise ValueError(f"Invalid seed: {item}. Seeds must be integers separated by commas or new lines")
+    return seeds
+
+
+def build_batch_payloads(model, prompts, seeds="", image_urls="", extra_params=""):
+    """
+    Fan out prompts, seeds and image URLs into one payload per prediction
+
+    Each list either has one entry, which is used for every prediction, or
+    the same number of entries as the longest list.
+
+    Args:
+        model (tuple): Entry of IMAGE_BATCH_MODELS or VIDEO_BATCH_MODELS
+        prompts (str): One prompt per line
+        seeds (str): Seeds separated by commas or new lines, empty lets the model pick
+        image_urls (str): One image URL per line, required by image input models
+        extra_params (str): JSON object merged into every payload
+
+    Returns:
+        list: Request payloads
+    """
+    node_class, base_payload, image_field = model
+    prompt_list = _split_lines(prompts)
+    seed_list = _parse_seeds(seeds)
+    image_list = _split_lines(image_urls)
+    if not prompt_list:
+        raise ValueError("At least one prompt is required")
+    if image_field and not image_list:
+        raise ValueError("This model needs at least one image URL")
+
+    extra = {}
+    if extra_params.strip():
+        try:
+            extra = json.loads(extra_params)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"extra_params must be a JSON object: {str(e)}")
+        if not isinstance(extra, dict):
+            raise ValueError("extra_params must be a JSON object")
+
+    lists = {"prompts": prompt_list, "seeds": seed_list, "image_urls": image_list if image_field else []}
+    count = max(len(values) for values in lists.values())
+    for name, values in lists.items():
+        if len(values) not in (0, 1, count):
+            raise ValueError(f"{name} has {len(values)} entries; expected 1 or {count} to match the other lists")
+
+    def _pick(values, index):
+        return values[index] if len(values) > 1 else values[0]
+
+    payloads = []
+    for index in range(count):
+        payload = {**base_payload, **extra, "prompt": _pick(prompt_list, index)}
+        if seed_list:
+            payload["seed"] = _pick(seed_list, index)
+        if image_field:
+            image = _pick(image_list, index)
+            payload[image_field] = [image] if image_field == "images" else image
+        payloads.append(payload)
+    return payloads
+
+
+def _batch_inputs(models):
+    return {
+        "required": {
+            "client": ("WAVESPEED_AI_API_CLIENT",),
+            "model": (list(models.keys()), {
+                "default": list(models.keys())[0],
+                "tooltip": "Model every prediction is sent to"
+            }),
+            "prompts": ("STRING", {
+                "multiline": True,
+                "default": "",
+                "tooltip": "One prompt per line"
+            }),
+            "max_in_flight": ("INT", {
+                "default": 4,
+                "min": 1,
+                "max": 64,
+                "tooltip": "Maximum number of predictions submitted or running at once"
+            }),
+        },
+        "optional": {
+            "seeds": ("STRING", {
+                "multiline": True,
+                "default": "",
+                "tooltip": "Seeds separated by commas or new lines. Empty lets the model pick a random seed"
+            }),
+            "image_urls": ("STRING", {
+                "multiline": True,
+                "default": "",
+                "tooltip": "One image URL per line, for models that take an input image"
+            }),
+            "extra_params": ("STRING", {
+                "multiline": True,
+                "default": "",
+                "tooltip": "JSON object of extra API parameters added to every request, e.g. {\"size\": \"1024*1024\"}"
+            }),
+        }
+    }
+
+
+class WaveSpeedAIBatchImage:
+    """
+    Batch Image Generation Node
+
+    Fans out lists of prompts, seeds and image URLs to one image model, runs
+    the predictions concurrently and returns every output as one IMAGE batch
+    in input order. Wall time is roughly that of the slowest prediction.
+    """
+
+    @classmethod
+    def INPUT_TYPES(s):
+        return _batch_inputs(IMAGE_BATCH_MODELS)
+
+    RETURN_TYPES = ("IMAGE",)
+    RETURN_NAMES = ("images",)
+    CATEGORY = "WaveSpeedAI"
+    FUNCTION = "execute"
+
+    def execute(self, client, model, prompts, max_in_flight=4, seeds="", image_urls="", extra_params=""):
+        payloads = build_batch_payloads(IMAGE_BATCH_MODELS[model], prompts, seeds, image_urls, extra_params)
+        return run_model_batch(client, IMAGE_BATCH_MODELS[model][0].SPEC, payloads, max_in_flight)
+
+
+class WaveSpeedAIBatchVideo:
+    """
+    Batch Video Generation Node
+
+    Fans out lists of prompts, seeds and image URLs to one video model, runs
+    the predictions concurrently and returns the video URLs as a list in
+    input order.
+    """
+
+    @classmethod
+    def INPUT_TYPES(s):
+        return _batch_inputs(VIDEO_BATCH_MODELS)
+
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("video_urls",)
+    OUTPUT_IS_LIST = (True,)
+    CATEGORY = "WaveSpeedAI"
+    FUNCTION = "execute"
+
+    def execute(self, client, model, prompts, max_in_flight=4, seeds="", image_urls="", extra_params=""):
+        payloads = build_batch_payloads(VIDEO_BATCH_MODELS[model], prompts, seeds, image_urls, extra_params)
+        return run_model_batch(client, VIDEO_BATCH_MODELS[model][0].SPEC, payloads, max_in_flight)
+
+
+NODE_CLASS_MAPPINGS = {
+    "WaveSpeedAI Batch Image": WaveSpeedAIBatchImage,
+    "WaveSpeedAI Batch Video": WaveSpeedAIBatchVideo,
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "WaveSpeedAI Batch Image": "WaveSpeedAI Batch Image",
+    "WaveSpeedAI Batch Video": "WaveSpeedAI Batch Video",
+}
@@ -1,6 +1,9 @@
 import os
 import configparser
 from .wavespeed_api.client import WaveSpeedClient
+from .wavespeed_api.polling import POLLING_POLICIES
+from .wavespeed_api.result_cache import RESULT_CACHE_MODES
+from .wavespeed_api.tensors import MIXED_SIZE_MODES
 
 class WaveSpeedAIAPIClient:
     """
@@ -18,6 +21,40 @@ class WaveSpeedAIAPIClient:
             "required": {
                 "api_key": ("STRING", {"multiline": False, "default": ""}),
             },
+            "optional": {
+                "polling_policy": (POLLING_POLICIES, {
+                    "default": "adaptive",
+                    "tooltip": "How async tasks are polled: adaptive uses each model's expected run time, fixed keeps the node's interval"
+                }),
+                "requests_per_second": ("FLOAT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 1000,
+                    "step": 0.5,
+                    "tooltip": "API requests per second allowed for this key across all nodes. 0 for no limit"
+                }),
+                "max_concurrent_tasks": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 1000,
+                    "tooltip": "Predictions this key may have running at once across all nodes. 0 for no limit"
+                }),
+                "result_cache": (RESULT_CACHE_MODES, {
+                    "default": "off",
+                    "tooltip": "Reuse the outputs of an identical earlier request with a fixed seed instead of paying for a new prediction; 'urls and images' also keeps the downloaded images in memory"
+                }),
+                "mixed_sizes": (MIXED_SIZE_MODES, {
+                    "default": "letterbox",
+                    "tooltip": "How output images of different sizes are combined into one IMAGE batch: letterbox scales them to the most common size with black bars, pad places them on a canvas large enough for all, resize stretches them to the most common size"
+                }),
+                "output_max_side": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 16384,
+                    "step": 8,
+                    "tooltip": "Decode output images at reduced scale so their longest side is at most this many pixels, much cheaper for large outputs that are only previewed. 0 decodes them at full resolution"
+                }),
+            },
         }
 
     RETURN_TYPES = ("WAVESPEED_AI_API_CLIENT",)
@@ -27,12 +64,19 @@ class WaveSpeedAIAPIClient:
 
     CATEGORY = "WaveSpeedAI"
 
-    def create_client(self, api_key):
+    def create_client(self, api_key, polling_policy="adaptive", requests_per_second=0, max_concurrent_tasks=0,
+                      result_cache="off", mixed_sizes="letterbox", output_max_side=0):
         """
         Create a WaveSpeed AI API client
 
         Args:
             api_key: WaveSpeed AI API key
+            polling_policy: Polling policy used by nodes waiting on async tasks
+            requests_per_second: Account request rate limit, 0 for no limit
+            max_concurrent_tasks: Account concurrent prediction limit, 0 for no limit
+            result_cache: Whether results of requests with a fixed seed are reused, see RESULT_CACHE_MODES
+            mixed_sizes: How output images of different sizes are combined, see MIXED_SIZE_MODES
+            output_max_side: Longest side output images are decoded at, 0 for full resolution
 
         Returns:
             WaveSpeedAPI: WaveSpeed AI API client
@@ -65,7 +109,13 @@ class WaveSpeedAIAPIClient:
             wavespeed_api_key = api_key
 
         return ({
-            "api_key": wavespeed_api_key
+            "api_key": wavespeed_api_key,
+            "polling_policy": polling_policy,
+            "requests_per_second": requests_per_second,
+            "max_concurrent_tasks": max_concurrent_tasks,
+            "result_cache": result_cache,
+            "mixed_sizes": mixed_sizes,
+            "output_max_side": output_max_side
         },)
 
 
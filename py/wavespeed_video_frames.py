@@ -0,0 +1,81 @@
+from .wavespeed_api.video import videourl2frames
+
+
+class WaveSpeedAIVideoToFrames:
+    """
+    Video to Frames Node
+
+    Downloads the video a video model returned and decodes its frames into
+    an IMAGE batch. The download is streamed to disk and frames are decoded
+    one at a time, so only the frames selected by stride, time range and
+    size limit are held in memory.
+    """
+
+    @classmethod
+    def INPUT_TYPES(s):
+        return {
+            "required": {
+                "video_url": ("STRING", {
+                    "default": "",
+                    "forceInput": True,
+                    "tooltip": "Video URL returned by a WaveSpeedAI video node"
+                }),
+            },
+            "optional": {
+                "frame_stride": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 240,
+                    "tooltip": "Keep every n-th frame"
+                }),
+                "start_time": ("FLOAT", {
+                    "default": 0.0,
+                    "min": 0.0,
+                    "max": 3600.0,
+                    "step": 0.1,
+                    "tooltip": "Seconds into the video the first frame is taken from"
+                }),
+                "duration": ("FLOAT", {
+                    "default": 0.0,
+                    "min": 0.0,
+                    "max": 3600.0,
+                    "step": 0.1,
+                    "tooltip": "Seconds of video to take frames from. 0 takes everything after the start time"
+                }),
+                "max_side": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 8192,
+                    "step": 8,
+                    "tooltip": "Scale frames down so their longest side is at most this many pixels. 0 keeps the video's resolution"
+                }),
+                "max_frames": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 100000,
+                    "tooltip": "Maximum number of frames returned. 0 for no limit"
+                }),
+            }
+        }
+
+    RETURN_TYPES = ("IMAGE", "FLOAT", "INT")
+    RETURN_NAMES = ("frames", "fps", "frame_count")
+    CATEGORY = "WaveSpeedAI"
+    FUNCTION = "execute"
+
+    def execute(self, video_url, frame_stride=1, start_time=0.0, duration=0.0, max_side=0, max_frames=0):
+        if not video_url:
+            raise ValueError("video_url is empty")
+        frames, fps = videourl2frames(video_url, frame_stride=frame_stride, start_time=start_time,
+                                      duration=duration, max_side=max_side, max_frames=max_frames)
+        print(f"Decoded {frames.shape[0]} frames of {frames.shape[2]}x{frames.shape[1]} at {fps:.2f} fps")
+        return (frames, fps, frames.shape[0])
+
+
+NODE_CLASS_MAPPINGS = {
+    "WaveSpeedAI Video To Frames": WaveSpeedAIVideoToFrames,
+}
+
+NODE_DISPLAY_NAME_MAPPINGS = {
+    "WaveSpeedAI Video To Frames": "WaveSpeedAI Video to Frames",
+}